@@ -8,25 +8,49 @@ Usage examples:
   # Waitress mode: run WSGI server (recommended for packaging) and open native window
   python3 app.py --mode waitress
 
+  # ASGI mode: run uvicorn with the async read views
+  python3 app.py --mode asgi
+
+  # Multi-process: 4 waitress worker processes with 8 threads each
+  python3 app.py --mode waitress --workers 4 --threads 8
+
   # Headless (no native window)
   python3 app.py --mode waitress --no-gui
 
+  # Print where start-up time goes (or write it as JSON to a file)
+  python3 app.py --no-gui --profile-startup
+  python3 app.py --no-gui --profile-startup startup.json
+
 Options:
-  --mode {dev,waitress}  Which server to run (default: waitress)
+  --mode {dev,waitress,asgi}  Which server to run (default: waitress)
   --port PORT            Port to serve on (default: 8000)
+  --workers N            Waitress worker processes sharing the port (default: 1,
+                         in-process). With N > 1, SIGHUP reloads the workers
+                         one at a time and SIGUSR1 prints per-worker load
+  --threads M            Waitress threads per process (default: 4)
+  --load-report SECS     With --workers, print per-worker load every SECS seconds
   --no-gui               Do not open a native window; just start server
+  --profile-startup [PATH]
+                         Report the time spent importing, populating the app
+                         registry, building the handler, binding and checking
+                         the database; to stdout, or as JSON to PATH
 
 This script is safe to run locally. If a server is already listening on the
 requested port it will detect that and try to reuse it.
 """
 
+import time
+
+_LAUNCH_TIME = time.perf_counter()
+
 import argparse
+import json
 import subprocess
 import sys
-import time
 import os
 import socket
-from threading import Thread
+from contextlib import contextmanager
+from threading import Event, Thread
 
 
 def is_port_open(port, host="127.0.0.1"):
@@ -48,6 +72,83 @@ def wait_for_server(port, timeout=30, host="127.0.0.1"):
     return False
 
 
+class StartupProfile:
+    """Wall-clock breakdown of server start-up, for --profile-startup."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.phases = []
+        self.database_check = None
+        self.last = _LAUNCH_TIME
+        # Everything before the first phase: argument parsing, port check
+        self.add("launcher", time.perf_counter() - _LAUNCH_TIME)
+
+    def add(self, name, seconds, modules=0):
+        self.phases.append({"name": name, "ms": round(seconds * 1000, 1), "modules": modules})
+
+    @contextmanager
+    def phase(self, name):
+        modules, start = len(sys.modules), time.perf_counter()
+        yield
+        self.add(name, time.perf_counter() - start, len(sys.modules) - modules)
+
+    def wait_for_database_check(self, timeout=30):
+        """Record the startup database check, which runs beside the phases rather than in them."""
+        from college_lifeapp.db_utils import startup_check
+
+        if startup_check.wait(timeout) and startup_check.seconds is not None:
+            self.database_check = {"ms": round(startup_check.seconds * 1000, 1), "ready": startup_check.ready}
+
+    def as_dict(self):
+        return {
+            "mode": self.mode,
+            "total_ms": round(sum(phase["ms"] for phase in self.phases), 1),
+            "phases": self.phases,
+            "database_check": self.database_check,
+        }
+
+    def report(self, path):
+        data = self.as_dict()
+        if path != "-":
+            with open(path, "w") as handle:
+                json.dump(data, handle, indent=2)
+            print(f"Startup profile written to {path}")
+            return
+        print(f"Startup profile ({self.mode}):")
+        for phase in data["phases"]:
+            modules = f"  ({phase['modules']} modules)" if phase["modules"] else ""
+            print(f"  {phase['name']:<16}{phase['ms']:>9.1f} ms{modules}")
+        print(f"  {'total':<16}{data['total_ms']:>9.1f} ms")
+        if self.database_check is not None:
+            print(f"  database check  {self.database_check['ms']:>9.1f} ms  (in the background, "
+                  f"ready={self.database_check['ready']})")
+
+
+class _NullProfile:
+    @contextmanager
+    def phase(self, name):
+        yield
+
+
+def load_django(profile, handler):
+    """Import and set up Django, returning the ``handler`` ('wsgi' or 'asgi') application."""
+    add_project_to_path()
+    with profile.phase("import"):
+        import django
+        from django.conf import settings
+    with profile.phase("settings"):
+        settings.INSTALLED_APPS
+    with profile.phase("app registry"):
+        django.setup(set_prefix=False)
+    with profile.phase("handler"):
+        if handler == "asgi":
+            from django.core.asgi import get_asgi_application
+            return get_asgi_application()
+        # college_app.wsgi puts the static file layer in front of Django
+        from college_app.wsgi import application
+        return application
+
+
 def run_dev_server(port):
     """Start Django dev server as subprocess."""
     PY = sys.executable
@@ -57,9 +158,12 @@ def run_dev_server(port):
     return proc
 
 
-def run_waitress(port):
-    """Run the Django WSGI app with waitress in current process (threaded)."""
+def add_project_to_path():
+    """Make the Django project importable when running from the repo root."""
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "college_app.settings")
+    # Servers started from here use the WAL/pragma SQLite profile; settings
+    # are read before college_app.wsgi would set it
+    os.environ.setdefault("COLLEGE_APP_SQLITE_PROFILE", "performance")
     # Ensure the Django project package directory is on sys.path so
     # `import college_app.settings` can be resolved. The project layout
     # places the Django package under ./college_app/college_app, so add
@@ -68,27 +172,90 @@ def run_waitress(port):
     project_package_path = os.path.join(root, "college_app")
     if project_package_path not in sys.path:
         sys.path.insert(0, project_package_path)
+
+
+def run_waitress(port, threads=4, ready=None, profile=None):
+    """Run the Django WSGI app with waitress in current process (threaded).
+
+    ``ready`` is set from the server thread once it is accepting connections.
+    """
+    profile = profile or _NullProfile()
     try:
-        from django.core.wsgi import get_wsgi_application
+        application = load_django(profile, "wsgi")
     except Exception as e:
         print("Could not import Django WSGI application:", e)
         return None
+    try:
+        from waitress import create_server
+    except Exception:
+        print("Please install waitress: pip install waitress")
+        raise
 
-    application = get_wsgi_application()
+    with profile.phase("bind"):
+        server = create_server(application, host="127.0.0.1", port=port, threads=threads)
 
     def _serve():
-        try:
-            from waitress import serve
-        except Exception as e:
-            print("Please install waitress: pip install waitress")
-            raise
-        serve(application, host="127.0.0.1", port=port)
+        if ready is not None:
+            ready.set()
+        server.run()
 
     t = Thread(target=_serve, daemon=True)
     t.start()
     return t
 
 
+def run_asgi(port, ready=None, profile=None):
+    """Run the Django ASGI app with uvicorn in current process (event loop in a thread).
+
+    Under ASGI the hot read endpoints are served by async views, so a request
+    waiting on SQLite no longer holds a server thread. ``ready`` is set once
+    uvicorn has started serving.
+    """
+    profile = profile or _NullProfile()
+    try:
+        application = load_django(profile, "asgi")
+    except Exception as e:
+        print("Could not import Django ASGI application:", e)
+        return None
+    try:
+        import uvicorn
+    except Exception:
+        print("Please install uvicorn: pip install uvicorn")
+        raise
+
+    class Server(uvicorn.Server):
+        async def startup(self, sockets=None):
+            await super().startup(sockets=sockets)
+            if self.started and ready is not None:
+                ready.set()
+
+    # Django does not implement the ASGI lifespan protocol
+    config = uvicorn.Config(application, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    server = Server(config)
+    with profile.phase("bind"):
+        sock = config.bind_socket()
+
+    t = Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    t.start()
+    return t
+
+
+def run_workers(port, workers, threads, report_interval=0):
+    """Run waitress in ``workers`` supervised processes sharing one listening socket."""
+    if os.name != "posix" or getattr(sys, "frozen", False):
+        print("--workers needs a POSIX system and a source checkout; use --workers 1")
+        return None
+    from workers import Supervisor
+
+    supervisor = Supervisor(port, workers=workers, threads=threads, report_interval=report_interval)
+    supervisor.install_signal_handlers()
+    if not supervisor.start():
+        print("No worker became ready in time. Check logs.")
+        supervisor.stop()
+        return None
+    return supervisor
+
+
 def open_native_window(url):
     try:
         import webview
@@ -106,10 +273,18 @@ def open_native_window(url):
 
 def main():
     parser = argparse.ArgumentParser(description="Launch the local app with optional native window")
-    parser.add_argument("--mode", choices=["dev", "waitress"], default="waitress")
+    parser.add_argument("--mode", choices=["dev", "waitress", "asgi"], default="waitress")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--load-report", type=float, default=0)
     parser.add_argument("--no-gui", action="store_true")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="PATH")
     args = parser.parse_args()
+    if args.workers > 1 and args.mode != "waitress":
+        parser.error("--workers is only supported with --mode waitress")
+    supervisor = None
+    profile = StartupProfile(args.mode) if args.profile_startup else None
 
     port = args.port
     url = f"http://127.0.0.1:{port}/"
@@ -117,37 +292,62 @@ def main():
     # If port already open, reuse it
     if is_port_open(port):
         print(f"Port {port} already in use; assuming server is running. Open {url} to use it.")
+        profile = None
     else:
         if args.mode == "dev":
             print(f"Starting Django dev server on {port}...")
+            start = time.perf_counter()
             proc = run_dev_server(port)
-            # wait for server readiness
+            # The dev server runs in a child process, so readiness can only be polled
             ok = wait_for_server(port, timeout=30)
             if not ok:
                 print("Dev server did not become ready in time. Check logs.")
                 sys.exit(1)
+            if profile:
+                profile.add("dev server", time.perf_counter() - start)
             # keep subprocess object so we can optionally wait/terminate
             background_proc = proc
+        elif args.workers > 1:
+            print(f"Starting {args.workers} waitress worker processes on {port}...")
+            start = time.perf_counter()
+            # Returns once a worker has reported ready over its status pipe
+            supervisor = run_workers(port, args.workers, args.threads, args.load_report)
+            if supervisor is None:
+                sys.exit(1)
+            if profile:
+                profile.add("first worker", time.perf_counter() - start)
         else:
-            print(f"Starting waitress WSGI server on {port}...")
-            thread = run_waitress(port)
-            ok = wait_for_server(port, timeout=30)
-            if not ok:
-                print("WSGI server did not become ready in time. Check logs.")
+            ready = Event()
+            if args.mode == "asgi":
+                print(f"Starting uvicorn ASGI server on {port}...")
+                thread = run_asgi(port, ready=ready, profile=profile)
+            else:
+                print(f"Starting waitress WSGI server on {port}...")
+                thread = run_waitress(port, threads=args.threads, ready=ready, profile=profile)
+            if thread is None or not ready.wait(timeout=30):
+                print("Server did not become ready in time. Check logs.")
                 sys.exit(1)
+            if profile:
+                profile.wait_for_database_check()
 
     print(f"Server ready at {url}")
+    if profile:
+        profile.report(args.profile_startup)
 
-    if not args.no_gui:
-        open_native_window(url)
-    else:
-        print("NO GUI mode; server running. Open the URL in your browser to use the app.")
-        try:
-            # Keep the process alive so the server thread/process continues running.
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("Shutting down (received KeyboardInterrupt)")
+    try:
+        if not args.no_gui:
+            open_native_window(url)
+        else:
+            print("NO GUI mode; server running. Open the URL in your browser to use the app.")
+            try:
+                # Keep the process alive so the server thread/process continues running.
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                print("Shutting down (received KeyboardInterrupt)")
+    finally:
+        if supervisor is not None:
+            supervisor.stop()
 
 
 if __name__ == "__main__":
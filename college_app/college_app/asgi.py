@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'college_app.settings')
+# Serving uses the WAL/pragma connection profile (see DATABASES in settings)
+os.environ.setdefault('COLLEGE_APP_SQLITE_PROFILE', 'performance')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'college_lifeapp.metrics.MetricsMiddleware',
+    'college_lifeapp.async_views.AsyncRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,14 +81,102 @@ WSGI_APPLICATION = 'college_app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite connection profiles, selected with COLLEGE_APP_SQLITE_PROFILE.
+# 'default' keeps SQLite's rollback journal and per-request connections;
+# 'performance' runs its PRAGMAs on every new connection. journal_mode=WAL
+# is stored in the database file, so only the serving entry points (wsgi.py,
+# asgi.py and app.py) select 'performance'; manage.py, and with it the test
+# runner, leaves the bundled db.sqlite3 untouched. COLLEGE_APP_DB_PATH points
+# the app at another database file, such as a scratch copy.
+#
+# Both profiles take the write lock at BEGIN. A deferred transaction that
+# has to upgrade from a read lock (a save or delete with its rollup,
+# counter and FTS writes) fails with "database is locked" when another
+# writer holds the lock, instead of waiting for it.
+
+def _pragmas(**pragmas):
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items())
+
+
+SQLITE_PROFILES = {
+    'default': {
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'CONN_MAX_AGE': 0,
+    },
+    'performance': {
+        'OPTIONS': {
+            'init_command': _pragmas(
+                journal_mode='WAL',          # Readers no longer block the writer
+                synchronous='NORMAL',        # Durable at checkpoints; safe with WAL
+                mmap_size=128 * 1024 * 1024,
+                cache_size=-32000,           # 32 MB page cache per connection
+                busy_timeout=5000,           # Wait up to 5 s for a lock
+                temp_store='MEMORY',
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'CONN_MAX_AGE': 600,
+    },
+}
+
+SQLITE_PROFILE = os.environ.get('COLLEGE_APP_SQLITE_PROFILE', 'default')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('COLLEGE_APP_DB_PATH') or BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PROFILES[SQLITE_PROFILE]['OPTIONS'],
+        'CONN_MAX_AGE': SQLITE_PROFILES[SQLITE_PROFILE]['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        # File-backed test database: in-memory shared-cache SQLite fails
+        # concurrent writers with "table is locked" instead of waiting
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'default' holds collection version stamps; 'responses' holds cached API
+# read responses. Both are in-process LRUs unless COLLEGE_APP_CACHE_DIR is
+# set, in which case they are file-based and shared by every worker process.
+
+CACHE_DIR = os.environ.get('COLLEGE_APP_CACHE_DIR')
+
+if CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'default'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'responses'),
+            'TIMEOUT': 300,
+            'OPTIONS': {'MAX_ENTRIES': 2000},
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'college-app-default',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'college-app-responses',
+            'TIMEOUT': 300,
+            'OPTIONS': {'MAX_ENTRIES': 2000, 'CULL_FREQUENCY': 10},
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -132,7 +223,37 @@ CORS_ALLOW_ALL_ORIGINS = True  # For development only
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # Keyset pagination; clients can request up to 500 rows with ?page_size=
+    'DEFAULT_PAGINATION_CLASS': 'college_lifeapp.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
+    # JSONRenderer that also writes the pre-encoded pages of the list fast path
+    'DEFAULT_RENDERER_CLASSES': [
+        'college_lifeapp.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# College Life App Settings
+# Keep UserProfile.expense_total in step with expense writes
+PROFILE_SPEND_COUNTER = True
+# Record per-view latency and SQL metrics, served at /api/api/health/metrics/
+METRICS_ENABLED = True
+# Seconds a plain /api/api/health/database/ probe reuses the last connection check
+HEALTH_CHECK_TTL = 5
+# Seconds an unchanged dashboard is served from the per-user cache
+DASHBOARD_CACHE_TTL = 30
+# Seconds an unchanged expanded week is served from the per-user cache
+SCHEDULE_CACHE_TTL = 300
+# Assumed length of routines, and of events whose time gives no end
+SCHEDULE_ROUTINE_MINUTES = 60
+SCHEDULE_EVENT_MINUTES = 60
+# Encode list pages from values_list() rows instead of serializer instances
+FAST_LIST_RESPONSES = True
+# How the startup database check runs: 'background' (off the import path), 'blocking' or 'off'
+STARTUP_DATABASE_CHECK = 'background'
+# Serve /static/ and the SPA index from memory in front of Django (college_app.wsgi);
+# restart after deploying a new frontend build
+STATIC_LAYER_ENABLED = True
@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'college_app.settings')
+# Serving uses the WAL/pragma connection profile (see DATABASES in settings)
+os.environ.setdefault('COLLEGE_APP_SQLITE_PROFILE', 'performance')
 
 application = get_wsgi_application()
+
+if getattr(settings, 'STATIC_LAYER_ENABLED', False):
+    # Serve /static/ and the SPA index from memory without entering Django
+    from college_lifeapp.static_files import StaticFilesLayer
+    application = StaticFilesLayer(application)
@@ -1,35 +1,103 @@
 from django.contrib import admin
-from .models import UserProfile, Routine, Expense, Event, Goal
+from django.db.models import Q
+from django.utils import timezone
+from .models import UserProfile, Routine, Expense, ExpenseMonthlyRollup, Event, Goal
+from .search import COLLECTION_BY_MODEL, SEARCH_INDEXES, matching_pks, search_enabled
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'major', 'monthly_budget', 'total_spent']
     search_fields = ['user__username', 'major']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_spending()
+    
+    @admin.display(description='Total spent', ordering='spent_all_time')
+    def total_spent(self, obj):
+        return obj.total_spent
+
+
+class FullTextSearchMixin:
+    """
+    Answer changelist searches from the model's full-text index.
+    
+    Search fields covered by the index become one FTS match instead of
+    ``LIKE '%term%'`` scans; the others (e.g. ``user__username``) still
+    match with ``icontains``.
+    """
+    
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not search_enabled():
+            return super().get_search_results(request, queryset, search_term)
+        matches = matching_pks(self.model, search_term)
+        if matches is None:
+            return queryset.none(), False
+        indexed = SEARCH_INDEXES[COLLECTION_BY_MODEL[self.model]][2]
+        condition = Q(pk__in=matches)
+        for field in self.get_search_fields(request):
+            if field not in indexed:
+                condition |= Q(**{f'{field}__icontains': search_term})
+        return queryset.filter(condition), False
+
+
+class RoutineDayFilter(admin.SimpleListFilter):
+    """Filter routines by weekday through the indexed RoutineDay table"""
+    title = 'day'
+    parameter_name = 'day'
+    
+    def lookups(self, request, model_admin):
+        return Routine.DAYS_CHOICES
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(day_entries__day=self.value())
+        return queryset
+
+
+class EventTimingFilter(admin.SimpleListFilter):
+    """Filter events by timing through the indexed date column"""
+    title = 'timing'
+    parameter_name = 'timing'
+    
+    def lookups(self, request, model_admin):
+        return Event.TIMING_CHOICES
+    
+    def queryset(self, request, queryset):
+        lookup = {'past': 'date__lt', 'today': 'date', 'upcoming': 'date__gt'}.get(self.value())
+        if lookup:
+            return queryset.filter(**{lookup: timezone.localdate()})
+        return queryset
 
 
 @admin.register(Routine)
-class RoutineAdmin(admin.ModelAdmin):
+class RoutineAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'user', 'time', 'category', 'created_at']
-    list_filter = ['category', 'days']
+    list_filter = ['category', RoutineDayFilter]
     search_fields = ['title', 'user__username']
 
 
 @admin.register(Expense)
-class ExpenseAdmin(admin.ModelAdmin):
+class ExpenseAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['item', 'user', 'amount', 'category', 'date']
     list_filter = ['category', 'date']
     search_fields = ['item', 'user__username']
 
 
+@admin.register(ExpenseMonthlyRollup)
+class ExpenseMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ['user', 'month', 'category', 'total', 'count']
+    list_filter = ['category', 'month']
+
+
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
-    list_display = ['title', 'user', 'date', 'category', 'rsvped']
-    list_filter = ['category', 'timing', 'rsvped']
+class EventAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ['title', 'user', 'starts_at', 'timing', 'category', 'rsvped']
+    list_filter = ['category', EventTimingFilter, 'rsvped']
     search_fields = ['title', 'location']
 
 
 @admin.register(Goal)
-class GoalAdmin(admin.ModelAdmin):
+class GoalAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'user', 'category', 'progress', 'completed', 'deadline']
     list_filter = ['category', 'status', 'completed']
     search_fields = ['title', 'description']
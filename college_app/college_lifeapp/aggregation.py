@@ -0,0 +1,237 @@
+"""
+Expense aggregation engine for the College Life App.
+Computes spending summaries in the database and maintains the monthly rollup table.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+
+from .models import Expense, ExpenseMonthlyRollup, UserProfile
+
+GROUP_BY_TRUNC = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+ZERO = Decimal('0.00')
+
+
+def month_start(day):
+    """Return the first day of the month containing ``day``."""
+    return day.replace(day=1)
+
+
+def next_month_start(day):
+    """Return the first day of the month after the one containing ``day``."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def apply_rollup_delta(user_id, category, day, amount, count):
+    """
+    Add ``amount`` and ``count`` to the rollup row for the month containing ``day``.
+
+    Uses a single UPDATE with F() expressions and only inserts when the row
+    does not exist yet, so concurrent writers never lose increments. Removals
+    never insert: a missing row means the user's rollups are already gone.
+    """
+    month = month_start(day)
+    amount = Decimal(str(amount))
+    rows = ExpenseMonthlyRollup.objects.filter(user_id=user_id, category=category, month=month)
+    if rows.update(total=F('total') + amount, count=F('count') + count) or count <= 0:
+        return
+    try:
+        with transaction.atomic():
+            ExpenseMonthlyRollup.objects.create(
+                user_id=user_id, category=category, month=month, total=amount, count=count
+            )
+    except IntegrityError:
+        # Another writer created the row first; fold our delta into it
+        rows.update(total=F('total') + amount, count=F('count') + count)
+
+
+def apply_profile_counter_delta(user_id, amount):
+    """Add ``amount`` to the profile's running expense total when the counter is enabled."""
+    if not getattr(settings, 'PROFILE_SPEND_COUNTER', False):
+        return
+    UserProfile.objects.filter(user_id=user_id).update(
+        expense_total=F('expense_total') + Decimal(str(amount))
+    )
+
+
+def record_expenses(expenses, sign=1):
+    """
+    Apply the rollup deltas for a batch of expenses in one pass per month/category.
+
+    Args:
+        expenses: Iterable of saved Expense instances
+        sign: 1 when the expenses were added, -1 when they were removed
+    """
+    deltas = defaultdict(lambda: [ZERO, 0])
+    user_totals = defaultdict(lambda: ZERO)
+    for expense in expenses:
+        amount = Decimal(str(expense.amount)) * sign
+        key = (expense.user_id, expense.category, month_start(expense.date))
+        deltas[key][0] += amount
+        deltas[key][1] += sign
+        user_totals[expense.user_id] += amount
+    with transaction.atomic():
+        for (user_id, category, month), (amount, count) in deltas.items():
+            apply_rollup_delta(user_id, category, month, amount, count)
+        for user_id, amount in user_totals.items():
+            apply_profile_counter_delta(user_id, amount)
+
+
+def rebuild_expense_rollups(user=None):
+    """
+    Recompute rollup rows and profile expense totals from the Expense table.
+
+    Args:
+        user: Optional user to limit the rebuild to
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    expenses = Expense.objects.all()
+    rollups = ExpenseMonthlyRollup.objects.all()
+    if user is not None:
+        expenses = expenses.filter(user=user)
+        rollups = rollups.filter(user=user)
+    totals = (
+        expenses.annotate(month=TruncMonth('date'))
+        .order_by()
+        .values('user_id', 'category', 'month')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    profiles = UserProfile.objects.all() if user is None else UserProfile.objects.filter(user=user)
+    profile_total = (
+        Expense.objects.filter(user=OuterRef('user')).order_by()
+        .values('user').annotate(total=Sum('amount')).values('total')
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = ExpenseMonthlyRollup.objects.bulk_create(
+            ExpenseMonthlyRollup(**row) for row in totals
+        )
+        profiles.update(expense_total=Coalesce(Subquery(profile_total), Value(ZERO)))
+    return len(created)
+
+
+def _split_range(start, end):
+    """
+    Split [start, end] into ragged edge ranges and a run of whole months.
+
+    Either bound may be None, meaning the range is open on that side.
+
+    Returns:
+        tuple: (edge_ranges, first_month, last_month, has_full_months) where the
+        month bounds are the first days of the first and last whole months (or
+        None when open-ended).
+    """
+    if start is not None and end is not None and start > end:
+        return [], None, None, False
+    first_month = start if start is None or start.day == 1 else next_month_start(start)
+    if end is None or end + timedelta(days=1) == next_month_start(end):
+        last_month = month_start(end) if end is not None else None
+    else:
+        last_month = month_start(month_start(end) - timedelta(days=1))
+    if first_month is not None and last_month is not None and first_month > last_month:
+        return [(start, end)], None, None, False
+    edges = []
+    if start is not None and start != first_month:
+        edges.append((start, first_month - timedelta(days=1)))
+    if end is not None and last_month != month_start(end):
+        edges.append((month_start(end), end))
+    return edges, first_month, last_month, True
+
+
+def _add(bucket, category, total, count):
+    entry = bucket.setdefault(category, [ZERO, 0])
+    entry[0] += total or ZERO
+    entry[1] += count
+
+
+def expense_summary(queryset=None, start=None, end=None, group_by='category', user=None):
+    """
+    Summarize expenses by category, optionally bucketed by day, week or month.
+
+    Whole months inside the range are read from the rollup table, so the cost
+    of a read is proportional to the number of categories and months rather
+    than the number of expenses. Partial months at the edges and day/week
+    buckets are aggregated in SQL against the Expense table.
+
+    Args:
+        queryset: Expense queryset to summarize (defaults to all expenses)
+        start: Optional first date (inclusive)
+        end: Optional last date (inclusive)
+        group_by: 'category', 'day', 'week' or 'month'
+        user: Optional user to scope the rollup table to; must match the
+            scoping of ``queryset``
+
+    Returns:
+        dict: Totals as Decimal values keyed by category, plus an optional
+        ``by_period`` list when grouping by a time bucket
+    """
+    if group_by != 'category' and group_by not in GROUP_BY_TRUNC:
+        raise ValueError(f"Unsupported group_by value: {group_by}")
+    if queryset is None:
+        queryset = Expense.objects.all()
+    queryset = queryset.order_by()
+
+    by_category = {}
+    by_period = defaultdict(dict)
+
+    if group_by in ('day', 'week'):
+        raw_ranges, use_rollups = [(start, end)], False
+    else:
+        raw_ranges, first_month, last_month, use_rollups = _split_range(start, end)
+
+    if use_rollups:
+        rollups = ExpenseMonthlyRollup.objects.filter(count__gt=0)
+        if user is not None:
+            rollups = rollups.filter(user=user)
+        if first_month is not None:
+            rollups = rollups.filter(month__gte=first_month)
+        if last_month is not None:
+            rollups = rollups.filter(month__lte=last_month)
+        fields = ['category', 'month'] if group_by == 'month' else ['category']
+        for row in rollups.order_by().values(*fields).annotate(total=Sum('total'), count=Sum('count')):
+            _add(by_category, row['category'], row['total'], row['count'])
+            if group_by == 'month':
+                _add(by_period[row['month']], row['category'], row['total'], row['count'])
+
+    for range_start, range_end in raw_ranges:
+        rows = queryset
+        if range_start is not None:
+            rows = rows.filter(date__gte=range_start)
+        if range_end is not None:
+            rows = rows.filter(date__lte=range_end)
+        fields = ['category']
+        if group_by in GROUP_BY_TRUNC:
+            rows = rows.annotate(period=GROUP_BY_TRUNC[group_by]('date'))
+            fields.append('period')
+        for row in rows.values(*fields).annotate(total=Sum('amount'), count=Count('id')):
+            _add(by_category, row['category'], row['total'], row['count'])
+            if group_by in GROUP_BY_TRUNC:
+                _add(by_period[row['period']], row['category'], row['total'], row['count'])
+
+    result = {
+        'by_category': {category: total for category, (total, _) in sorted(by_category.items())},
+        'total': sum((total for total, _ in by_category.values()), ZERO),
+        'count': sum(count for _, count in by_category.values()),
+    }
+    if group_by in GROUP_BY_TRUNC:
+        result['by_period'] = [
+            {
+                'period': period.isoformat() if isinstance(period, date) else period,
+                'by_category': {category: total for category, (total, _) in sorted(bucket.items())},
+                'total': sum((total for total, _ in bucket.values()), ZERO),
+            }
+            for period, bucket in sorted(by_period.items())
+        ]
+    return result
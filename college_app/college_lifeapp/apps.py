@@ -9,10 +9,14 @@ class CollegeLifeappConfig(AppConfig):
     name = 'college_lifeapp'
     
     def ready(self):
-        """Initialize database connection check when app is ready"""
-        try:
-            from .db_utils import ensure_database_ready
-            ensure_database_ready()
-        except Exception as e:
-            logger.warning(f"Could not verify database connection on startup: {str(e)}")
-            # Don't raise exception here to allow app to start even if DB check fails
+        """Register signal handlers and start the startup database check"""
+        from . import signals  # noqa: F401  Registers signal handlers
+        from . import metrics  # noqa: F401  Times queries on every new connection
+        from django.db.models.signals import post_migrate
+        from .search import ensure_search_triggers
+        post_migrate.connect(ensure_search_triggers, sender=self)
+
+        # The DB round-trip runs off the import path unless configured otherwise
+        from django.conf import settings
+        from .db_utils import startup_check
+        startup_check.start(getattr(settings, 'STARTUP_DATABASE_CHECK', 'background'))
@@ -0,0 +1,40 @@
+"""
+URL configuration used for ASGI requests (see AsyncRoutingMiddleware).
+
+The hot read endpoints resolve to async views under the same paths and
+names as the DRF routes; everything else falls through to ROOT_URLCONF.
+"""
+from django.conf import settings
+from django.urls import include, path
+
+from .async_views import (
+    AsyncDatabaseHealthView, AsyncExpenseSummaryView, AsyncListView, AsyncRoutinesByDayView,
+)
+from .views import EventViewSet, ExpenseViewSet, GoalViewSet, RoutineViewSet
+
+# The project mounts this app's urls under 'api/'
+PREFIX = 'api/api/'
+
+
+def list_view(viewset, basename):
+    return path(
+        f'{PREFIX}{viewset.version_collection}/',
+        AsyncListView.as_view(
+            viewset=viewset,
+            version_collection=viewset.version_collection,
+            fallback=viewset.as_view({'get': 'list', 'post': 'create'}, basename=basename),
+        ),
+        name=f'{basename}-list',
+    )
+
+
+urlpatterns = [
+    list_view(RoutineViewSet, 'routine'),
+    list_view(ExpenseViewSet, 'expense'),
+    list_view(EventViewSet, 'event'),
+    list_view(GoalViewSet, 'goal'),
+    path(f'{PREFIX}routines/by_day/', AsyncRoutinesByDayView.as_view(), name='routine-by-day'),
+    path(f'{PREFIX}expenses/summary/', AsyncExpenseSummaryView.as_view(), name='expense-summary'),
+    path(f'{PREFIX}health/database/', AsyncDatabaseHealthView.as_view(), name='database-health'),
+    path('', include(settings.ROOT_URLCONF)),
+]
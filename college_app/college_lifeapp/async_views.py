@@ -0,0 +1,232 @@
+"""
+Async read views for the College Life App, used when serving under ASGI.
+
+AsyncRoutingMiddleware switches ASGI requests to ``async_urls``, where the
+hot read endpoints are served by the views below with Django's async ORM.
+They answer GET at the same URLs, with the same content negotiation,
+validators, response cache entries and JSON bytes as their DRF
+counterparts; every other method is handed to the DRF view, or refused
+when there is none.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.http import Http404, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .aggregation import expense_summary
+from .conditional import ALL_USERS, aget_collection_version, get_last_modified, is_not_modified, make_etag
+from .db_utils import cached_connection_check
+from .response_cache import aget_cached_data, astore_data
+from .serializers import ExpenseSummarySerializer
+from .views import (
+    DatabaseHealthView, ExpenseViewSet, RoutineViewSet, database_health_data, parse_day_param,
+    parse_summary_params, routines_for_day,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_URLCONF = 'college_lifeapp.async_urls'
+
+
+class AsyncRoutingMiddleware:
+    """
+    Route requests through ``async_urls`` when the handler is running under ASGI.
+
+    Under WSGI the middleware removes itself, so the sync stack is unchanged.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not iscoroutinefunction(get_response):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        request.urlconf = ASYNC_URLCONF
+        return await self.get_response(request)
+
+
+class AsyncView(View):
+    """
+    Serve GET asynchronously and hand every other method to the sync ``fallback`` view.
+
+    Without a fallback the view is read-only: other methods get a 405, like
+    the DRF actions it stands in for. GET negotiates a renderer as the DRF
+    views do; when that is not a JSON renderer (the browsable API) the
+    request goes to ``sync_view``, which defaults to the fallback.
+    """
+    fallback = None
+    sync_view = None
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    content_negotiation_class = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # The DRF fallback is CSRF exempt, so the URL it shares must be too
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return self.negotiated_get(request, *args, **kwargs)
+        if self.fallback is None:
+            return super().dispatch(request, *args, **kwargs)
+        return sync_to_async(self.fallback)(request, *args, **kwargs)
+
+    async def negotiated_get(self, request, *args, **kwargs):
+        renderers = [renderer() for renderer in self.renderer_classes]
+        try:
+            self.renderer, self.media_type = self.content_negotiation_class().select_renderer(
+                Request(request), renderers
+            )
+        except (APIException, Http404) as exc:
+            # DRF answers a failed negotiation with its first renderer
+            self.renderer, self.media_type = renderers[0], renderers[0].media_type
+            exc = NotFound(*exc.args) if isinstance(exc, Http404) else exc
+            return self.render_exception(exc)
+        if not isinstance(self.renderer, JSONRenderer):
+            return await sync_to_async(self.sync_view or self.fallback)(request, *args, **kwargs)
+        return await self.get(request, *args, **kwargs)
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        """Render ``data`` with the negotiated renderer, as a DRF Response would"""
+        content = self.renderer.render(data, self.media_type, {'request': self.request})
+        response = HttpResponse(content, status=status_code)
+        if content:
+            charset = self.renderer.charset
+            response['Content-Type'] = (
+                f'{self.renderer.media_type}; charset={charset}' if charset else self.renderer.media_type
+            )
+        else:
+            del response['Content-Type']
+        response['Vary'] = 'Accept'
+        return response
+
+    def render_exception(self, exc):
+        """Render an APIException as DRF's exception handler would"""
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        return self.render(detail, exc.status_code)
+
+    async def get(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncReadView(AsyncView):
+    """
+    Async counterpart of ConditionalGetMixin.
+
+    Subclasses implement ``get_data(request)`` returning (data, status code)
+    for a DRF request wrapping the incoming one.
+    """
+    version_collection = None
+    error_message = 'Error fetching data'
+
+    async def get(self, request, *args, **kwargs):
+        version = await aget_collection_version(self.version_collection, ALL_USERS)
+        etag = make_etag(version, request)
+        last_modified = get_last_modified(version)
+        if is_not_modified(request, etag, last_modified):
+            response = self.render(None, status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = await aget_cached_data(self.version_collection, ALL_USERS, etag)
+            if data is None:
+                try:
+                    data, status_code = await self.get_data(Request(request))
+                except APIException as exc:
+                    # e.g. a 404 for a bad cursor
+                    return self.render_exception(exc)
+                except DatabaseError as e:
+                    logger.error(f"Database error in {type(self).__name__}: {str(e)}")
+                    return self.render({'error': self.error_message}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+                if status_code != status.HTTP_200_OK:
+                    return self.render(data, status_code)
+                await astore_data(self.version_collection, ALL_USERS, etag, data)
+            response = self.render(data)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    async def get_data(self, request):
+        raise NotImplementedError
+
+
+class AsyncListView(AsyncReadView):
+    """Keyset-paginated list of a DRF viewset's queryset"""
+    viewset = None
+
+    async def get_data(self, request):
+        viewset = self.viewset(request=request, format_kwarg=None, action='list', args=(), kwargs={})
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        paginator = viewset.paginator
+        encoder = viewset.get_list_encoder()
+        if encoder is not None:
+            rows = await paginator.apaginate_rows(queryset, request, encoder.columns, view=viewset)
+            return encoder.page(paginator, rows), status.HTTP_200_OK
+        page = await paginator.apaginate_queryset(queryset, request, view=viewset)
+        serializer = viewset.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data, status.HTTP_200_OK
+
+
+class AsyncRoutinesByDayView(AsyncReadView):
+    """Async counterpart of RoutineViewSet.by_day"""
+    version_collection = 'routines'
+    error_message = 'Error fetching routines by day'
+    sync_view = staticmethod(RoutineViewSet.as_view({'get': 'by_day'}, basename='routine', detail=False))
+
+    async def get_data(self, request):
+        day, error = parse_day_param(request.query_params)
+        if error:
+            return {'error': error}, status.HTTP_400_BAD_REQUEST
+        viewset = RoutineViewSet(request=request, format_kwarg=None)
+        routines = [routine async for routine in routines_for_day(viewset.get_queryset(), day)]
+        return viewset.get_serializer(routines, many=True).data, status.HTTP_200_OK
+
+
+class AsyncExpenseSummaryView(AsyncReadView):
+    """Async counterpart of ExpenseViewSet.summary"""
+    version_collection = 'expenses'
+    error_message = 'Error calculating expense summary'
+    sync_view = staticmethod(ExpenseViewSet.as_view({'get': 'summary'}, basename='expense', detail=False))
+
+    async def get_data(self, request):
+        params, error = parse_summary_params(request.query_params)
+        if error:
+            return {'error': error}, status.HTTP_400_BAD_REQUEST
+        # The summary runs several dependent aggregates; one thread hop for
+        # all of them is cheaper than one per query through the async ORM
+        queryset = ExpenseViewSet(request=request, format_kwarg=None).get_queryset()
+        summary = await sync_to_async(expense_summary)(queryset, **params)
+        return ExpenseSummarySerializer(summary).data, status.HTTP_200_OK
+
+
+class AsyncDatabaseHealthView(AsyncView):
+    """
+    Async plain health probe.
+
+    A fresh cached check is answered on the event loop without a thread hop;
+    deep probes go to the sync DatabaseHealthView.
+    """
+    fallback = staticmethod(DatabaseHealthView.as_view())
+
+    async def get(self, request, *args, **kwargs):
+        if request.GET.get('deep') in ('1', 'true', 'yes'):
+            return await sync_to_async(self.fallback)(request, *args, **kwargs)
+        ttl = getattr(settings, 'HEALTH_CHECK_TTL', 5)
+        result = cached_connection_check.peek(ttl)
+        if result is None:
+            result = await sync_to_async(cached_connection_check.get)(ttl)
+        return self.render(*database_health_data(*result))
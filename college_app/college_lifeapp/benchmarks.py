@@ -0,0 +1,754 @@
+"""
+Benchmark harness for the College Life App.
+Runs named scenarios against a throwaway SQLite database and reports timings.
+"""
+import http.client
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command, CommandError
+from django.db import DatabaseError, connection, connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register a benchmark scenario under ``name``"""
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@contextmanager
+def temporary_database():
+    """
+    Point the default connection at a fresh, migrated SQLite file.
+
+    Every thread opens its connection from the same settings dict, so worker
+    threads started inside the block use the temporary file as well.
+    """
+    tmpdir = tempfile.mkdtemp(prefix='college_bench_')
+    path = os.path.join(tmpdir, 'bench.sqlite3')
+    original = connection.settings_dict['NAME']
+    connections.close_all()
+    connection.settings_dict['NAME'] = path
+    setup_test_environment()
+    try:
+        call_command('migrate', verbosity=0, interactive=False)
+        yield path
+    finally:
+        teardown_test_environment()
+        connections.close_all()
+        connection.settings_dict['NAME'] = original
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+@contextmanager
+def live_server(threads=8):
+    """
+    Serve the project with waitress on a free local port in a background thread.
+
+    Yields the (host, port) the server listens on.
+    """
+    try:
+        from waitress import create_server, wasyncore
+    except ImportError:
+        raise CommandError("This scenario needs waitress: pip install waitress")
+    from django.core.wsgi import get_wsgi_application
+    from django.test import override_settings
+
+    # Saturating the pool is the point of the load scenarios; skip the per-request queue warnings
+    queue_logger = logging.getLogger('waitress.queue')
+    level = queue_logger.level
+    queue_logger.setLevel(logging.ERROR)
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, '127.0.0.1']):
+        server = create_server(get_wsgi_application(), host='127.0.0.1', port=0, threads=threads)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        try:
+            yield '127.0.0.1', server.effective_port
+        finally:
+            # Close the sockets from the server's own loop so it exits cleanly
+            server.task_dispatcher.shutdown()
+            server.trigger.pull_trigger(lambda: wasyncore.close_all(server._map))
+            thread.join(timeout=5)
+            queue_logger.setLevel(level)
+
+
+@contextmanager
+def live_asgi_server():
+    """
+    Serve the project with uvicorn on a free local port in a background thread.
+
+    Yields the (host, port) the server listens on.
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        raise CommandError("This scenario needs uvicorn: pip install uvicorn")
+    from django.core.asgi import get_asgi_application
+    from django.test import override_settings
+
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, '127.0.0.1']):
+        config = uvicorn.Config(
+            get_asgi_application(), host='127.0.0.1', port=0, lifespan='off', log_level='warning'
+        )
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise CommandError("uvicorn failed to start")
+            time.sleep(0.01)
+        try:
+            yield '127.0.0.1', server.servers[0].sockets[0].getsockname()[1]
+        finally:
+            server.should_exit = True
+            thread.join(timeout=5)
+
+
+class HTTPSession:
+    """Keep-alive HTTP connection for driving a live server from one thread"""
+
+    def __init__(self, address):
+        self.address = address
+        self.connection = http.client.HTTPConnection(*address, timeout=30)
+
+    def request(self, method, path, data=None, headers=None):
+        """Send a request and return (status, body bytes)"""
+        body = None if data is None else json.dumps(data)
+        headers = dict(headers or {})
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection(*self.address, timeout=30)
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def close(self):
+        self.connection.close()
+
+
+@contextmanager
+def timer(results, key):
+    """Store the elapsed wall time of the block in ``results[key]`` (seconds)"""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def sample_payload(collection, index):
+    """Return a valid create payload for ``collection``"""
+    day = date(2025, 1, 1) + timedelta(days=index % 120)
+    if collection == 'routines':
+        return {
+            'title': f'Routine {index}',
+            'time': f'{6 + index % 14:02d}:{(index * 5) % 60:02d}',
+            'days': ['Mon', 'Wed', 'Fri'] if index % 2 else ['Tue', 'Thu'],
+            'category': ['class', 'gym', 'study', 'social'][index % 4],
+        }
+    if collection == 'expenses':
+        return {
+            'item': f'Item {index}',
+            'amount': f'{(index % 50) + 0.99:.2f}',
+            'category': ['Food', 'Transport', 'Books', 'Entertainment', 'Other'][index % 5],
+        }
+    if collection == 'events':
+        return {
+            'title': f'Event {index}',
+            'date': day.isoformat(),
+            'time': '6:00 PM',
+            'location': 'Student Center',
+            'category': ['Academic', 'Career', 'Sports', 'Cultural'][index % 4],
+        }
+    return {
+        'title': f'Goal {index}',
+        'description': 'Benchmark goal',
+        'deadline': day.isoformat(),
+        'progress': index % 100,
+        'category': ['Internships', 'Job Applications', 'Interviews', 'Networking'][index % 4],
+    }
+
+
+COLLECTIONS = ['routines', 'expenses', 'events', 'goals']
+
+
+@scenario('bulk_create')
+def bulk_create_scenario(size=500, **options):
+    """Compare one POST per row against one list POST for each collection"""
+    User.objects.get_or_create(username='bench')
+    client = APIClient()
+    results = {}
+    for collection in COLLECTIONS:
+        url = f'/api/api/{collection}/'
+        payloads = [sample_payload(collection, index) for index in range(size)]
+        timings = {}
+        with timer(timings, 'single'):
+            for payload in payloads:
+                response = client.post(url, payload, format='json')
+                assert response.status_code == 201, response.content
+        with timer(timings, 'bulk'):
+            response = client.post(url, payloads, format='json')
+            assert response.status_code == 201, response.content
+        results[collection] = {
+            'rows': size,
+            'single_rows_per_sec': round(size / timings['single'], 1),
+            'bulk_rows_per_sec': round(size / timings['bulk'], 1),
+            'speedup': round(timings['single'] / timings['bulk'], 1),
+        }
+    return results
+
+
+def run_threads(func, threads, iterations):
+    """
+    Call ``func()`` ``iterations`` times on each of ``threads`` threads.
+
+    Returns:
+        tuple: (elapsed seconds, number of calls that raised DatabaseError)
+    """
+    def worker(_):
+        errors = 0
+        try:
+            for _ in range(iterations):
+                try:
+                    func()
+                except DatabaseError:
+                    errors += 1
+        finally:
+            connections.close_all()
+        return errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        errors = sum(pool.map(worker, range(threads)))
+    return time.perf_counter() - start, errors
+
+
+@scenario('toggles')
+def toggles_scenario(size=500, threads=8, **options):
+    """Hammer one event's RSVP flag from many threads: read-modify-write vs atomic UPDATE"""
+    from .db_utils import update_returning
+    from .models import Event
+    from .views import toggled
+
+    user, _ = User.objects.get_or_create(username='bench')
+    event = Event.objects.create(
+        user=user, title='Toggle target', date=date(2025, 1, 1), time='noon',
+        location='Quad', category='Cultural'
+    )
+    iterations = max(size // threads, 1)
+    calls = iterations * threads
+
+    def read_modify_write():
+        target = Event.objects.get(pk=event.pk)
+        target.rsvped = not target.rsvped
+        target.save()
+
+    def atomic_update():
+        update_returning(Event.objects.filter(pk=event.pk), rsvped=toggled('rsvped'))
+
+    local = threading.local()
+
+    def endpoint():
+        if not hasattr(local, 'client'):
+            local.client = APIClient()
+        local.client.post(f'/api/api/events/{event.pk}/toggle_rsvp/')
+
+    results = {}
+    for name, func in [('read_modify_write', read_modify_write), ('atomic_update', atomic_update),
+                       ('toggle_rsvp_endpoint', endpoint)]:
+        Event.objects.filter(pk=event.pk).update(rsvped=False)
+        elapsed, errors = run_threads(func, threads, iterations)
+        final = Event.objects.get(pk=event.pk).rsvped
+        results[name] = {
+            'calls': calls,
+            'threads': threads,
+            'calls_per_sec': round(calls / elapsed, 1),
+            'errors': errors,
+            'final_state_correct': final == ((calls - errors) % 2 == 1),
+        }
+    return results
+
+
+@contextmanager
+def sqlite_profile(name):
+    """Reconnect the default database with a profile from settings.SQLITE_PROFILES"""
+    saved = {key: connection.settings_dict[key] for key in ('OPTIONS', 'CONN_MAX_AGE')}
+    connections.close_all()
+    connection.settings_dict['OPTIONS'] = dict(settings.SQLITE_PROFILES[name]['OPTIONS'])
+    connection.settings_dict['CONN_MAX_AGE'] = settings.SQLITE_PROFILES[name]['CONN_MAX_AGE']
+    if name == 'default':
+        # WAL mode is persistent in the file, so switch the baseline back explicitly
+        connection.settings_dict['OPTIONS']['init_command'] = 'PRAGMA journal_mode=DELETE'
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.settings_dict.update(saved)
+
+
+@scenario('sqlite_profile')
+def sqlite_profile_scenario(size=500, threads=8, **options):
+    """Mixed concurrent reads and writes over HTTP with the default vs performance SQLite profile"""
+    from django.test import override_settings
+
+    User.objects.get_or_create(username='bench')
+    client = APIClient()
+    for collection in ('expenses', 'routines'):
+        client.post(f'/api/api/{collection}/', [sample_payload(collection, i) for i in range(size)], format='json')
+
+    iterations = max(size // threads, 1)
+    results = {}
+    # Bypass the response cache so every read reaches SQLite
+    no_cache = {**settings.CACHES, 'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    for profile in ('default', 'performance'):
+        with sqlite_profile(profile), override_settings(CACHES=no_cache), live_server(threads) as address:
+            local = threading.local()
+            counter = iter(range(10 ** 9))
+            latencies = []
+
+            def request():
+                if not hasattr(local, 'session'):
+                    local.session = HTTPSession(address)
+                index = next(counter)
+                start = time.perf_counter()
+                if index % 4 == 0:
+                    code, _ = local.session.request('POST', '/api/api/expenses/', sample_payload('expenses', index))
+                elif index % 4 == 1:
+                    code, _ = local.session.request('GET', '/api/api/routines/by_day/?day=Mon')
+                else:
+                    code, _ = local.session.request('GET', '/api/api/expenses/?page_size=50')
+                latencies.append(time.perf_counter() - start)
+                if code >= 400:
+                    raise DatabaseError(f'HTTP {code}')
+
+            elapsed, errors = run_threads(request, threads, iterations)
+        calls = iterations * threads
+        latencies.sort()
+        results[profile] = {
+            'requests': calls,
+            'threads': threads,
+            'requests_per_sec': round(calls / elapsed, 1),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+            'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 1),
+            'errors': errors,
+        }
+    results['speedup'] = round(
+        results['performance']['requests_per_sec'] / results['default']['requests_per_sec'], 2
+    )
+    return results
+
+
+@scenario('metrics_overhead')
+def metrics_overhead_scenario(size=500, **options):
+    """Per-request cost of MetricsMiddleware on a list endpoint and the health check"""
+    from django.test import modify_settings
+
+    User.objects.get_or_create(username='bench')
+    APIClient().post('/api/api/events/', [sample_payload('events', i) for i in range(50)], format='json')
+    middleware = 'college_lifeapp.metrics.MetricsMiddleware'
+    results = {}
+    for path in ('/api/api/events/?page_size=50', '/api/api/health/database/'):
+        timings = {}
+        for label, change in [('without', {'remove': middleware}), ('with', {'prepend': middleware})]:
+            with modify_settings(MIDDLEWARE=change):
+                client = APIClient()
+                client.get(path)
+                with timer(timings, label):
+                    for _ in range(size):
+                        client.get(path)
+        results[path] = {
+            'requests': size,
+            'without_us_per_request': round(timings['without'] / size * 1e6, 1),
+            'with_us_per_request': round(timings['with'] / size * 1e6, 1),
+            'overhead_us': round((timings['with'] - timings['without']) / size * 1e6, 1),
+        }
+    return results
+
+
+@scenario('asgi')
+def asgi_scenario(size=500, threads=8, **options):
+    """Concurrent hot reads through waitress (WSGI, sync views) vs uvicorn (ASGI, async views)"""
+    from django.test import override_settings
+
+    User.objects.get_or_create(username='bench')
+    client = APIClient()
+    for collection in COLLECTIONS:
+        client.post(f'/api/api/{collection}/', [sample_payload(collection, i) for i in range(size)], format='json')
+
+    paths = [
+        '/api/api/expenses/?page_size=50',
+        '/api/api/events/?page_size=50',
+        '/api/api/routines/by_day/?day=Mon',
+        '/api/api/expenses/summary/?group_by=month',
+        '/api/api/health/database/',
+    ]
+    clients = threads * 4
+    iterations = max(size // clients, 1)
+    results = {}
+    # Bypass the response cache so every read reaches SQLite
+    no_cache = {**settings.CACHES, 'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    servers = [('waitress', lambda: live_server(threads)), ('uvicorn', live_asgi_server)]
+    for name, server in servers:
+        with override_settings(CACHES=no_cache), server() as address:
+            local = threading.local()
+            counter = iter(range(10 ** 9))
+            latencies = []
+
+            def request():
+                if not hasattr(local, 'session'):
+                    local.session = HTTPSession(address)
+                path = paths[next(counter) % len(paths)]
+                start = time.perf_counter()
+                code, _ = local.session.request('GET', path)
+                latencies.append(time.perf_counter() - start)
+                if code >= 400:
+                    raise DatabaseError(f'HTTP {code} for {path}')
+
+            elapsed, errors = run_threads(request, clients, iterations)
+        calls = iterations * clients
+        latencies.sort()
+        results[name] = {
+            'requests': calls,
+            'concurrent_clients': clients,
+            'requests_per_sec': round(calls / elapsed, 1),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+            'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1),
+            'errors': errors,
+        }
+    return results
+
+
+@scenario('transfer')
+def transfer_scenario(size=500, **options):
+    """Batched NDJSON import rate, then streaming export rate and peak memory at 10x the rows"""
+    import tracemalloc
+
+    from .transfer import import_records
+
+    user, _ = User.objects.get_or_create(username='bench')
+    client = APIClient()
+    results = {}
+    imported = 0
+    for rows in (size * 2, size * 20):
+        lines = (json.dumps(sample_payload('expenses', index)) + '\n' for index in range(imported, rows))
+        timings = {}
+        with timer(timings, 'import'):
+            report = import_records(lines, 'ndjson', 'expenses', user)
+        imported = rows
+        results[f'import_{rows}'] = {
+            'rows': report['created'],
+            'batches': report['batches'],
+            'rows_per_sec': round(report['created'] / timings['import'], 1),
+        }
+        for output in ('csv', 'ndjson'):
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get(f'/api/api/expenses/export/?output={output}')
+            size_bytes = sum(len(chunk) for chunk in response.streaming_content)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[f'export_{output}_{rows}'] = {
+                'rows': rows,
+                'bytes': size_bytes,
+                'rows_per_sec': round(rows / elapsed, 1),
+                'peak_memory_kb': round(peak / 1024, 1),
+            }
+    return results
+
+
+FAST_LIST_SIZES = (1000, 10000, 100000)
+
+
+@scenario('fast_list')
+def fast_list_scenario(**options):
+    """Serializer + JSONRenderer vs the values_list() ListEncoder at 1k, 10k and 100k rows"""
+    import gc
+    from decimal import Decimal
+
+    from rest_framework.renderers import JSONRenderer
+
+    from .fast_json import get_list_encoder
+    from .models import Expense
+    from .serializers import ExpenseSerializer
+
+    user, _ = User.objects.get_or_create(username='bench')
+    encoder = get_list_encoder(ExpenseSerializer)
+    results = {}
+    created = 0
+    for rows in FAST_LIST_SIZES:
+        Expense.objects.bulk_create(
+            [
+                Expense(user=user, **{**payload, 'amount': Decimal(payload['amount'])})
+                for payload in (sample_payload('expenses', index) for index in range(created, rows))
+            ],
+            batch_size=2000,
+        )
+        created = rows
+        timings = {}
+        # Collect between runs so neither pays for the other's garbage
+        gc.collect()
+        with timer(timings, 'fast'):
+            content = encoder.encode(Expense.objects.order_by('pk').values_list(*encoder.columns))
+        gc.collect()
+        with timer(timings, 'serializer'):
+            expected = JSONRenderer().render(ExpenseSerializer(Expense.objects.order_by('pk'), many=True).data)
+        results[f'rows_{rows}'] = {
+            'serializer_ms': round(timings['serializer'] * 1000, 1),
+            'fast_ms': round(timings['fast'] * 1000, 1),
+            'speedup': round(timings['serializer'] / timings['fast'], 1),
+            'identical': content == expected,
+        }
+    return results
+
+
+LOAD_REQUESTS = 400
+
+
+def percentile(ordered, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def load_routes(ids):
+    """
+    Return the routes the load scenario drives, keyed by name.
+
+    Each value is a function of the request index returning (method, path, body).
+    """
+    def pick(collection, index):
+        return ids[collection][index % len(ids[collection])]
+
+    return {
+        'list': lambda i: ('GET', '/api/api/expenses/?page_size=50', None),
+        'retrieve': lambda i: ('GET', f"/api/api/events/{pick('events', i)}/", None),
+        'create': lambda i: ('POST', '/api/api/expenses/', sample_payload('expenses', i)),
+        'update': lambda i: ('PATCH', f"/api/api/goals/{pick('goals', i)}/", {'progress': i % 100}),
+        'delete': lambda i: ('DELETE', f"/api/api/expenses/{ids['deletable'][i]}/", None),
+        'toggle_rsvp': lambda i: ('POST', f"/api/api/events/{pick('events', i)}/toggle_rsvp/", None),
+        'toggle_complete': lambda i: ('POST', f"/api/api/goals/{pick('goals', i)}/toggle_complete/", None),
+        'summary': lambda i: ('GET', '/api/api/expenses/summary/?group_by=month', None),
+        'by_day': lambda i: ('GET', '/api/api/routines/by_day/?day=Mon', None),
+        'by_category': lambda i: ('GET', '/api/api/goals/by_category/?category=Internships', None),
+        'health': lambda i: ('GET', '/api/api/health/database/', None),
+    }
+
+
+@scenario('load')
+def load_scenario(size=500, threads=8, requests=LOAD_REQUESTS, **options):
+    """Drive every API route through waitress at ``threads`` concurrency: throughput, latency, queries"""
+    from .metrics import registry
+    from .models import Event, Expense, Goal, Routine
+
+    User.objects.get_or_create(username='bench')
+    client = APIClient()
+    for collection in COLLECTIONS:
+        client.post(f'/api/api/{collection}/', [sample_payload(collection, i) for i in range(size)], format='json')
+    ids = {
+        collection: list(model.objects.order_by('pk').values_list('pk', flat=True))
+        for collection, model in zip(COLLECTIONS, (Routine, Expense, Event, Goal))
+    }
+    response = client.post('/api/api/expenses/', [sample_payload('expenses', i) for i in range(requests)], format='json')
+    ids['deletable'] = [item['id'] for item in response.data]
+    routes = load_routes(ids)
+
+    iterations = max(requests // threads, 1)
+    results = {'size': size, 'threads': threads, 'requests_per_route': iterations * threads}
+    with live_server(threads) as address:
+        for name, make_request in routes.items():
+            # Every route starts cold, so runs do not depend on the order they ran in
+            for alias in ('default', 'responses'):
+                caches[alias].clear()
+            registry.reset()
+            local = threading.local()
+            counter = iter(range(10 ** 9))
+            latencies = []
+            failures = []
+
+            def request():
+                if not hasattr(local, 'session'):
+                    local.session = HTTPSession(address)
+                method, path, body = make_request(next(counter))
+                start = time.perf_counter()
+                code, _ = local.session.request(method, path, body)
+                latencies.append(time.perf_counter() - start)
+                if code >= 400:
+                    failures.append(code)
+
+            elapsed, errors = run_threads(request, threads, iterations)
+            routes_stats, _ = registry.collect()
+            served = sum(sum(stats.responses.values()) for stats in routes_stats.values())
+            queries = sum(stats.queries for stats in routes_stats.values())
+            latencies.sort()
+            results[name] = {
+                'requests': len(latencies),
+                'requests_per_sec': round(len(latencies) / elapsed, 1),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                'queries_per_request': round(queries / served, 2) if served else None,
+                'errors': errors + len(failures),
+            }
+    return results
+
+
+# Metric name suffix -> (True when higher is better, absolute noise allowance)
+BASELINE_METRICS = (
+    ('_per_sec', (True, 0)),
+    ('_ms', (False, 1.0)),
+    ('queries_per_request', (False, 0.1)),
+    ('errors', (False, 0)),
+)
+BASELINE_TOLERANCE = 0.2
+
+
+def flatten_results(results, prefix=''):
+    """Yield (dotted key, value) for every leaf of a nested results dict"""
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from flatten_results(value, f'{prefix}{key}.')
+        else:
+            yield f'{prefix}{key}', value
+
+
+def failed_requests(results):
+    """Return the dotted keys of every error count above zero"""
+    return [key for key, value in flatten_results(results) if key.endswith('errors') and value]
+
+
+def compare_results(baseline, results, tolerance=BASELINE_TOLERANCE):
+    """
+    Compare benchmark results against a saved baseline.
+
+    Only throughput, latency, query-count and error metrics present in both are
+    compared; a metric regresses when it is worse than the baseline by more
+    than ``tolerance`` (a fraction) plus its noise allowance. Any failed
+    request is a regression, whatever the baseline recorded.
+
+    Returns:
+        list: (key, baseline value, new value, change as a fraction or None, regressed) tuples
+    """
+    old_values = dict(flatten_results(baseline))
+    rows = []
+    for key, new in flatten_results(results):
+        old = old_values.get(key)
+        rule = next((rule for suffix, rule in BASELINE_METRICS if key.endswith(suffix)), None)
+        if rule is None or not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+            continue
+        higher_is_better, allowance = rule
+        if key.endswith('errors'):
+            regressed = new > 0
+        elif higher_is_better:
+            regressed = new < old * (1 - tolerance) - allowance
+        else:
+            regressed = new > old * (1 + tolerance) + allowance
+        change = (new - old) / old if old else None
+        rows.append((key, old, new, change, regressed))
+    return rows
+
+
+# Median seconds from process start to "Server ready" before cold_start fails
+COLD_START_BUDGET = 3.0
+COLD_START_RUNS = 5
+
+
+def launch_app(mode, profile_path, db_path):
+    """
+    Start app.py headless on a free port against ``db_path``; return once it prints "Server ready".
+
+    Returns:
+        tuple: (process, port, seconds from spawn to ready)
+    """
+    launcher = os.path.join(os.path.dirname(settings.BASE_DIR), 'app.py')
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, launcher, '--no-gui', '--mode', mode, '--port', str(port),
+         '--profile-startup', profile_path],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        env={**os.environ, 'PYTHONUNBUFFERED': '1', 'COLLEGE_APP_DB_PATH': db_path},
+    )
+    for line in process.stdout:
+        if line.startswith('Server ready'):
+            return process, port, time.perf_counter() - start
+    process.wait()
+    raise CommandError(f"app.py --mode {mode} exited with status {process.returncode} before it was ready")
+
+
+@scenario('cold_start')
+def cold_start_scenario(cold_start_budget=COLD_START_BUDGET, **options):
+    """Process start to first served request for app.py in waitress and ASGI mode, gated on a budget"""
+    results = {}
+    tmpdir = tempfile.mkdtemp(prefix='college_cold_start_')
+    try:
+        # app.py switches its database to WAL, so it runs against a copy
+        db_path = os.path.join(tmpdir, 'cold_start.sqlite3')
+        shutil.copyfile(connection.settings_dict['NAME'], db_path)
+        for mode in ('waitress', 'asgi'):
+            ready_times, first_requests, phases = [], [], {}
+            for run in range(COLD_START_RUNS):
+                profile_path = os.path.join(tmpdir, f'{mode}-{run}.json')
+                process, port, ready = launch_app(mode, profile_path, db_path)
+                try:
+                    start = time.perf_counter()
+                    code, _ = HTTPSession(('127.0.0.1', port)).request('GET', '/api/api/health/database/')
+                    first_requests.append(time.perf_counter() - start)
+                    if code >= 400:
+                        raise CommandError(f"First request to app.py --mode {mode} failed with HTTP {code}")
+                finally:
+                    process.terminate()
+                    process.communicate(timeout=10)
+                ready_times.append(ready)
+                with open(profile_path) as handle:
+                    for phase in json.load(handle)['phases']:
+                        phases.setdefault(phase['name'], []).append(phase['ms'])
+            median_ready = sorted(ready_times)[len(ready_times) // 2]
+            results[mode] = {
+                'runs': COLD_START_RUNS,
+                'ready_ms_median': round(median_ready * 1000, 1),
+                'ready_ms_best': round(min(ready_times) * 1000, 1),
+                'first_request_ms_median': round(sorted(first_requests)[len(first_requests) // 2] * 1000, 1),
+                'phases_ms_median': {name: sorted(values)[len(values) // 2] for name, values in phases.items()},
+                'within_budget': median_ready <= cold_start_budget,
+            }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    results['budget_ms'] = round(cold_start_budget * 1000, 1)
+    results['within_budget'] = all(results[mode]['within_budget'] for mode in ('waitress', 'asgi'))
+    return results
+
+
+def run_scenarios(names, **options):
+    """Run the named scenarios, each against its own temporary database"""
+    results = {}
+    for name in names:
+        with temporary_database():
+            results[name] = SCENARIOS[name](**options)
+    return results
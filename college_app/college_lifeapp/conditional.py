@@ -0,0 +1,179 @@
+"""
+Collection version stamps and conditional GET support for the College Life App.
+
+Every write to a model bumps a version stamp for the API collections that
+render it. Read endpoints derive a strong ETag from the stamp and the
+request, so a client revalidating with If-None-Match gets a 304 without the
+collection's table or serializer being touched.
+"""
+import functools
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .response_cache import cached_response
+
+ALL_USERS = '*'
+VERSION_KEY = 'college_lifeapp:version:{collection}:{scope}'
+
+# Collections whose responses include data from each model
+DEPENDENT_COLLECTIONS = {
+    'auth.user': ['profiles'],
+    'college_lifeapp.userprofile': ['profiles'],
+    'college_lifeapp.routine': ['routines'],
+    'college_lifeapp.expense': ['expenses', 'profiles'],
+    'college_lifeapp.event': ['events'],
+    'college_lifeapp.goal': ['goals'],
+}
+
+
+def _version_key(collection, scope):
+    return VERSION_KEY.format(collection=collection, scope=scope)
+
+
+def get_collection_version(collection, scope=ALL_USERS):
+    """
+    Return the current version stamp for a collection.
+
+    Stamps are nanosecond timestamps, so they also give Last-Modified.
+    A missing stamp (cold cache, restart) is initialized to now, which only
+    costs clients one full response.
+    """
+    key = _version_key(collection, scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_collection_version(collection, scope=ALL_USERS):
+    """Async get_collection_version, for views running on the event loop"""
+    key = _version_key(collection, scope)
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, timeout=None):
+            version = await cache.aget(key, version)
+    return version
+
+
+def bump_collection_versions(collections, user_id=None):
+    """Give the collections new version stamps, both shared and for ``user_id``"""
+    version = time.time_ns()
+    stamps = {}
+    for collection in collections:
+        stamps[_version_key(collection, ALL_USERS)] = version
+        if user_id is not None:
+            stamps[_version_key(collection, user_id)] = version
+    cache.set_many(stamps, timeout=None)
+
+
+def bump_model_versions(model, user_id=None):
+    """
+    Bump every collection that renders ``model`` once the current transaction commits.
+
+    Bumping before the commit would let a concurrent reader pair the new
+    stamp with the old rows and keep serving them as fresh.
+    """
+    collections = DEPENDENT_COLLECTIONS.get(model._meta.label_lower)
+    if collections:
+        transaction.on_commit(lambda: bump_collection_versions(collections, user_id))
+
+
+def make_etag(version, request):
+    """
+    Build a strong ETag from the collection version and everything that shapes the body.
+
+    Today's local date is included because some fields (such as spending
+    this month or event timing) change with the calendar rather than with a
+    write.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(timezone.localdate().isoformat().encode('ascii'))
+    digest.update(request.get_full_path().encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(request.headers.get('Accept', '').encode('latin-1'))
+    return f'"{version:x}-{digest.hexdigest()}"'
+
+
+def get_last_modified(version):
+    """
+    Return the Last-Modified time for ``version`` in whole seconds, or None while it lies ahead.
+
+    HTTP dates have one-second resolution, so the stamp is rounded up to the
+    next second and only given out once that second has begun. Any later
+    write then rounds up past it, so an If-Modified-Since compared against
+    it never hides a write made within the same second.
+    """
+    seconds = version // 1_000_000_000 + 1
+    return seconds if seconds <= time.time_ns() // 1_000_000_000 else None
+
+
+def is_not_modified(request, etag, last_modified):
+    """Return True when the request's validators match ``etag``/``last_modified``"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        return etag in parse_etags(if_none_match)
+    if last_modified is None:
+        return False
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and last_modified <= since
+
+
+def conditional_get(method):
+    """Decorate a viewset read action so it answers revalidation requests with 304"""
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return self.conditional_response(request, method, self, request, *args, **kwargs)
+    return wrapper
+
+
+class ConditionalGetMixin:
+    """
+    Serve list and detail reads with ETag/Last-Modified validators.
+
+    ``version_collection`` names the stamp the viewset's responses depend on.
+    With ``cache_responses`` on, full responses are also served from the
+    server-side response cache under the same validator.
+    """
+    version_collection = None
+    cache_responses = True
+
+    def get_version_scope(self, request):
+        """Return the stamp scope; querysets are not user-scoped yet, so all users"""
+        return ALL_USERS
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        scope = self.get_version_scope(request)
+        version = get_collection_version(self.version_collection, scope)
+        etag = make_etag(version, request)
+        last_modified = get_last_modified(version)
+
+        if is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif self.cache_responses:
+            response = cached_response(self.version_collection, scope, etag, handler, *args, **kwargs)
+        else:
+            response = handler(*args, **kwargs)
+        if response.status_code not in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
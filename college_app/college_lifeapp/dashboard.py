@@ -0,0 +1,109 @@
+"""
+Dashboard aggregate for the College Life App.
+Builds today's routines, upcoming events, active goals and budget status from
+a fixed set of indexed queries, cached per user.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from .aggregation import ZERO, month_start
+from .conditional import get_collection_version
+from .db_utils import query_budget
+from .models import Event, ExpenseMonthlyRollup, Goal, Routine, UserProfile
+from .response_cache import get_response_cache
+from .serializers import EventSerializer, GoalSerializer, RoutineSerializer
+
+EVENT_WINDOW_DAYS = 7
+EVENT_LIMIT = 10
+GOAL_LIMIT = 5
+# One query per dashboard section plus the budget lookup
+QUERY_BUDGET = 5
+
+DASHBOARD_KEY = 'college_lifeapp:dashboard:{user_id}:{today}:{versions}'
+DEPENDENCIES = ('routines', 'events', 'goals', 'expenses', 'profiles')
+PERCENT = Decimal('0.1')
+
+
+def dashboard_querysets(user, today):
+    """Return the querysets the dashboard runs, keyed by section"""
+    return {
+        'routines': Routine.objects.filter(
+            day_entries__user=user, day_entries__day=Routine.DAY_CODES[today.weekday()]
+        ).order_by('day_entries__time'),
+        'events': Event.objects.filter(
+            user=user, date__range=(today, today + timedelta(days=EVENT_WINDOW_DAYS))
+        ).order_by('date')[:EVENT_LIMIT],
+        'goals': Goal.objects.filter(user=user, completed=False).order_by('deadline')[:GOAL_LIMIT],
+        'spending': ExpenseMonthlyRollup.objects.filter(
+            user=user, month=month_start(today)
+        ).order_by().values('category').annotate(total=Sum('total')),
+        'budget': UserProfile.objects.filter(user=user).values_list('monthly_budget', flat=True),
+    }
+
+
+def _money(value):
+    return None if value is None else str(Decimal(value).quantize(ZERO))
+
+
+def _percent(part, whole):
+    # A string like the money fields, so clients never see a float
+    return str((Decimal(part) * 100 / whole).quantize(PERCENT)) if whole else None
+
+
+def build_dashboard(user, today=None):
+    """
+    Build the dashboard payload for ``user``.
+
+    Returns:
+        dict: routines, events and goals as their API representations, plus budget status
+    """
+    today = today or timezone.localdate()
+    querysets = dashboard_querysets(user, today)
+    with query_budget(QUERY_BUDGET, 'dashboard'):
+        routines = RoutineSerializer(querysets['routines'], many=True).data
+        events = EventSerializer(querysets['events'], many=True).data
+        goals = GoalSerializer(querysets['goals'], many=True).data
+        by_category = {row['category']: row['total'] for row in querysets['spending']}
+        monthly_budget = querysets['budget'].first()
+
+    spent = sum(by_category.values(), ZERO)
+    budget = {
+        'monthly_budget': _money(monthly_budget),
+        'spent_this_month': _money(spent),
+        'remaining': _money(monthly_budget - spent) if monthly_budget is not None else None,
+        'percent_used': _percent(spent, monthly_budget),
+        'by_category': {category: _money(total) for category, total in sorted(by_category.items())},
+    }
+    return {
+        'date': today.isoformat(),
+        'day': Routine.DAY_CODES[today.weekday()],
+        'routines': routines,
+        'events': events,
+        'goals': goals,
+        'budget': budget,
+    }
+
+
+def get_dashboard(user, today=None):
+    """
+    Return the dashboard for ``user`` from the per-user cache, building it on a miss.
+
+    The key includes the user's version stamps for every collection the
+    dashboard renders, so writes show up immediately; DASHBOARD_CACHE_TTL
+    only bounds how long an unchanged dashboard is reused.
+    """
+    today = today or timezone.localdate()
+    backend = get_response_cache()
+    if backend is None:
+        return build_dashboard(user, today)
+    versions = '-'.join(f'{get_collection_version(name, user.pk):x}' for name in DEPENDENCIES)
+    key = DASHBOARD_KEY.format(user_id=user.pk, today=today.isoformat(), versions=versions)
+    data = backend.get(key)
+    if data is None:
+        data = build_dashboard(user, today)
+        backend.set(key, data, timeout=getattr(settings, 'DASHBOARD_CACHE_TTL', 30))
+    return data
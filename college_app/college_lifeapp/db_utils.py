@@ -2,10 +2,16 @@
 Database utility functions for the College Life App.
 Provides connection checking, health monitoring, and database operations helpers.
 """
-from django.db import connection, transaction
+from django.apps import apps
+from django.db import connection, connections, transaction
 from django.db import DatabaseError
+from django.db.models.sql import UpdateQuery
 from django.conf import settings
+from contextlib import contextmanager
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +38,73 @@ def check_database_connection():
         return False, error_msg
 
 
+class CachedConnectionCheck:
+    """
+    Serve check_database_connection() results from memory for ``ttl`` seconds.
+    
+    Only one thread refreshes an expired result; the others keep answering
+    with the previous one instead of waiting for a database connection.
+    """
+    
+    def __init__(self):
+        self._refresh_lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+    
+    def reset(self):
+        self._result = None
+    
+    def peek(self, ttl):
+        """Return the cached result if it is fresh, else None, without touching the database"""
+        result, checked_at = self._result, self._checked_at
+        age = time.monotonic() - checked_at
+        if result is None or age >= ttl:
+            return None
+        return (*result, round(age, 3))
+    
+    def get(self, ttl):
+        """
+        Returns:
+            tuple: (is_connected: bool, error_message: str or None, age_seconds: float)
+        """
+        result, checked_at = self._result, self._checked_at
+        expired = result is None or time.monotonic() - checked_at >= ttl
+        if expired and self._refresh_lock.acquire(blocking=result is None):
+            try:
+                if self._result is result:  # Not refreshed while we waited for the lock
+                    self._result, self._checked_at = check_database_connection(), time.monotonic()
+                result, checked_at = self._result, self._checked_at
+            finally:
+                self._refresh_lock.release()
+        return (*result, round(time.monotonic() - checked_at, 3))
+
+
+cached_connection_check = CachedConnectionCheck()
+
+
+@contextmanager
+def query_budget(limit, label):
+    """
+    Check that the block runs at most ``limit`` SQL statements.
+    
+    Going over budget is logged as an error, and raised when DEBUG is on so
+    an added query shows up during development rather than in production.
+    """
+    executed = []
+    
+    def count(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+    
+    with connection.execute_wrapper(count):
+        yield
+    if len(executed) > limit:
+        error_msg = f"{label} ran {len(executed)} queries, over its budget of {limit}"
+        logger.error(error_msg)
+        if settings.DEBUG:
+            raise AssertionError(error_msg)
+
+
 def get_database_info():
     """
     Get information about the current database configuration.
@@ -42,12 +115,68 @@ def get_database_info():
     db_config = settings.DATABASES.get('default', {})
     return {
         'engine': db_config.get('ENGINE', 'Unknown'),
-        'name': db_config.get('NAME', 'Unknown'),
+        'name': str(db_config.get('NAME', 'Unknown')),
         'host': db_config.get('HOST', 'N/A'),
         'port': db_config.get('PORT', 'N/A'),
     }
 
 
+def get_sqlite_stats():
+    """
+    Get storage statistics for a SQLite database.
+    
+    Returns:
+        dict: Page counts and sizes, journal mode and WAL file size, or {} for other engines
+    """
+    if connection.vendor != 'sqlite':
+        return {}
+    stats = {}
+    with connection.cursor() as cursor:
+        for pragma in ('page_count', 'freelist_count', 'page_size', 'journal_mode'):
+            cursor.execute(f"PRAGMA {pragma}")
+            stats[pragma] = cursor.fetchone()[0]
+    stats['database_bytes'] = stats['page_count'] * stats['page_size']
+    stats['free_bytes'] = stats['freelist_count'] * stats['page_size']
+    wal_path = f"{connection.settings_dict['NAME']}-wal"
+    stats['wal_bytes'] = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    return stats
+
+
+def get_table_row_estimates():
+    """
+    Estimate row counts for the app's tables without scanning them.
+    
+    Uses ANALYZE statistics from sqlite_stat1 when present, otherwise the
+    largest rowid, which is read from the end of the table's B-tree.
+    
+    Returns:
+        dict: table name -> estimated rows, or None for tables not yet migrated
+    """
+    tables = [model._meta.db_table for model in apps.get_app_config('college_lifeapp').get_models()]
+    tables.append(apps.get_model('auth', 'User')._meta.db_table)
+    estimates = {}
+    with connection.cursor() as cursor:
+        existing = set(connection.introspection.table_names(cursor))
+        analyzed = {}
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone():
+                # The first number of each stat is the row count of the table
+                cursor.execute("SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 GROUP BY tbl")
+                analyzed = dict(cursor.fetchall())
+        quote = connection.ops.quote_name
+        for table in sorted(tables):
+            if table not in existing:
+                estimates[table] = None
+                continue
+            if table in analyzed:
+                estimates[table] = analyzed[table]
+                continue
+            cursor.execute(f"SELECT MAX(id) FROM {quote(table)}")
+            estimates[table] = cursor.fetchone()[0] or 0
+    return estimates
+
+
 def ensure_database_ready():
     """
     Ensure the database is ready for operations.
@@ -66,6 +195,55 @@ def ensure_database_ready():
     return True
 
 
+class StartupCheck:
+    """
+    The ensure_database_ready() round-trip made when the app registry is ready.
+
+    In ``background`` mode it runs on its own thread so loading the WSGI/ASGI
+    application does not wait on SQLite; launchers that need the result call
+    wait().
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ready = None
+        self.seconds = None
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.ready = ensure_database_ready()
+        except Exception as e:
+            logger.warning(f"Could not verify database connection on startup: {str(e)}")
+            self.ready = False
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.done.set()
+
+    def start(self, mode='background'):
+        """Run the check according to settings.STARTUP_DATABASE_CHECK: background, blocking or off"""
+        if mode == 'blocking':
+            self.run()
+        elif mode == 'background':
+            threading.Thread(target=self._run_in_thread, name='startup-db-check', daemon=True).start()
+
+    def _run_in_thread(self):
+        # start() is called from AppConfig.ready(); query only once every app is ready
+        apps.ready_event.wait()
+        try:
+            self.run()
+        finally:
+            # The connection belongs to this short-lived thread
+            connection.close()
+
+    def wait(self, timeout=None):
+        """Block until the check has finished; returns False on timeout"""
+        return self.done.wait(timeout)
+
+
+startup_check = StartupCheck()
+
+
 def safe_db_operation(operation, default_return=None):
     """
     Safely execute a database operation with error handling.
@@ -86,3 +264,45 @@ def safe_db_operation(operation, default_return=None):
         logger.error(f"Unexpected error in database operation: {str(e)}")
         return default_return
 
+
+def update_returning(queryset, **values):
+    """
+    Apply ``queryset.update(**values)`` and return the updated rows as instances.
+
+    Where the backend supports it this is one ``UPDATE ... RETURNING``
+    statement, so the caller gets each row's new state without reading it
+    back; otherwise the rows are updated and then selected again.
+    """
+    db = queryset.db
+    conn = connections[db]
+    if not conn.features.can_return_columns_from_insert:
+        keys = list(queryset.values_list('pk', flat=True))
+        queryset.filter(pk__in=keys).update(**values)
+        return list(queryset.model._base_manager.using(db).filter(pk__in=keys))
+
+    model = queryset.model
+    fields = model._meta.concrete_fields
+    # Built like QuerySet.update(), with the row's columns returned
+    query = queryset.query.chain(UpdateQuery)
+    query.add_update_values(values)
+    query.annotations = {}
+    update_sql, params = query.get_compiler(db).as_sql()
+    if not update_sql:
+        return []
+    columns = ', '.join(conn.ops.quote_name(field.column) for field in fields)
+    converters = [
+        (field, conn.ops.get_db_converters(field.get_col(model._meta.db_table)) + field.get_db_converters(conn))
+        for field in fields
+    ]
+    with transaction.mark_for_rollback_on_error(using=db), conn.cursor() as cursor:
+        cursor.execute(f'{update_sql} RETURNING {columns}', params)
+        rows = cursor.fetchall()
+    instances = []
+    for row in rows:
+        converted = []
+        for value, (field, field_converters) in zip(row, converters):
+            for converter in field_converters:
+                value = converter(value, field.get_col(model._meta.db_table), conn)
+            converted.append(value)
+        instances.append(model.from_db(db, [field.attname for field in fields], converted))
+    return instances
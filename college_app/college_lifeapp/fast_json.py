@@ -0,0 +1,250 @@
+"""
+Fast path for read-only list responses in the College Life App.
+
+A ModelSerializer builds a model instance and calls every field's
+``to_representation`` for each row. For serializers whose fields are all
+plain model columns, or read-only values the default manager annotates
+(such as Event.timing), ListEncoder reads ``values_list()`` tuples instead,
+converts only the columns whose JSON form differs from the database value
+(dates, times, datetimes, decimals) with converters compiled once per
+serializer, and encodes the page with a single ``json.dumps`` call. The
+bytes equal what the serializer and JSONRenderer produce for the same rows.
+
+The page travels through Response, the response cache and the renderer
+as RawJSON; FastJSONRenderer passes it through unchanged.
+"""
+import datetime
+import decimal
+import json
+from collections.abc import Mapping
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+class RawJSON(Mapping):
+    """
+    JSON bytes produced ahead of the renderer.
+
+    Reading it as a mapping (e.g. ``response.data['results']``) decodes the
+    content on first access.
+    """
+    __slots__ = ('content', '_decoded')
+
+    def __init__(self, content):
+        self.content = content
+        self._decoded = None
+
+    def decoded(self):
+        if self._decoded is None:
+            self._decoded = json.loads(self.content)
+        return self._decoded
+
+    def __getitem__(self, key):
+        return self.decoded()[key]
+
+    def __iter__(self):
+        return iter(self.decoded())
+
+    def __len__(self):
+        return len(self.decoded())
+
+    def __eq__(self, other):
+        if isinstance(other, RawJSON):
+            return other.content == self.content
+        return self.decoded() == other
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.content
+
+    def __setstate__(self, state):
+        self.content = state
+        self._decoded = None
+
+
+def dumps(data):
+    """Encode ``data`` exactly as JSONRenderer does with the default settings"""
+    text = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+    # JSONRenderer always escapes these so the output is also valid JavaScript
+    return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that writes RawJSON content without re-encoding it"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, RawJSON):
+            indent = self.get_indent(accepted_media_type, renderer_context or {})
+            if indent is None and self.compact and not self.ensure_ascii and self.strict:
+                return data.content
+            # Pretty-printed (e.g. the browsable API) or non-default JSON settings
+            data = data.decoded()
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class Unsupported(Exception):
+    """The serializer has a field the fast path cannot reproduce"""
+
+
+def _iso(value):
+    return value.isoformat()
+
+
+def _field_converter(field):
+    """
+    Return a converter from the database value to the serializer's JSON value.
+
+    None means the value is used as is; Unsupported is raised when the
+    field's representation is not reproduced here.
+    """
+    if isinstance(field, serializers.BooleanField):
+        return None
+    if isinstance(field, serializers.IntegerField):
+        return None
+    if isinstance(field, serializers.DecimalField):
+        coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+            raise Unsupported(field.field_name)
+        # The same quantize step as DecimalField.to_representation
+        exponent = Decimal('.1') ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+
+        def convert_decimal(value):
+            if value is None:
+                return ''  # DecimalField renders a missing value as '' when coercing
+            return f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+        convert_decimal.handles_none = True
+        return convert_decimal
+    if isinstance(field, serializers.DateTimeField):
+        if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601 or hasattr(field, 'timezone'):
+            raise Unsupported(field.field_name)
+        return 'datetime'
+    if isinstance(field, (serializers.DateField, serializers.TimeField)):
+        default = api_settings.DATE_FORMAT if isinstance(field, serializers.DateField) else api_settings.TIME_FORMAT
+        if getattr(field, 'format', default) != ISO_8601:
+            raise Unsupported(field.field_name)
+        return _iso
+    if isinstance(field, serializers.JSONField):
+        if field.binary:
+            raise Unsupported(field.field_name)
+        return None
+    if type(field) is serializers.ChoiceField:
+        # Choice keys are strings here, so the representation is the value itself
+        if any(not isinstance(key, str) for key in field.choices):
+            raise Unsupported(field.field_name)
+        return None
+    if type(field) in (serializers.CharField, serializers.EmailField, serializers.SlugField, serializers.URLField):
+        return None
+    raise Unsupported(field.field_name)
+
+
+class ListEncoder:
+    """Encode values_list() rows the way a ModelSerializer with ``many=True`` would"""
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        annotations = model._default_manager.get_queryset().query.annotations
+        self.names = []
+        self.columns = []
+        self.conversions = []
+        self.datetime_indexes = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                if not (field.read_only and field.source in annotations):
+                    raise Unsupported(name)
+                column = field.source
+            else:
+                if model_field.is_relation or not model_field.concrete:
+                    raise Unsupported(name)
+                column = model_field.name
+            converter = _field_converter(field)
+            position = len(self.columns)
+            self.names.append(name)
+            self.columns.append(column)
+            if converter == 'datetime':
+                self.datetime_indexes.append(position)
+            elif converter is not None:
+                self.conversions.append((position, converter))
+
+    def _converters(self):
+        """Converters for this response; datetimes depend on the active time zone"""
+        conversions = list(self.conversions)
+        if self.datetime_indexes:
+            zone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+            def convert_datetime(value):
+                if zone is not None:
+                    value = value.astimezone(zone) if timezone.is_aware(value) else timezone.make_aware(value, zone)
+                elif timezone.is_aware(value):
+                    value = timezone.make_naive(value, datetime.timezone.utc)
+                text = value.isoformat()
+                return text[:-6] + 'Z' if text.endswith('+00:00') else text
+            conversions.extend((index, convert_datetime) for index in self.datetime_indexes)
+        return conversions
+
+    def row_converter(self):
+        """Return a function turning one row into its API representation"""
+        names = self.names
+        width = len(names)
+        conversions = self._converters()
+        none_conversions = [item for item in conversions if getattr(item[1], 'handles_none', False)]
+
+        def convert_row(row):
+            values = list(row[:width])
+            for index, converter in conversions:
+                value = values[index]
+                if value is not None:
+                    values[index] = converter(value)
+            for index, converter in none_conversions:
+                if values[index] is None:
+                    values[index] = converter(None)
+            return dict(zip(names, values))
+        return convert_row
+
+    def convert(self, rows):
+        """Return the API representation of ``rows`` as a list of dicts"""
+        return list(map(self.row_converter(), rows))
+
+    def encode(self, rows):
+        """Encode ``rows`` as the JSON list a serializer with ``many=True`` renders to"""
+        return dumps(self.convert(rows))
+
+    def page(self, paginator, rows):
+        """Encode a page of rows with the paginator's envelope"""
+        return RawJSON(dumps(paginator.get_paginated_response(self.convert(rows)).data))
+
+
+_encoders = {}
+
+
+def get_list_encoder(serializer_class):
+    """Return the cached ListEncoder for ``serializer_class``, or None if it is not supported"""
+    try:
+        return _encoders[serializer_class]
+    except KeyError:
+        pass
+    try:
+        encoder = ListEncoder(serializer_class)
+    except Unsupported:
+        encoder = None
+    _encoders[serializer_class] = encoder
+    return encoder
+
+
+def fast_list_enabled():
+    return getattr(settings, 'FAST_LIST_RESPONSES', False)
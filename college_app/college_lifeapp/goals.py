@@ -0,0 +1,99 @@
+"""
+Goal statistics for the College Life App.
+Counts goals per category and status in the database, in one grouped query.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Goal
+
+GOAL_DUE_SOON_DAYS = 7
+GOAL_METRICS = ('count', 'completed', 'progress_total', 'overdue', 'due_this_week')
+
+
+def goal_stats_queryset(queryset, today):
+    """
+    Return the grouped query behind goal_stats: one row per category.
+
+    Each status gets its own set of conditional aggregates instead of a
+    second GROUP BY column, so for one user the rows come out of the
+    (user, category, deadline) index in group order without a sort.
+    """
+    open_goals = Q(completed=False)
+    conditions = {
+        'count': Q(),
+        'completed': Q(completed=True),
+        'overdue': open_goals & Q(deadline__lt=today),
+        'due_this_week': open_goals & Q(deadline__gte=today, deadline__lt=today + timedelta(days=GOAL_DUE_SOON_DAYS)),
+    }
+    # Every name is prefixed with its scope ('all' or a status) so none shadows a model field
+    aggregates = {}
+    for scope, scope_filter in _goal_scopes():
+        for metric, condition in conditions.items():
+            aggregates[f'{scope}_{metric}'] = Count('id', filter=(scope_filter & condition) or None)
+        aggregates[f'{scope}_progress_total'] = Sum('progress', filter=scope_filter or None, default=0)
+    return queryset.order_by().values('category').annotate(**aggregates).order_by('category')
+
+
+def _goal_scopes():
+    return [('all', Q())] + [(status, Q(status=status)) for status, _ in Goal.STATUS_CHOICES]
+
+
+def _goal_metrics(values):
+    count = values['count']
+    return {
+        'count': count,
+        'completed': values['completed'],
+        'completed_fraction': round(values['completed'] / count, 4) if count else None,
+        'average_progress': round(values['progress_total'] / count, 1) if count else None,
+        'overdue': values['overdue'],
+        'due_this_week': values['due_this_week'],
+    }
+
+
+def goal_stats(queryset=None, today=None):
+    """
+    Summarize goals per category and status.
+
+    Args:
+        queryset: Goal queryset to summarize (defaults to all goals)
+        today: Date that overdue and due-this-week counts are measured from
+
+    Returns:
+        dict: metrics per category, each with a ``by_status`` breakdown,
+        plus the same metrics over every goal in ``overall``; categories
+        without goals are reported with zero counts
+    """
+    today = today or timezone.localdate()
+    if queryset is None:
+        queryset = Goal.objects.all()
+    scopes = [scope for scope, _ in _goal_scopes()]
+    totals = {f'{scope}_{metric}': 0 for scope in scopes for metric in GOAL_METRICS}
+    rows = {row['category']: row for row in goal_stats_queryset(queryset, today)}
+
+    def split(values):
+        metrics = {
+            scope: _goal_metrics({metric: values[f'{scope}_{metric}'] for metric in GOAL_METRICS})
+            for scope in scopes
+        }
+        return {**metrics.pop('all'), 'by_status': metrics}
+
+    categories = {}
+    for category, _ in Goal.CATEGORY_CHOICES:
+        values = rows.pop(category, None) or dict.fromkeys(totals, 0)
+        categories[category] = split(values)
+        for key in totals:
+            totals[key] += values[key]
+    # Categories no longer offered still count
+    for category, values in sorted(rows.items()):
+        categories[category] = split(values)
+        for key in totals:
+            totals[key] += values[key]
+    return {
+        'date': today.isoformat(),
+        'due_this_week_until': (today + timedelta(days=GOAL_DUE_SOON_DAYS)).isoformat(),
+        'by_category': categories,
+        'overall': split(totals),
+    }
@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from college_lifeapp.benchmarks import (
+    BASELINE_TOLERANCE, COLD_START_BUDGET, LOAD_REQUESTS, SCENARIOS, compare_results, failed_requests,
+    run_scenarios,
+)
+
+
+class Command(BaseCommand):
+    help = "Run performance benchmark scenarios against a temporary SQLite database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help="Scenarios to run (default: all)")
+        parser.add_argument('--size', type=int, default=500, help="Rows per collection")
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent threads for contention scenarios")
+        parser.add_argument(
+            '--cold-start-budget', type=float, default=COLD_START_BUDGET,
+            help="Seconds from process start to ready before cold_start fails",
+        )
+        parser.add_argument(
+            '--requests', type=int, default=LOAD_REQUESTS, help="Requests per route for the load scenario"
+        )
+        parser.add_argument('--json', dest='json_path', help="Also write results to this JSON file")
+        parser.add_argument('--baseline', help="Compare against results saved earlier with --json")
+        parser.add_argument(
+            '--tolerance', type=float, default=BASELINE_TOLERANCE,
+            help="Fraction a metric may be worse than the baseline before it counts as a regression",
+        )
+        parser.add_argument('--list', action='store_true', help="List available scenarios and exit")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name, func in SCENARIOS.items():
+                self.stdout.write(f"{name}: {func.__doc__}")
+            return
+
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}")
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {e}")
+
+        results = run_scenarios(
+            names, size=options['size'], threads=options['threads'], requests=options['requests'],
+            cold_start_budget=options['cold_start_budget'],
+        )
+        for name, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for key, value in result.items():
+                self.stdout.write(f"  {key}: {value}")
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+        regressions = []
+        if baseline is not None:
+            regressions = self.report_baseline(baseline, results, options['tolerance'])
+
+        failed = failed_requests(results)
+        if failed:
+            raise CommandError(f"Requests failed: {', '.join(failed)}")
+        over_budget = [name for name, result in results.items() if result.get('within_budget') is False]
+        if over_budget:
+            raise CommandError(f"Over budget: {', '.join(over_budget)}")
+        if regressions:
+            raise CommandError(f"{len(regressions)} metric(s) regressed against {options['baseline']}")
+
+    def report_baseline(self, baseline, results, tolerance):
+        """Print the change of every comparable metric and return the regressed keys"""
+        self.stdout.write(self.style.MIGRATE_HEADING(f"compared to baseline (tolerance {tolerance:.0%})"))
+        for name in results:
+            if name in baseline:
+                for key in ('size', 'threads', 'requests_per_route'):
+                    if key in results[name] and baseline[name].get(key) != results[name][key]:
+                        self.stdout.write(self.style.WARNING(
+                            f"  {name}: {key} was {baseline[name].get(key)}, now {results[name][key]}"
+                        ))
+        regressions = []
+        for key, old, new, change, regressed in compare_results(baseline, results, tolerance):
+            change = 'n/a' if change is None else f"{change:+.1%}"
+            line = f"  {key}: {old} -> {new} ({change})"
+            if regressed:
+                regressions.append(key)
+                line = self.style.ERROR(line + " REGRESSION")
+            self.stdout.write(line)
+        return regressions
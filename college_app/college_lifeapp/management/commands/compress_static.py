@@ -0,0 +1,60 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+
+COMPRESSIBLE = ('.css', '.js', '.mjs', '.json', '.svg', '.html', '.txt', '.map', '.xml', '.ico')
+MIN_SIZE = 1024
+
+
+class Command(BaseCommand):
+    help = "Write .gz (and .br when brotli is installed) variants next to the project's static files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Recompress files whose variants are up to date")
+
+    def handle(self, *args, **options):
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            self.stdout.write("brotli is not installed; writing gzip variants only (pip install brotli)")
+
+        compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            compressors.append(('.br', lambda data: brotli.compress(data, quality=11)))
+
+        written = skipped = 0
+        for path in self.project_files():
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            for suffix, compress in compressors:
+                target = path + suffix
+                if not options['force'] and os.path.exists(target) and (
+                    os.path.getmtime(target) >= os.path.getmtime(path)
+                ):
+                    skipped += 1
+                    continue
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as handle:
+                    handle.write(compressed)
+                written += 1
+                self.stdout.write(f"{target}: {len(data)} -> {len(compressed)} bytes")
+        self.stdout.write(self.style.SUCCESS(f"{written} variant(s) written, {skipped} up to date"))
+
+    def project_files(self):
+        """Yield compressible static files that live in this project, not in installed packages"""
+        base = os.path.realpath(settings.BASE_DIR)
+        seen = set()
+        for finder in finders.get_finders():
+            for name, storage in finder.list([]):
+                path = os.path.realpath(storage.path(name))
+                if path in seen or not path.startswith(base + os.sep):
+                    continue
+                seen.add(path)
+                if path.endswith(COMPRESSIBLE) and os.path.getsize(path) >= MIN_SIZE:
+                    yield path
@@ -0,0 +1,44 @@
+import os
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from college_lifeapp.transfer import COLLECTIONS, FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream a collection to CSV or NDJSON without loading it into memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument('collection', choices=list(COLLECTIONS))
+        parser.add_argument('--output', '-o', help="File to write (default: stdout); the extension picks the format")
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS), help="Output format (default: csv)")
+        parser.add_argument('--user', help="Only export rows owned by this username")
+
+    def handle(self, *args, **options):
+        path = options['output']
+        file_format = options['file_format']
+        if file_format is None:
+            extension = os.path.splitext(path)[1].lstrip('.') if path else ''
+            file_format = extension if extension in FORMATS else 'csv'
+
+        model = COLLECTIONS[options['collection']][0]
+        queryset = model.objects.all()
+        if options['user']:
+            try:
+                queryset = queryset.filter(user=User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['user']!r}")
+
+        handle = open(path, 'wb') if path else sys.stdout.buffer
+        try:
+            for chunk in iter_export(queryset, options['collection'], file_format):
+                handle.write(chunk)
+        finally:
+            if path:
+                handle.close()
+            else:
+                handle.flush()
+        if path:
+            self.stderr.write(f"Exported {options['collection']} to {path}")
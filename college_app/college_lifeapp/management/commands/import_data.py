@@ -0,0 +1,44 @@
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from college_lifeapp.transfer import COLLECTIONS, FORMATS, IMPORT_BATCH_SIZE, import_records
+
+
+class Command(BaseCommand):
+    help = "Import a CSV or NDJSON file into a collection in bounded bulk_create batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('collection', choices=list(COLLECTIONS))
+        parser.add_argument('path', help="CSV or NDJSON file; the extension picks the format")
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS), help="Input format")
+        parser.add_argument('--user', help="Owner of the imported rows (default: the first user)")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or os.path.splitext(path)[1].lstrip('.')
+        if file_format not in FORMATS:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError("No user found in database")
+
+        with open(path, newline='', encoding='utf-8') as handle:
+            report = import_records(handle, file_format, options['collection'], user, options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            f"Imported {report['created']} {options['collection']} in {report['batches']} batch(es) "
+            f"for {user.username}; {report['failed']} row(s) failed"
+        )
+        if report['failed'] and not report['created']:
+            raise CommandError("Nothing was imported")
@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from college_lifeapp.seeding import BATCH_SIZE, DEFAULT_SKEW, USERNAME_PREFIX, ScaleSeeder
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic data set (users, profiles, routines, expenses, events, goals)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Users (each gets a profile)")
+        parser.add_argument('--routines', type=int, default=5000)
+        parser.add_argument('--expenses', type=int, default=100000)
+        parser.add_argument('--events', type=int, default=20000)
+        parser.add_argument('--goals', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same rows")
+        parser.add_argument('--end', type=date.fromisoformat, help="Last day of the data (default: today)")
+        parser.add_argument('--days', type=int, default=365, help="Days of expense history")
+        parser.add_argument(
+            '--skew', type=float, default=DEFAULT_SKEW,
+            help="Pareto shape of per-user activity; lower gives a few much heavier users",
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Rows per executemany call")
+        parser.add_argument('--prefix', default=USERNAME_PREFIX, help="Username prefix for generated users")
+        parser.add_argument(
+            '--drop-indexes', action='store_true',
+            help="Drop the seeded tables' secondary indexes during the load and rebuild them after",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("seed_scale writes SQLite directly; the default database is not SQLite")
+        if options['users'] < 1:
+            raise CommandError("--users must be at least 1")
+        if options['days'] < 1 or options['batch_size'] < 1 or options['skew'] <= 0:
+            raise CommandError("--days and --batch-size must be at least 1 and --skew positive")
+        sizes = {name: options[name] for name in ('routines', 'expenses', 'events', 'goals')}
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError("Row counts cannot be negative")
+
+        seeder = ScaleSeeder(
+            seed=options['seed'], end=options['end'], days=options['days'], skew=options['skew'],
+            batch_size=options['batch_size'], prefix=options['prefix'], log=self.stdout.write,
+        )
+        timings = seeder.seed(options['users'], drop_indexes=options['drop_indexes'], **sizes)
+
+        rows = sum(count for count, _ in timings.values())
+        seconds = sum(elapsed for _, elapsed in timings.values())
+        message = f"Seeded {rows:,} rows in {seconds:.1f}s ({rows / seconds if seconds else 0:,.0f} rows/s)"
+        if seeder.rebuild_seconds:
+            message += f", plus {seeder.rebuild_seconds:.1f}s rebuilding indexes"
+        self.stdout.write(self.style.SUCCESS(message))
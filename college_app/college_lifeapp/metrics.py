@@ -0,0 +1,398 @@
+"""
+Request and SQL metrics for the College Life App in Prometheus text format.
+
+Each thread records into its own shard, so the request path only ever
+touches counters no other thread writes and never takes a lock. Histogram
+buckets are allocated once per route; a scrape sums the shards.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+METRIC_PREFIX = 'college_app'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of the histogram buckets; a final +Inf bucket is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Statement durations kept per thread for the rolling latency percentiles
+RECENT_QUERY_WINDOW = 1024
+# A BEGIN slower than this waited for another connection's write lock
+LOCK_WAIT_THRESHOLD = 0.001
+# Only these BEGINs take the write lock; a deferred BEGIN returns at once
+# and the wait happens inside whichever statement first writes
+LOCKING_BEGINS = ('BEGIN IMMEDIATE', 'BEGIN EXCLUSIVE')
+
+UNMATCHED_VIEW = 'unmatched'
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts`` holds per-bucket (not cumulative) counts"""
+    __slots__ = ('bounds', 'counts', 'total')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+
+
+class RouteStats:
+    """Counters for one (view, method) pair within a shard"""
+    __slots__ = ('responses', 'duration', 'size', 'queries', 'query_seconds', 'queries_per_request')
+
+    def __init__(self):
+        self.responses = {}
+        self.duration = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+
+    def merge(self, other):
+        for code, count in list(other.responses.items()):
+            self.responses[code] = self.responses.get(code, 0) + count
+        self.duration.merge(other.duration)
+        self.size.merge(other.size)
+        self.queries += other.queries
+        self.query_seconds += other.query_seconds
+        self.queries_per_request.merge(other.queries_per_request)
+
+
+class Shard:
+    """Metrics written by a single thread"""
+    __slots__ = ('routes', 'in_flight', 'recent_queries', 'recent_index',
+                 'lock_waits', 'lock_wait_seconds', 'lock_timeouts')
+
+    def __init__(self):
+        self.routes = {}
+        self.in_flight = 0
+        self.recent_queries = [0.0] * RECENT_QUERY_WINDOW
+        self.recent_index = 0
+        self.lock_waits = 0
+        self.lock_wait_seconds = 0.0
+        self.lock_timeouts = 0
+
+    def record_query(self, seconds):
+        self.recent_queries[self.recent_index % RECENT_QUERY_WINDOW] = seconds
+        self.recent_index += 1
+
+    def recent(self):
+        """Return the durations currently in the window"""
+        return self.recent_queries[:min(self.recent_index, RECENT_QUERY_WINDOW)]
+
+
+class MetricsRegistry:
+    """Process-wide set of per-thread shards"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+
+    def shard(self):
+        """Return the calling thread's shard, creating it on first use"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.routes.clear()
+                shard.recent_index = 0
+                shard.lock_waits = shard.lock_timeouts = 0
+                shard.lock_wait_seconds = 0.0
+
+    def shards(self):
+        with self._lock:
+            return list(self._shards)
+
+    def collect(self):
+        """
+        Sum every shard.
+
+        Returns:
+            tuple: (routes: dict of (view, method) -> RouteStats, in_flight: int)
+        """
+        routes = {}
+        in_flight = 0
+        for shard in self.shards():
+            in_flight += shard.in_flight
+            for key, stats in list(shard.routes.items()):
+                routes.setdefault(key, RouteStats()).merge(stats)
+        return routes, in_flight
+
+
+registry = MetricsRegistry()
+
+
+def lock_waits_measured():
+    """
+    Whether lock waits can be measured: some SQLite database begins its
+    transactions IMMEDIATE or EXCLUSIVE, as the performance profile does.
+    """
+    return any(
+        (settings_dict.get('OPTIONS', {}).get('transaction_mode') or '').upper() in ('IMMEDIATE', 'EXCLUSIVE')
+        for settings_dict in (connections.settings[alias] for alias in connections)
+        if settings_dict['ENGINE'] == 'django.db.backends.sqlite3'
+    )
+
+
+def get_lock_stats():
+    """
+    Sum the lock counters of every shard.
+
+    The wait counters are left out unless ``lock_waits_measured()``, since
+    they would always read zero.
+    """
+    waits = timeouts = 0
+    seconds = 0.0
+    for shard in registry.shards():
+        waits += shard.lock_waits
+        seconds += shard.lock_wait_seconds
+        timeouts += shard.lock_timeouts
+    if not lock_waits_measured():
+        return {'lock_timeouts': timeouts}
+    return {'lock_waits': waits, 'lock_wait_seconds': round(seconds, 6), 'lock_timeouts': timeouts}
+
+
+def get_query_latency_percentiles(percentiles=(50, 90, 99)):
+    """
+    Summarize the most recent statement durations of every thread.
+
+    Returns:
+        dict: sample count plus the requested percentiles and max, in milliseconds
+    """
+    samples = sorted(duration for shard in registry.shards() for duration in shard.recent())
+    summary = {'samples': len(samples)}
+    if not samples:
+        return summary
+    for percentile in percentiles:
+        index = min(len(samples) - 1, len(samples) * percentile // 100)
+        summary[f'p{percentile}_ms'] = round(samples[index] * 1000, 3)
+    summary['max_ms'] = round(samples[-1] * 1000, 3)
+    return summary
+
+
+class RequestQueries:
+    """SQL statement count and time for one request"""
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware for the duration of a request. Context variables
+# follow the request into the threads the async ORM runs queries on.
+current_request_queries = ContextVar('current_request_queries', default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection that times SQL statements.
+
+    Durations go to the executing thread's shard and, inside a request, to
+    the request's counters. A BEGIN IMMEDIATE is where SQLite waits for the
+    write lock, so its time is also booked as lock wait.
+    """
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    except OperationalError as e:
+        if 'locked' in str(e) or 'busy' in str(e):
+            registry.shard().lock_timeouts += 1
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        shard = registry.shard()
+        shard.record_query(elapsed)
+        if sql.startswith(LOCKING_BEGINS):
+            shard.lock_wait_seconds += elapsed
+            if elapsed > LOCK_WAIT_THRESHOLD:
+                shard.lock_waits += 1
+        queries = current_request_queries.get()
+        if queries is not None:
+            queries.count += 1
+            queries.seconds += elapsed
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    if getattr(settings, 'METRICS_ENABLED', True) and time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def get_view_name(request):
+    """Return a bounded label for the view that served ``request``"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_VIEW
+    return match.view_name or match._func_path
+
+
+def get_response_size(response):
+    """Return the body size in bytes, or None for streaming responses"""
+    if response.streaming:
+        length = response.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, response size and SQL usage per view and method.
+
+    Works in both WSGI and ASGI stacks. Disabled with ``METRICS_ENABLED =
+    False``. Place it first in MIDDLEWARE so the latency covers the rest of
+    the middleware stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        shard = registry.shard()
+        queries = RequestQueries()
+        token = current_request_queries.set(queries)
+        shard.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            shard.in_flight -= 1
+            current_request_queries.reset(token)
+        self.record(shard, request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        shard = registry.shard()
+        queries = RequestQueries()
+        token = current_request_queries.set(queries)
+        shard.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            shard.in_flight -= 1
+            current_request_queries.reset(token)
+        self.record(shard, request, response, time.perf_counter() - start, queries)
+        return response
+
+    def record(self, shard, request, response, elapsed, queries):
+        key = (get_view_name(request), request.method)
+        stats = shard.routes.get(key)
+        if stats is None:
+            stats = shard.routes[key] = RouteStats()
+        stats.responses[response.status_code] = stats.responses.get(response.status_code, 0) + 1
+        stats.duration.observe(elapsed)
+        size = get_response_size(response)
+        if size is not None:
+            stats.size.observe(size)
+        stats.queries += queries.count
+        stats.query_seconds += queries.seconds
+        stats.queries_per_request.observe(queries.count)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_bound(bound):
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def _histogram_lines(name, labels, histogram):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{_labels(**labels, le=_format_bound(bound))} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {cumulative}')
+    lines.append(f'{name}_sum{_labels(**labels)} {histogram.total}')
+    lines.append(f'{name}_count{_labels(**labels)} {cumulative}')
+    return lines
+
+
+def render_metrics():
+    """Render every metric in the Prometheus text exposition format"""
+    routes, in_flight = registry.collect()
+    routes = sorted(routes.items())
+    lock_stats = get_lock_stats()
+    families = [
+        ('http_requests_in_flight', 'gauge', 'Requests currently being served', None),
+        ('http_responses_total', 'counter', 'Responses by view, method and status code',
+         lambda name, labels, stats: [
+             f'{name}{_labels(**labels, status=code)} {count}'
+             for code, count in sorted(stats.responses.items())
+         ]),
+        ('http_request_duration_seconds', 'histogram', 'Time spent serving requests',
+         lambda name, labels, stats: _histogram_lines(name, labels, stats.duration)),
+        ('http_response_size_bytes', 'histogram', 'Size of non-streaming response bodies',
+         lambda name, labels, stats: _histogram_lines(name, labels, stats.size)),
+        ('db_queries_total', 'counter', 'SQL statements executed while serving requests',
+         lambda name, labels, stats: [f'{name}{_labels(**labels)} {stats.queries}']),
+        ('db_query_duration_seconds_total', 'counter', 'Time spent executing SQL while serving requests',
+         lambda name, labels, stats: [f'{name}{_labels(**labels)} {stats.query_seconds}']),
+        ('db_queries_per_request', 'histogram', 'SQL statements executed per request',
+         lambda name, labels, stats: _histogram_lines(name, labels, stats.queries_per_request)),
+    ]
+
+    lines = []
+    for family, kind, help_text, render in families:
+        name = f'{METRIC_PREFIX}_{family}'
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if render is None:
+            lines.append(f'{name} {in_flight}')
+            continue
+        for (view, method), stats in routes:
+            lines.extend(render(name, {'view': view, 'method': method}, stats))
+    for family, key, help_text in [
+        ('db_lock_waits_total', 'lock_waits', 'Transactions that waited for the SQLite write lock'),
+        ('db_lock_wait_seconds_total', 'lock_wait_seconds', 'Time spent waiting for the SQLite write lock'),
+        ('db_lock_timeouts_total', 'lock_timeouts', 'Statements that failed with database is locked'),
+    ]:
+        if key not in lock_stats:
+            continue
+        name = f'{METRIC_PREFIX}_{family}'
+        lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name} {lock_stats[key]}'])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Expense = apps.get_model('college_lifeapp', 'Expense')
+    ExpenseMonthlyRollup = apps.get_model('college_lifeapp', 'ExpenseMonthlyRollup')
+    totals = (
+        Expense.objects.annotate(month=TruncMonth('date'))
+        .order_by()
+        .values('user_id', 'category', 'month')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    ExpenseMonthlyRollup.objects.bulk_create(ExpenseMonthlyRollup(**row) for row in totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college_lifeapp', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('Food', 'Food'), ('Transport', 'Transport'), ('Books', 'Books'), ('Entertainment', 'Entertainment'), ('Other', 'Other')], max_length=20)),
+                ('month', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expense_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month', 'category'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month', 'category'), name='unique_expense_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
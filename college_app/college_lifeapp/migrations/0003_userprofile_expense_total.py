@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:03
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_expense_totals(apps, schema_editor):
+    Expense = apps.get_model('college_lifeapp', 'Expense')
+    UserProfile = apps.get_model('college_lifeapp', 'UserProfile')
+    totals = (
+        Expense.objects.filter(user=OuterRef('user')).order_by()
+        .values('user').annotate(total=Sum('amount')).values('total')
+    )
+    UserProfile.objects.update(expense_total=Coalesce(Subquery(totals), Value(Decimal('0.00'))))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college_lifeapp', '0002_expense_monthly_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='expense_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.RunPython(backfill_expense_totals, migrations.RunPython.noop),
+    ]
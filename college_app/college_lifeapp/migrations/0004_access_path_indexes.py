@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college_lifeapp', '0003_userprofile_expense_total'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'date'], name='event_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['date', 'created_at'], name='expense_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'date', 'created_at'], name='expense_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'category'], name='expense_user_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expensemonthlyrollup',
+            index=models.Index(fields=['month', 'category'], name='rollup_month_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['deadline'], name='goal_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'deadline', 'status'], name='goal_user_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['category', 'status', 'deadline'], name='goal_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='routine',
+            index=models.Index(fields=['time'], name='routine_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='routine',
+            index=models.Index(fields=['user', 'time'], name='routine_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+DAY_CODES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def backfill_routine_days(apps, schema_editor):
+    Routine = apps.get_model('college_lifeapp', 'Routine')
+    RoutineDay = apps.get_model('college_lifeapp', 'RoutineDay')
+    RoutineDay.objects.bulk_create(
+        RoutineDay(routine_id=routine.pk, user_id=routine.user_id, day=day, time=routine.time)
+        for routine in Routine.objects.iterator()
+        for day in dict.fromkeys(routine.days or [])
+        if day in DAY_CODES
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college_lifeapp', '0004_access_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoutineDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.CharField(choices=[('Mon', 'Monday'), ('Tue', 'Tuesday'), ('Wed', 'Wednesday'), ('Thu', 'Thursday'), ('Fri', 'Friday'), ('Sat', 'Saturday'), ('Sun', 'Sunday')], max_length=3)),
+                ('time', models.TimeField()),
+                ('routine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_entries', to='college_lifeapp.routine')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['day', 'time'],
+                'indexes': [models.Index(fields=['day', 'time'], name='routineday_day_time_idx'), models.Index(fields=['user', 'day', 'time'], name='routineday_user_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('routine', 'day'), name='unique_routine_day')],
+            },
+        ),
+        migrations.RunPython(backfill_routine_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:08
+
+from itertools import islice
+
+import college_lifeapp.models
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def backfill_starts_at(apps, schema_editor):
+    Event = apps.get_model('college_lifeapp', 'Event')
+    events = Event.objects.only('date', 'time').iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(events, BATCH_SIZE)):
+        for event in batch:
+            event.starts_at = college_lifeapp.models.event_start(event.date, event.time)
+        Event.objects.bulk_update(batch, ['starts_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college_lifeapp', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=college_lifeapp.models.EventStartField(null=True),
+        ),
+        migrations.RunPython(backfill_starts_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='starts_at',
+            field=college_lifeapp.models.EventStartField(),
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='timing',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['starts_at'], name='event_starts_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'starts_at'], name='event_user_starts_at_idx'),
+        ),
+    ]
@@ -1,20 +1,67 @@
+import re
+from datetime import datetime, time
+from decimal import Decimal
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Now, TruncDate
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class UserProfileQuerySet(models.QuerySet):
+    def with_spending(self, today=None):
+        """
+        Annotate ``spent_this_month`` and ``spent_all_time`` in the same query.
+
+        Both values come from correlated subqueries over the monthly expense
+        rollups, so the cost per profile depends on the number of months with
+        spending rather than the number of expenses.
+        """
+        today = today or timezone.localdate()
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+        rollups = ExpenseMonthlyRollup.objects.filter(user=OuterRef('user')).order_by().values('user')
+        this_month = rollups.filter(month=today.replace(day=1)).annotate(total=Sum('total')).values('total')
+        all_time = rollups.annotate(total=Sum('total')).values('total')
+        return self.select_related('user').annotate(
+            spent_this_month=Coalesce(Subquery(this_month, output_field=money), Value(Decimal('0.00')), output_field=money),
+            spent_all_time=Coalesce(Subquery(all_time, output_field=money), Value(Decimal('0.00')), output_field=money),
+        )
+
 
 class UserProfile(models.Model):
     """Extended user profile for college students"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     major = models.CharField(max_length=100)
     monthly_budget = models.DecimalField(max_digits=10, decimal_places=2, default=800.00)
+    # Running total of the user's expenses, maintained when PROFILE_SPEND_COUNTER is on
+    expense_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    
+    objects = UserProfileQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.user.username}'s profile"
     
     @property
     def total_spent(self):
-        """Calculate total expenses for current month"""
-        return sum(expense.amount for expense in self.expenses.all())
+        """Total of all the user's expenses"""
+        if hasattr(self, 'spent_all_time'):
+            return self.spent_all_time
+        if getattr(settings, 'PROFILE_SPEND_COUNTER', False):
+            return self.expense_total
+        total = self.user.expenses.aggregate(total=Sum('amount'))['total']
+        return total if total is not None else Decimal('0.00')
+    
+    @property
+    def total_spent_this_month(self):
+        """Total of the user's expenses for the current month"""
+        if hasattr(self, 'spent_this_month'):
+            return self.spent_this_month
+        total = self.user.expense_rollups.filter(
+            month=timezone.localdate().replace(day=1)
+        ).aggregate(total=Sum('total'))['total']
+        return total if total is not None else Decimal('0.00')
 
 
 class Routine(models.Model):
@@ -35,6 +82,7 @@ class Routine(models.Model):
         ('Sat', 'Saturday'),
         ('Sun', 'Sunday'),
     ]
+    DAY_CODES = [code for code, _ in DAYS_CHOICES]  # Monday first, matching date.weekday()
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='routines')
     title = models.CharField(max_length=200)
@@ -45,9 +93,54 @@ class Routine(models.Model):
     
     class Meta:
         ordering = ['time']
+        indexes = [
+            models.Index(fields=['time'], name='routine_time_idx'),
+            models.Index(fields=['user', 'time'], name='routine_user_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.time}"
+    
+    def save(self, *args, **kwargs):
+        """Save inside a transaction so the day index written in post_save commits with the row"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class RoutineDay(models.Model):
+    """Indexed copy of Routine.days: one row per routine per weekday"""
+    routine = models.ForeignKey(Routine, on_delete=models.CASCADE, related_name='day_entries')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    day = models.CharField(max_length=3, choices=Routine.DAYS_CHOICES)
+    time = models.TimeField()  # Mirrors Routine.time so day lookups come back in order
+    
+    class Meta:
+        ordering = ['day', 'time']
+        indexes = [
+            models.Index(fields=['day', 'time'], name='routineday_day_time_idx'),
+            models.Index(fields=['user', 'day', 'time'], name='routineday_user_day_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['routine', 'day'], name='unique_routine_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.routine.title} on {self.day}"
+    
+    @classmethod
+    def sync_for(cls, routines):
+        """Rewrite the day rows for the given saved routines from their ``days`` lists"""
+        routines = list(routines)
+        if not routines:
+            return
+        with transaction.atomic():
+            cls.objects.filter(routine__in=[routine.pk for routine in routines]).delete()
+            cls.objects.bulk_create(
+                cls(routine=routine, user_id=routine.user_id, day=day, time=routine.time)
+                for routine in routines
+                for day in dict.fromkeys(routine.days or [])
+                if day in Routine.DAY_CODES
+            )
 
 
 class Expense(models.Model):
@@ -69,9 +162,136 @@ class Expense(models.Model):
     
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['date', 'created_at'], name='expense_date_idx'),
+            models.Index(fields=['user', 'date', 'created_at'], name='expense_user_date_idx'),
+            models.Index(fields=['user', 'category'], name='expense_user_category_idx'),
+        ]
     
     def __str__(self):
         return f"{self.item} - ${self.amount}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Save inside a transaction so the rollup update in post_save commits with the row"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        # Stored as the database would return them, e.g. a Decimal for an amount given as '3.50'
+        self._loaded_values = {
+            'user_id': self.user_id,
+            'category': self.category,
+            'date': self._meta.get_field('date').to_python(self.date),
+            'amount': self._meta.get_field('amount').to_python(self.amount),
+        }
+
+
+class ExpenseMonthlyRollup(models.Model):
+    """Per-user, per-category monthly expense totals kept in step with Expense writes"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='expense_rollups')
+    category = models.CharField(max_length=20, choices=Expense.CATEGORY_CHOICES)
+    month = models.DateField()  # First day of the month
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-month', 'category']
+        indexes = [
+            models.Index(fields=['month', 'category'], name='rollup_month_category_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month', 'category'], name='unique_expense_rollup'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} {self.month:%Y-%m} {self.category} - ${self.total}"
+
+
+EVENT_TIME = re.compile(r'^\s*(\d{1,2})(?:[:.](\d{2}))?\s*(?:([ap])\.?\s*m\b\.?)?', re.IGNORECASE)
+NAMED_EVENT_TIMES = {'noon': time(12), 'midday': time(12), 'midnight': time(0)}
+
+
+def parse_event_time(text):
+    """
+    Read the start time from free text such as '3:30 PM', '19:00', '7pm - 9pm' or 'noon'.
+
+    Returns None when the text has no recognizable time.
+    """
+    text = (text or '').strip().lower()
+    for name, value in NAMED_EVENT_TIMES.items():
+        if text.startswith(name):
+            return value
+    match = EVENT_TIME.match(text)
+    if not match:
+        return None
+    hour, minute = int(match[1]), int(match[2] or 0)
+    if match[3]:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match[3] == 'p' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def event_start(day, text):
+    """The start of an event on ``day`` at the time in ``text``, or the start of the day"""
+    start = datetime.combine(day, parse_event_time(text) or time.min)
+    if settings.USE_TZ:
+        start = timezone.make_aware(start, timezone.get_default_timezone())
+    return start
+
+
+def event_timing(day, today=None):
+    """'past', 'today' or 'upcoming' for an event on ``day``"""
+    today = today or timezone.localdate()
+    if day < today:
+        return 'past'
+    return 'today' if day == today else 'upcoming'
+
+
+class EventStartField(models.DateTimeField):
+    """Start timestamp derived from the event's ``date`` and ``time`` on every save and bulk_create"""
+    
+    def __init__(self, *args, **kwargs):
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['editable']
+        return name, path, args, kwargs
+    
+    def pre_save(self, model_instance, add):
+        value = event_start(model_instance.date, model_instance.time)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class EventQuerySet(models.QuerySet):
+    def with_timing(self, today=None):
+        """
+        Annotate ``timing`` from the event date and today's date.
+
+        Without ``today`` the date comes from the database clock, so the
+        value is computed when the query runs and never goes stale.
+        """
+        today = Value(today) if today else TruncDate(Now())
+        return self.annotate(timing=Case(
+            When(date__lt=today, then=Value('past')),
+            When(date=today, then=Value('today')),
+            default=Value('upcoming'),
+            output_field=models.CharField(),
+        ))
+
+
+class EventManager(models.Manager.from_queryset(EventQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().with_timing()
 
 
 class Event(models.Model):
@@ -84,6 +304,7 @@ class Event(models.Model):
     ]
     
     TIMING_CHOICES = [
+        ('past', 'Past'),
         ('today', 'Today'),
         ('upcoming', 'Upcoming'),
     ]
@@ -92,19 +313,39 @@ class Event(models.Model):
     title = models.CharField(max_length=200)
     date = models.DateField()
     time = models.CharField(max_length=50)
+    # Parsed from ``date`` and ``time``; events whose time cannot be read start at midnight
+    starts_at = EventStartField()
     location = models.CharField(max_length=200)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     rsvped = models.BooleanField(default=False)
     is_favorite = models.BooleanField(default=False)
-    timing = models.CharField(max_length=20, choices=TIMING_CHOICES, default='upcoming')
     attendees = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = EventManager()
+    
     class Meta:
         ordering = ['date']
+        indexes = [
+            models.Index(fields=['date'], name='event_date_idx'),
+            models.Index(fields=['user', 'date'], name='event_user_date_idx'),
+            models.Index(fields=['starts_at'], name='event_starts_at_idx'),
+            models.Index(fields=['user', 'starts_at'], name='event_user_starts_at_idx'),
+        ]
     
     def __str__(self):
         return self.title
+    
+    @property
+    def timing(self):
+        """'past', 'today' or 'upcoming'; annotated by the default manager, else computed here"""
+        if '_timing' in self.__dict__:
+            return self._timing
+        return event_timing(self.date)
+    
+    @timing.setter
+    def timing(self, value):
+        self._timing = value
 
 
 class Goal(models.Model):
@@ -133,6 +374,12 @@ class Goal(models.Model):
     
     class Meta:
         ordering = ['deadline']
+        indexes = [
+            models.Index(fields=['deadline'], name='goal_deadline_idx'),
+            models.Index(fields=['user', 'deadline', 'status'], name='goal_user_deadline_idx'),
+            models.Index(fields=['category', 'status', 'deadline'], name='goal_category_status_idx'),
+            models.Index(fields=['user', 'category', 'deadline'], name='goal_user_category_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -0,0 +1,232 @@
+"""
+Pagination classes for the College Life App API.
+Provides keyset (cursor) pagination so deep pages cost the same as the first.
+"""
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on the model's ordering plus an ``id`` tie-breaker.
+
+    Each page is fetched with a range condition on the ordering columns, e.g.
+    (date, created_at, id) for expenses, so it is served from the matching
+    index without an OFFSET. Cursors are opaque tokens holding the position
+    of the last row seen and the direction of travel.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, queryset, view):
+        """Return the ordering fields, ending with an ``id`` tie-breaker"""
+        ordering = list(
+            getattr(view, 'keyset_ordering', None)
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+            or []
+        )
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-id' if descending else 'id')
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering_field(self, model, field):
+        """Return the model field an ordering entry such as '-date' or 'day_entries__time' sorts on"""
+        opts = model._meta
+        *path, name = field.lstrip('-').split(LOOKUP_SEP)
+        for part in path:
+            opts = opts.get_field(part).related_model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def decode_cursor(self, request, model):
+        """
+        Return the (position, reverse) the cursor points at, or (None, False) without one.
+
+        Position values are converted with their ordering field, so a tampered
+        cursor is reported as invalid rather than failing inside the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = data['p'], bool(data.get('r', False))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.get_ordering_field(model, field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+            if any(value is None for value in position):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def keyset_filter(self, ordering, position):
+        """
+        Build the condition for rows strictly after ``position`` in ``ordering``.
+
+        The leading column is also bounded on its own so the database can turn
+        it into an index range before checking the tie-breaking columns.
+        """
+        condition = None
+        for index in reversed(range(len(ordering))):
+            field = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            after = Q(**{f'{field}__{lookup}': position[index]})
+            if condition is not None:
+                after |= Q(**{field: position[index]}) & condition
+            condition = after
+        first = ordering[0].lstrip('-')
+        bound = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{first}__{bound}': position[0]}) & condition
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            name = 'pk' if name == 'id' else name
+            position.append(_encode_value(getattr(instance, name)))
+        return position
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the queryset for the requested page, with one extra row to detect more pages"""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.ordering = self.get_ordering(queryset, view)
+        self.limit = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, self.position))
+        return queryset[:self.limit + 1]
+
+    def finish_page(self, results, get_position=None):
+        """Trim the fetched rows to the page and work out the next/previous positions"""
+        get_position = get_position or self.get_position
+        position, reverse = self.position, self.reverse
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = get_position(results[-1])
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_position = get_position(results[0])
+        elif position is not None:
+            # Empty page: offer a way back from where the cursor pointed
+            position = [_encode_value(value) for value in position]
+            if reverse:
+                self.next_position = position
+            else:
+                self.previous_position = position
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async variant of paginate_queryset using the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.finish_page([instance async for instance in queryset])
+
+    def get_rows_queryset(self, queryset, request, fields, view=None):
+        """
+        Return the page as ``values_list()`` tuples and a function reading a row's position.
+
+        The tuples start with ``fields``; ordering columns not among them are
+        appended so cursors can be built without model instances.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        names = ['id' if field.lstrip('-') == 'pk' else field.lstrip('-') for field in self.ordering]
+        columns = list(fields) + [name for name in names if name not in fields]
+        indexes = [columns.index(name) for name in names]
+
+        def get_position(row):
+            return [_encode_value(row[index]) for index in indexes]
+        return queryset.values_list(*columns), get_position
+
+    def paginate_rows(self, queryset, request, fields, view=None):
+        """Like paginate_queryset, but returning ``values_list()`` tuples"""
+        rows, get_position = self.get_rows_queryset(queryset, request, fields, view)
+        return self.finish_page(list(rows), get_position)
+
+    async def apaginate_rows(self, queryset, request, fields, view=None):
+        """Async variant of paginate_rows using the async ORM"""
+        rows, get_position = self.get_rows_queryset(queryset, request, fields, view)
+        return self.finish_page([row async for row in rows], get_position)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,143 @@
+"""
+Response cache for the College Life App read endpoints.
+
+Entries are stored in the ``responses`` cache alias, an LRU bounded by
+MAX_ENTRIES with a per-entry TTL. Keys embed the collection version stamp,
+so the post_save/post_delete handlers that bump stamps invalidate exactly
+the collections (and users) a write affects; superseded entries simply age
+out of the LRU.
+"""
+import logging
+import threading
+
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'responses'
+RESPONSE_KEY = 'college_lifeapp:response:{collection}:{scope}:{etag}'
+
+
+class CacheStats:
+    """Process-wide hit/miss counters for the response cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+
+    def record(self, hit=False, miss=False, store=False):
+        with self._lock:
+            self.hits += hit
+            self.misses += miss
+            self.stores += store
+
+    def as_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+stats = CacheStats()
+
+
+def get_response_cache():
+    """Return the response cache backend, or None when the alias is not configured"""
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return None
+
+
+def get_cached_data(collection, scope, etag):
+    """Return the cached response data for ``etag``, or None on a miss"""
+    backend = get_response_cache()
+    if backend is None:
+        return None
+    try:
+        data = backend.get(RESPONSE_KEY.format(collection=collection, scope=scope, etag=etag))
+    except Exception as e:
+        logger.error(f"Response cache read failed: {str(e)}")
+        return None
+    stats.record(hit=data is not None, miss=data is None)
+    return data
+
+
+def store_data(collection, scope, etag, data):
+    """Store the response data for ``etag``"""
+    backend = get_response_cache()
+    if backend is None:
+        return
+    try:
+        backend.set(RESPONSE_KEY.format(collection=collection, scope=scope, etag=etag), data)
+        stats.record(store=True)
+    except Exception as e:
+        logger.error(f"Response cache write failed: {str(e)}")
+
+
+async def aget_cached_data(collection, scope, etag):
+    """Async get_cached_data, for views running on the event loop"""
+    backend = get_response_cache()
+    if backend is None:
+        return None
+    try:
+        data = await backend.aget(RESPONSE_KEY.format(collection=collection, scope=scope, etag=etag))
+    except Exception as e:
+        logger.error(f"Response cache read failed: {str(e)}")
+        return None
+    stats.record(hit=data is not None, miss=data is None)
+    return data
+
+
+async def astore_data(collection, scope, etag, data):
+    """Async store_data, for views running on the event loop"""
+    backend = get_response_cache()
+    if backend is None:
+        return
+    try:
+        await backend.aset(RESPONSE_KEY.format(collection=collection, scope=scope, etag=etag), data)
+        stats.record(store=True)
+    except Exception as e:
+        logger.error(f"Response cache write failed: {str(e)}")
+
+
+def cached_response(collection, scope, etag, handler, *args, **kwargs):
+    """
+    Return the cached response data for ``etag`` or build, store and return it.
+
+    Only the serialized data of 200 responses is stored, so a hit skips the
+    query and the serializer and leaves just JSON rendering.
+    """
+    data = get_cached_data(collection, scope, etag)
+    if data is not None:
+        return Response(data)
+    response = handler(*args, **kwargs)
+    if response.status_code == status.HTTP_200_OK and response.data is not None:
+        store_data(collection, scope, etag, response.data)
+    return response
+
+
+def get_cache_info():
+    """Describe the response cache configuration and its counters"""
+    backend = get_response_cache()
+    info = {'enabled': backend is not None, **stats.as_dict()}
+    if backend is not None:
+        info.update({
+            'backend': f"{type(backend).__module__}.{type(backend).__name__}",
+            'max_entries': backend._max_entries,
+            'timeout': backend.default_timeout,
+        })
+    return info
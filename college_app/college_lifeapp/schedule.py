@@ -0,0 +1,253 @@
+"""
+Weekly schedule for the College Life App.
+
+A week is expanded from the user's routine day rows and the events that
+start in it into concrete time slots. Overlaps are found with a static
+interval tree, so a week of n slots costs O(n log n + k) for k overlaps
+instead of comparing every pair, and one candidate slot is checked in
+O(log n + k). Expanded weeks are cached per user under the routines and
+events version stamps, so any write to either shows up immediately.
+"""
+import re
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+from django.conf import settings
+from django.utils import timezone
+
+from .conditional import get_collection_version
+from .models import Event, Routine, RoutineDay, event_start, parse_event_time
+from .response_cache import get_response_cache
+
+SCHEDULE_KEY = 'college_lifeapp:schedule:{user_id}:{start}:{versions}'
+DEPENDENCIES = ('routines', 'events')
+# Routines have no end time and most events give none
+DEFAULT_ROUTINE_MINUTES = 60
+DEFAULT_EVENT_MINUTES = 60
+
+TIME_RANGE_SEPARATOR = re.compile(r'\s*(?:-|–|—|\bto\b|\buntil\b)\s*', re.IGNORECASE)
+
+
+class IntervalTree:
+    """
+    Static interval tree over half-open ``[start, end)`` intervals.
+
+    Intervals are sorted by start and read as an implicit balanced binary
+    search tree over that order (each range's middle item is its root).
+    Every node keeps the largest end in its subtree, so a query skips
+    whole subtrees that end before it begins or start after it ends.
+    Building is O(n log n); ``overlapping`` is O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        items = sorted(intervals, key=itemgetter(0, 1))
+        self.starts = [start for start, _, _ in items]
+        self.ends = [end for _, end, _ in items]
+        self.values = [value for _, _, value in items]
+        self.max_ends = list(self.ends)
+        self._augment(0, len(items))
+
+    def __len__(self):
+        return len(self.values)
+
+    def _augment(self, lo, hi):
+        """Fill max_ends for the subtree over ``[lo, hi)``; return its largest end"""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        largest = self.ends[mid]
+        for child in (self._augment(lo, mid), self._augment(mid + 1, hi)):
+            if child is not None and child > largest:
+                largest = child
+        self.max_ends[mid] = largest
+        return largest
+
+    def overlapping(self, start, end):
+        """Return the values of intervals overlapping ``[start, end)``, in start order"""
+        found = []
+        ranges = [(0, len(self.values))]
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_ends[mid] <= start:
+                continue  # Everything below ends before the query starts
+            ranges.append((lo, mid))
+            if self.starts[mid] < end:
+                if self.ends[mid] > start:
+                    found.append(mid)
+                # Later starts can only overlap if this one starts before the query ends
+                ranges.append((mid + 1, hi))
+        return [self.values[index] for index in sorted(found)]
+
+
+def week_start(day):
+    """The Monday of the week containing ``day``"""
+    return day - timedelta(days=day.weekday())
+
+
+def _aware(moment):
+    if settings.USE_TZ:
+        return timezone.make_aware(moment, timezone.get_default_timezone())
+    return moment
+
+
+def event_span(day, time_text):
+    """
+    Return (start, end) for an event on ``day`` at ``time_text``, or None if the time is unreadable.
+
+    The end comes from a range such as '6:00 PM - 7:30 PM', else the default duration.
+    """
+    if parse_event_time(time_text) is None:
+        return None
+    start = event_start(day, time_text)
+    parts = TIME_RANGE_SEPARATOR.split(time_text.strip(), maxsplit=1)
+    end_time = parse_event_time(parts[1]) if len(parts) == 2 else None
+    if end_time is None:
+        return start, start + timedelta(minutes=getattr(settings, 'SCHEDULE_EVENT_MINUTES', DEFAULT_EVENT_MINUTES))
+    end = _aware(datetime.combine(day, end_time))
+    if end <= start:
+        end += timedelta(days=1)  # Runs past midnight
+    return start, end
+
+
+def routine_span(day, time_value):
+    """Return (start, end) for a routine held on ``day`` at ``time_value``"""
+    start = _aware(datetime.combine(day, time_value))
+    return start, start + timedelta(minutes=getattr(settings, 'SCHEDULE_ROUTINE_MINUTES', DEFAULT_ROUTINE_MINUTES))
+
+
+def _day_start(day):
+    return _aware(datetime.combine(day, datetime.min.time()))
+
+
+def _slot(kind, pk, title, category, span, day):
+    start, end = span if span else (_day_start(day), None)
+    return start, {
+        'key': f'{kind}:{pk}:{day.isoformat()}',
+        'type': kind,
+        'id': pk,
+        'title': title,
+        'category': category,
+        'date': day.isoformat(),
+        'start': start.isoformat(),
+        # Events whose time cannot be read take the whole day and are not checked for overlaps
+        'end': end.isoformat() if end else None,
+        'all_day': span is None,
+        'conflicts': [],
+    }
+
+
+class Week:
+    """A user's expanded week: its slots in start order and the interval tree over them"""
+
+    def __init__(self, start, slots, spans):
+        self.start = start
+        self.slots = slots
+        self.slots_by_key = {slot['key']: slot for slot in slots}
+        # Interval bounds as epoch seconds keep the cached tree small
+        self.tree = IntervalTree(
+            (span[0].timestamp(), span[1].timestamp(), slot['key'])
+            for slot, span in zip(slots, spans) if span is not None
+        )
+        for slot, span in zip(slots, spans):
+            if span is not None:
+                slot['conflicts'] = self.conflicts_with(*span, exclude=slot['key'])
+
+    def conflicts_with(self, start, end, exclude=None):
+        """Keys of the slots overlapping ``[start, end)``"""
+        return [key for key in self.tree.overlapping(start.timestamp(), end.timestamp()) if key != exclude]
+
+    def as_data(self):
+        return {
+            'start': self.start.isoformat(),
+            'end': (self.start + timedelta(days=7)).isoformat(),
+            'slots': self.slots,
+            'conflict_count': sum(len(slot['conflicts']) for slot in self.slots) // 2,
+        }
+
+
+def build_week(user, start):
+    """
+    Expand ``user``'s routines and events for the week starting on Monday ``start``.
+
+    Two indexed queries: the routine day rows by (user, day, time) and the
+    events by (user, starts_at).
+    """
+    expanded = []
+    day_rows = (
+        RoutineDay.objects.filter(user=user)
+        .order_by('day', 'time')
+        .values_list('routine_id', 'day', 'time', 'routine__title', 'routine__category')
+    )
+    for routine_id, day_code, time_value, title, category in day_rows:
+        day = start + timedelta(days=Routine.DAY_CODES.index(day_code))
+        span = routine_span(day, time_value)
+        expanded.append((*_slot('routine', routine_id, title, category, span, day), span))
+    events = (
+        Event.objects.filter(
+            user=user, starts_at__gte=_day_start(start), starts_at__lt=_day_start(start + timedelta(days=7))
+        )
+        .order_by('starts_at')
+        .values_list('id', 'date', 'time', 'title', 'category')
+    )
+    for pk, day, time_text, title, category in events:
+        span = event_span(day, time_text)
+        expanded.append((*_slot('event', pk, title, category, span, day), span))
+
+    expanded.sort(key=lambda item: (item[0], item[1]['key']))
+    return Week(start, [slot for _, slot, _ in expanded], [span for _, _, span in expanded])
+
+
+def get_week(user, start):
+    """Return ``user``'s expanded week from the per-user cache, building it on a miss"""
+    start = week_start(start)
+    backend = get_response_cache()
+    if backend is None:
+        return build_week(user, start)
+    versions = '-'.join(f'{get_collection_version(name, user.pk):x}' for name in DEPENDENCIES)
+    key = SCHEDULE_KEY.format(user_id=user.pk, start=start.isoformat(), versions=versions)
+    week = backend.get(key)
+    if week is None:
+        week = build_week(user, start)
+        backend.set(key, week, timeout=getattr(settings, 'SCHEDULE_CACHE_TTL', 300))
+    return week
+
+
+def candidate_spans(kind, data, start=None):
+    """
+    Return (day, span) for each slot a new event or routine would take.
+
+    Events take their own week; routines repeat, so they are placed in the
+    week starting on Monday ``start`` (this week by default).
+    """
+    if kind == 'event':
+        span = event_span(data['date'], data['time'])
+        return [(data['date'], span)] if span else []
+    start = week_start(start or timezone.localdate())
+    days = [start + timedelta(days=Routine.DAY_CODES.index(code)) for code in dict.fromkeys(data.get('days') or [])]
+    return [(day, routine_span(day, data['time'])) for day in days]
+
+
+def find_conflicts(user, kind, data, start=None):
+    """
+    Return the existing slots a new event or routine would overlap.
+
+    Each candidate slot is one interval tree query against the cached week.
+
+    Returns:
+        list: {'date', 'start', 'end', 'slot'} dicts, one per overlap
+    """
+    conflicts = []
+    weeks = {}
+    for day, (begin, end) in candidate_spans(kind, data, start):
+        monday = week_start(day)
+        if monday not in weeks:
+            weeks[monday] = get_week(user, monday)
+        week = weeks[monday]
+        for key in week.conflicts_with(begin, end):
+            slot = dict(week.slots_by_key[key])
+            del slot['conflicts']
+            conflicts.append({'date': day.isoformat(), 'start': begin.isoformat(), 'end': end.isoformat(), 'slot': slot})
+    return conflicts
@@ -0,0 +1,206 @@
+"""
+Full-text search for the College Life App.
+
+Each searchable model has an SQLite FTS5 table, ``<table>_fts``, over its
+text columns and ``user_id``, created by migration 0006. The FTS tables use
+the model table as external content, so they hold only the index, and
+triggers keep them in step with every write, including bulk_create,
+queryset updates and raw SQL.
+
+Queries are reduced to plain words, matched as prefixes and ranked with
+bm25 weighted towards titles. Filtering by user is a term of the match
+itself, so it never scans other users' rows. Backends without FTS5 fall
+back to ``icontains`` filters.
+"""
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Event, Expense, Goal, Routine
+from .serializers import EventSerializer, ExpenseSerializer, GoalSerializer, RoutineSerializer
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Words beyond this are ignored; every word narrows the match
+MAX_TERMS = 8
+# Shorter words are matched whole: a one-letter prefix matches most of the index
+MIN_PREFIX_LENGTH = 2
+TITLE_WEIGHT = 4.0
+
+# collection -> (model, serializer class, text columns, the first being the title)
+SEARCH_INDEXES = {
+    'events': (Event, EventSerializer, ('title', 'location')),
+    'goals': (Goal, GoalSerializer, ('title', 'description')),
+    'expenses': (Expense, ExpenseSerializer, ('item',)),
+    'routines': (Routine, RoutineSerializer, ('title',)),
+}
+COLLECTION_BY_MODEL = {model: collection for collection, (model, _, _) in SEARCH_INDEXES.items()}
+
+WORD = re.compile(r'\w+')
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def search_enabled(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def search_terms(text):
+    """Split ``text`` into at most MAX_TERMS lower-case words"""
+    return WORD.findall(text.lower())[:MAX_TERMS]
+
+
+def match_expression(terms, columns, user_id=None):
+    """
+    Build an FTS5 MATCH expression for ``terms`` within ``columns``.
+
+    Each word is quoted, so user input never reaches the query syntax.
+    """
+    words = ' '.join(f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"' for term in terms)
+    expression = f"{{{' '.join(columns)}}} : ({words})"
+    if user_id is not None:
+        expression = f'user_id : "{int(user_id)}" AND {expression}'
+    return expression
+
+
+def rank_function(columns):
+    """bm25 with the title weighted above the other text columns and user_id ignored"""
+    weights = [TITLE_WEIGHT] + [1.0] * (len(columns) - 1) + [0.0]
+    return f"bm25({', '.join(map(str, weights))})"
+
+
+def search_collection(collection, terms, user_id=None, limit=DEFAULT_LIMIT):
+    """
+    Find the best matches for ``terms`` in one collection.
+
+    Returns:
+        list: (primary key, score) pairs, best first; higher scores are better
+    """
+    model, _, columns = SEARCH_INDEXES[collection]
+    table = fts_table(model)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, rank FROM {table} WHERE {table} MATCH %s AND rank MATCH %s "
+            f"ORDER BY rank LIMIT %s",
+            [match_expression(terms, columns, user_id), rank_function(columns), limit]
+        )
+        # bm25 is negative, lower being better
+        return [(pk, -rank) for pk, rank in cursor.fetchall()]
+
+
+def fallback_collection(collection, terms, user_id=None, limit=DEFAULT_LIMIT):
+    """search_collection for backends without FTS5: every word in some text column, newest first"""
+    model, _, columns = SEARCH_INDEXES[collection]
+    queryset = model.objects.all() if user_id is None else model.objects.filter(user_id=user_id)
+    for term in terms:
+        condition = Q()
+        for column in columns:
+            condition |= Q(**{f'{column}__icontains': term})
+        queryset = queryset.filter(condition)
+    return [(pk, 0.0) for pk in queryset.order_by('-pk').values_list('pk', flat=True)[:limit]]
+
+
+def search(text, user_id=None, collections=None, limit=DEFAULT_LIMIT):
+    """
+    Search ``collections`` (all by default) for ``text``.
+
+    Each collection returns its own best ``limit`` matches; they are merged
+    by score and the API representations of the overall best are loaded
+    with one query per collection.
+
+    Returns:
+        list: {'type', 'id', 'score', 'item'} dicts, best first
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    find = search_collection if search_enabled() else fallback_collection
+    matches = []
+    for collection in collections or SEARCH_INDEXES:
+        matches.extend((score, collection, pk) for pk, score in find(collection, terms, user_id, limit))
+    matches.sort(key=lambda match: match[0], reverse=True)
+    matches = matches[:limit]
+
+    items = {}
+    for collection in dict.fromkeys(collection for _, collection, _ in matches):
+        model, serializer_class, _ = SEARCH_INDEXES[collection]
+        pks = [pk for _, name, pk in matches if name == collection]
+        for instance in model.objects.filter(pk__in=pks):
+            items[collection, instance.pk] = serializer_class(instance).data
+    return [
+        {'type': collection, 'id': pk, 'score': round(score, 4), 'item': items[collection, pk]}
+        for score, collection, pk in matches
+        # A row deleted between the two queries is left out
+        if (collection, pk) in items
+    ]
+
+
+def matching_pks(model, text):
+    """
+    Return an expression for the primary keys of ``model`` rows matching ``text``.
+
+    Used as ``queryset.filter(pk__in=...)``, so the match runs as a subquery
+    and keeps the queryset's own ordering. None when the text has no words.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    _, _, columns = SEARCH_INDEXES[COLLECTION_BY_MODEL[model]]
+    table = fts_table(model)
+    return RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match_expression(terms, columns)])
+
+
+def trigger_sql(model, columns):
+    """The triggers that keep ``model``'s FTS table in step with its rows"""
+    table = model._meta.db_table
+    fts = fts_table(model)
+    columns = (*columns, 'user_id')
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    return {
+        f'{fts}_ai': f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f'{fts}_ad': f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f'{fts}_au': f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END",
+    }
+
+
+def rebuild_search_indexes(using='default'):
+    """Re-read every FTS table from its model table, e.g. after writes made with the triggers dropped"""
+    with connections[using].cursor() as cursor:
+        for model, _, _ in SEARCH_INDEXES.values():
+            table = fts_table(model)
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def ensure_search_triggers(using='default', **kwargs):
+    """
+    Recreate missing sync triggers and rebuild the FTS tables they served.
+
+    SQLite drops a table's triggers when Django rebuilds the table to alter
+    it, so this runs after every migrate. Returns the rebuilt collections.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return []
+    rebuilt = []
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name, type FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = dict(cursor.fetchall())
+        for collection, (model, _, columns) in SEARCH_INDEXES.items():
+            table = fts_table(model)
+            triggers = trigger_sql(model, columns)
+            if table not in existing or all(name in existing for name in triggers):
+                continue
+            for name, sql in triggers.items():
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            rebuilt.append(collection)
+    return rebuilt
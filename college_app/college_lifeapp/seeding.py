@@ -0,0 +1,404 @@
+"""
+Synthetic data for scale testing the College Life App.
+
+ScaleSeeder writes users, profiles, routines (with their day index),
+expenses, events and goals straight to SQLite with ``executemany`` in one
+transaction per table, assigning primary keys itself so no rows have to be
+read back. Everything is drawn from one ``random.Random(seed)``, so the same
+seed and sizes always produce the same rows.
+
+Users are skewed: each gets a Pareto-distributed activity weight, so a few
+heavy users own a large share of the rows. Expense dates follow the
+academic year (term starts spend more, summer less, weekends a bit more).
+"""
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import timedelta
+from itertools import accumulate, islice
+from operator import add, itemgetter
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .aggregation import month_start
+from .conditional import DEPENDENT_COLLECTIONS, bump_collection_versions
+from .models import Event, Expense, ExpenseMonthlyRollup, Goal, Routine, RoutineDay, UserProfile, event_start
+from .search import rebuild_search_indexes, search_enabled
+
+BATCH_SIZE = 50000
+# Pareto shape of the per-user activity weights; lower is more skewed
+DEFAULT_SKEW = 1.2
+USERNAME_PREFIX = 'seed'
+# Django's marker for an unusable password
+UNUSABLE_PASSWORD = '!seed'
+
+MAJORS = [
+    'Computer Science', 'Biology', 'Economics', 'Psychology', 'Mechanical Engineering',
+    'English', 'Mathematics', 'Political Science', 'Nursing', 'Art History',
+]
+# Spending by month of the academic year: term starts are heavy, summer is light
+MONTH_FACTORS = {1: 1.3, 2: 1.0, 3: 1.0, 4: 1.0, 5: 0.9, 6: 0.6, 7: 0.6, 8: 1.4, 9: 1.5, 10: 1.0, 11: 1.0, 12: 1.1}
+WEEKEND_FACTOR = 1.25
+# created_at times fall between 7:00 and 23:00
+DAY_START_US = 7 * 3600 * 1000000
+DAY_SPAN_US = 16 * 3600 * 1000000
+# Expense amounts are the typical amount times a lognormal factor drawn from a table this size
+AMOUNT_FACTORS = 4096
+# Expense created_at times are drawn from a table this size
+TIME_TABLE_SIZE = 65536
+# (category, item, typical amount in dollars, relative frequency)
+EXPENSE_CATALOGUE = [
+    ('Food', 'Coffee', 4.5, 30), ('Food', 'Lunch', 11.0, 25), ('Food', 'Groceries', 45.0, 10),
+    ('Food', 'Pizza night', 18.0, 6), ('Transport', 'Bus pass', 2.75, 12), ('Transport', 'Rideshare', 16.0, 5),
+    ('Transport', 'Train ticket', 28.0, 2), ('Books', 'Textbook', 95.0, 3), ('Books', 'Lab manual', 35.0, 2),
+    ('Books', 'Notebook', 6.0, 4), ('Entertainment', 'Movie ticket', 13.0, 5), ('Entertainment', 'Concert', 55.0, 1),
+    ('Entertainment', 'Streaming', 11.0, 3), ('Other', 'Laundry', 5.0, 6), ('Other', 'Phone bill', 40.0, 2),
+]
+ROUTINE_TEMPLATES = [
+    ('class', ['Calculus lecture', 'Chemistry lab', 'History seminar', 'Programming lecture', 'Writing workshop']),
+    ('gym', ['Morning run', 'Weights', 'Swim practice', 'Yoga']),
+    ('study', ['Library session', 'Study group', 'Problem sets', 'Reading']),
+    ('social', ['Club meeting', 'Dinner with friends', 'Volunteering']),
+]
+DAY_PATTERNS = [['Mon', 'Wed', 'Fri'], ['Tue', 'Thu'], ['Mon', 'Wed'], ['Sat'], ['Sun'], ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']]
+EVENT_TITLES = {
+    'Academic': ['Guest lecture', 'Research symposium', 'Thesis defense'],
+    'Career': ['Career fair', 'Resume workshop', 'Alumni panel'],
+    'Sports': ['Basketball game', 'Intramural final', 'Fun run'],
+    'Cultural': ['Film screening', 'International night', 'Open mic'],
+}
+EVENT_LOCATIONS = ['Student Center', 'Main Library', 'Gym', 'Auditorium', 'Quad', 'Engineering Hall']
+EVENT_TIMES = ['9:00 AM', '12:00 PM', '3:30 PM', '6:00 PM', '7:30 PM']
+GOAL_TITLES = {
+    'Internships': ['Apply to summer internships', 'Follow up with recruiter'],
+    'Job Applications': ['Send applications', 'Update portfolio'],
+    'Interviews': ['Mock interview', 'Practice case questions'],
+    'Networking': ['Attend meetup', 'Message alumni'],
+}
+
+# Seeded tables; derived tables are written alongside their source
+SEEDED_MODELS = [UserProfile, Routine, RoutineDay, Expense, ExpenseMonthlyRollup, Event, Goal]
+
+
+def _money(cents):
+    return f'{cents // 100}.{cents % 100:02d}'
+
+
+class ScaleSeeder:
+    """Generate and write one deterministic synthetic data set"""
+
+    def __init__(self, seed=0, end=None, days=365, skew=DEFAULT_SKEW, batch_size=BATCH_SIZE,
+                 prefix=USERNAME_PREFIX, log=None):
+        self.rng = random.Random(seed)
+        self.end = end or timezone.localdate()
+        self.start = self.end - timedelta(days=days - 1)
+        self.skew = skew
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.log = log or (lambda message: None)
+        self.timings = {}
+        self.rebuild_seconds = 0.0
+        self.user_ids = []
+        self.user_weights = []
+        # (user, category, month) -> [cents, rows] and cents per user, filled in by seed_expenses
+        self.rollups = defaultdict(lambda: [0, 0])
+        self.user_spending = defaultdict(int)
+
+    def next_id(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM "{table}"')
+            return cursor.fetchone()[0] + 1
+
+    def write(self, model_or_table, columns, batches):
+        """Insert each iterable of rows in ``batches`` with one executemany call; return the rows written"""
+        table = model_or_table if isinstance(model_or_table, str) else model_or_table._meta.db_table
+        sql = 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+            table, ', '.join(f'"{column}"' for column in columns), ', '.join(['?'] * len(columns))
+        )
+        written = 0
+        connection.ensure_connection()
+        # The sqlite3 connection itself: Django's cursor wrappers add per-batch work for nothing here
+        database = connection.connection
+        for batch in batches:
+            written += database.executemany(sql, batch).rowcount
+        return written
+
+    def chunked(self, rows):
+        """Split an iterable of rows into write() batches"""
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            yield batch
+
+    def timed(self, label, func, *args):
+        """Run ``func`` in its own transaction and record rows written and rows per second"""
+        start = time.perf_counter()
+        with transaction.atomic():
+            rows = func(*args)
+        elapsed = time.perf_counter() - start
+        self.timings[label] = (rows, elapsed)
+        self.log(f"{label}: {rows:,} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+        return rows
+
+    def pick_users(self, count):
+        """Draw ``count`` user ids, heavy users more often"""
+        return self.rng.choices(self.user_ids, cum_weights=self.user_weights, k=count)
+
+    def batches(self, count):
+        """Split ``count`` rows into generation batches"""
+        while count > 0:
+            size = min(count, self.batch_size)
+            yield size
+            count -= size
+
+    def random_time(self):
+        """A time of day between 7:00 and 23:00 as Django stores it in a datetime"""
+        seconds, micros = divmod(DAY_START_US + int(self.rng.random() * DAY_SPAN_US), 1000000)
+        return f'{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{micros:06d}'
+
+    def random_timestamp(self, day_text):
+        """A created_at on ``day_text``, as Django stores naive UTC datetimes"""
+        return f'{day_text} {self.random_time()}'
+
+    def seed_users(self, count):
+        first_id = self.next_id('auth_user')
+        self.user_ids = list(range(first_id, first_id + count))
+        weights = [self.rng.paretovariate(self.skew) for _ in range(count)]
+        self.user_weights = list(accumulate(weights))
+        joined = f'{self.start.isoformat()} 00:00:00'
+        rows = (
+            (user_id, UNUSABLE_PASSWORD, None, False, f'{self.prefix}_{user_id}', '', f'{self.prefix}_{user_id}@example.edu',
+             False, True, joined, '')
+            for user_id in self.user_ids
+        )
+        return self.write('auth_user', [
+            'id', 'password', 'last_login', 'is_superuser', 'username', 'last_name', 'email',
+            'is_staff', 'is_active', 'date_joined', 'first_name',
+        ], self.chunked(rows))
+
+    def seed_profiles(self):
+        rng = self.rng
+        first_id = self.next_id(UserProfile._meta.db_table)
+        rows = (
+            (first_id + index, user_id, rng.choice(MAJORS), f'{rng.randrange(400, 1600, 50)}.00',
+             _money(self.user_spending[user_id]))
+            for index, user_id in enumerate(self.user_ids)
+        )
+        return self.write(UserProfile, ['id', 'user_id', 'major', 'monthly_budget', 'expense_total'], self.chunked(rows))
+
+    def seed_routines(self, count):
+        rng = self.rng
+        next_id = self.next_id(Routine._meta.db_table)
+        created = self.start.isoformat()
+        day_rows = []
+        written = 0
+
+        def routines():
+            nonlocal next_id
+            for size in self.batches(count):
+                for user_id in self.pick_users(size):
+                    category, titles = rng.choice(ROUTINE_TEMPLATES)
+                    days = rng.choice(DAY_PATTERNS)
+                    at = f'{rng.randrange(6, 22):02d}:{rng.choice((0, 15, 30, 45)):02d}:00'
+                    day_rows.extend((next_id, user_id, day, at) for day in days)
+                    yield (next_id, user_id, rng.choice(titles), at, json.dumps(days), category,
+                           self.random_timestamp(created))
+                    next_id += 1
+
+        written += self.write(
+            Routine, ['id', 'user_id', 'title', 'time', 'days', 'category', 'created_at'], self.chunked(routines())
+        )
+        written += self.write(RoutineDay, ['routine_id', 'user_id', 'day', 'time'], self.chunked(day_rows))
+        return written
+
+    def expense_days(self):
+        """Every day in the window as (date text, month text), with cumulative seasonal weights"""
+        days, weights = [], []
+        day = self.start
+        while day <= self.end:
+            days.append((day.isoformat(), month_start(day).isoformat()))
+            weights.append(MONTH_FACTORS[day.month] * (WEEKEND_FACTOR if day.weekday() >= 5 else 1.0))
+            day += timedelta(days=1)
+        return days, list(accumulate(weights))
+
+    def seed_expenses(self, count):
+        """
+        Write expenses, summing their monthly rollups as they are generated.
+
+        Summing here is far cheaper than rebuilding the rollups from the table.
+        Each batch is drawn a column at a time from precomputed tables
+        (amount per catalogue entry and factor, time of day) and zipped into
+        rows, which keeps the per-row Python work to a minimum.
+        """
+        rng = self.rng
+        days, day_weights = self.expense_days()
+        dates = [day for day, _ in days]
+        months = [month for _, month in days]
+        stamp_dates = [f'{day} ' for day in dates]
+        day_indexes = range(len(days))
+        factors = [rng.lognormvariate(0, 0.35) for _ in range(AMOUNT_FACTORS)]
+        # (category, item, cents, amount text) for every catalogue entry and factor, by entry
+        purchases = []
+        for category, item, typical, _ in EXPENSE_CATALOGUE:
+            amounts = [max(int(typical * 100 * factor), 25) for factor in factors]
+            purchases.append([(category, item, cents, _money(cents)) for cents in amounts])
+        entry_weights = list(accumulate(entry[3] for entry in EXPENSE_CATALOGUE))
+        entries = range(len(EXPENSE_CATALOGUE))
+        factor_indexes = range(AMOUNT_FACTORS)
+        times = [self.random_time() for _ in range(TIME_TABLE_SIZE)]
+        next_id = self.next_id(Expense._meta.db_table)
+        rollups = self.rollups
+
+        def expenses():
+            nonlocal next_id
+            for size in self.batches(count):
+                users = self.pick_users(size)
+                picked_days = rng.choices(day_indexes, cum_weights=day_weights, k=size)
+                picked = [purchases[entry][factor] for entry, factor in zip(
+                    rng.choices(entries, cum_weights=entry_weights, k=size), rng.choices(factor_indexes, k=size)
+                )]
+                for user_id, day, (category, _, cents, _) in zip(users, picked_days, picked):
+                    rollup = rollups[user_id, category, months[day]]
+                    rollup[0] += cents
+                    rollup[1] += 1
+                yield zip(
+                    range(next_id, next_id + size),
+                    users,
+                    map(itemgetter(1), picked),
+                    map(itemgetter(3), picked),
+                    map(itemgetter(0), picked),
+                    map(dates.__getitem__, picked_days),
+                    map(add, map(stamp_dates.__getitem__, picked_days), rng.choices(times, k=size)),
+                )
+                next_id += size
+
+        return self.write(Expense, ['id', 'user_id', 'item', 'amount', 'category', 'date', 'created_at'], expenses())
+
+    def seed_rollups(self):
+        """Write the monthly rollups summed by seed_expenses and the per-user totals for the profiles"""
+        for (user_id, _, _), (cents, _) in self.rollups.items():
+            self.user_spending[user_id] += cents
+        return self.write(ExpenseMonthlyRollup, ['user_id', 'category', 'month', 'total', 'count'], self.chunked(
+            (user_id, category, month, _money(cents), rows)
+            for (user_id, category, month), (cents, rows) in self.rollups.items()
+        ))
+
+    def seed_events(self, count):
+        rng = self.rng
+        categories = list(EVENT_TITLES)
+        # Events run from the start of the window to two months past its end
+        span = (self.end - self.start).days + 60
+        next_id = self.next_id(Event._meta.db_table)
+        created = self.start.isoformat()
+
+        adapt = connection.ops.adapt_datetimefield_value
+
+        def events():
+            nonlocal next_id
+            for size in self.batches(count):
+                for user_id in self.pick_users(size):
+                    category = rng.choice(categories)
+                    day = self.start + timedelta(days=rng.randrange(span))
+                    time_text = rng.choice(EVENT_TIMES)
+                    yield (next_id, user_id, rng.choice(EVENT_TITLES[category]), day.isoformat(), time_text,
+                           adapt(event_start(day, time_text)), rng.choice(EVENT_LOCATIONS), category,
+                           rng.random() < 0.3, rng.random() < 0.1, int(rng.paretovariate(1.5) * 10),
+                           self.random_timestamp(created))
+                    next_id += 1
+
+        return self.write(Event, [
+            'id', 'user_id', 'title', 'date', 'time', 'starts_at', 'location', 'category', 'rsvped', 'is_favorite',
+            'attendees', 'created_at',
+        ], self.chunked(events()))
+
+    def seed_goals(self, count):
+        rng = self.rng
+        categories = list(GOAL_TITLES)
+        span = (self.end - self.start).days + 120
+        next_id = self.next_id(Goal._meta.db_table)
+        created = self.start.isoformat()
+
+        def goals():
+            nonlocal next_id
+            for size in self.batches(count):
+                for user_id in self.pick_users(size):
+                    category = rng.choice(categories)
+                    progress = rng.choice((0, 0, 10, 25, 40, 50, 60, 75, 90, 100))
+                    yield (next_id, user_id, rng.choice(GOAL_TITLES[category]), '',
+                           (self.start + timedelta(days=rng.randrange(span))).isoformat(), progress, category,
+                           'pending' if rng.random() < 0.25 else 'current', progress == 100,
+                           self.random_timestamp(created))
+                    next_id += 1
+
+        return self.write(Goal, [
+            'id', 'user_id', 'title', 'description', 'deadline', 'progress', 'category', 'status', 'completed',
+            'created_at',
+        ], self.chunked(goals()))
+
+    def seed(self, users, routines, expenses, events, goals, drop_indexes=False):
+        """
+        Write the whole data set; return {label: (rows, seconds)}.
+
+        Foreign keys are generated consistently, so their checks are off for
+        the load, as during Django's own SQLite table rebuilds.
+        """
+        dropped = self.drop_indexes() if drop_indexes else []
+        # SQLite only changes the safety level outside a transaction
+        synchronous = None
+        if not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous')
+                synchronous = cursor.fetchone()[0]
+                # Safe here: an interrupted seed is thrown away, not recovered
+                cursor.execute('PRAGMA synchronous=OFF')
+        try:
+            with connection.constraint_checks_disabled():
+                self.timed('users', self.seed_users, users)
+                self.timed('routines', self.seed_routines, routines)
+                self.timed('expenses', self.seed_expenses, expenses)
+                self.timed('expense rollups', self.seed_rollups)
+                # After the expenses, so the profiles start with their running totals
+                self.timed('profiles', self.seed_profiles)
+                self.timed('events', self.seed_events, events)
+                self.timed('goals', self.seed_goals, goals)
+        finally:
+            if dropped:
+                start = time.perf_counter()
+                self.create_indexes(dropped)
+                if search_enabled():
+                    rebuild_search_indexes()
+                self.rebuild_seconds = time.perf_counter() - start
+                self.log(f"Rebuilt {len(dropped)} index(es) and trigger(s) in {self.rebuild_seconds:.2f}s")
+            if synchronous is not None:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'PRAGMA synchronous={int(synchronous)}')
+        bump_collection_versions({name for names in DEPENDENT_COLLECTIONS.values() for name in names})
+        return self.timings
+
+    def drop_indexes(self):
+        """
+        Drop the secondary indexes and search triggers of the seeded tables.
+
+        Returns their CREATE statements; the search index is rebuilt in one
+        pass once they are recreated.
+        """
+        tables = [model._meta.db_table for model in SEEDED_MODELS]
+        placeholders = ', '.join(['%s'] * len(tables))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT type, name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') "
+                f"AND sql IS NOT NULL AND tbl_name IN ({placeholders})", tables
+            )
+            objects = cursor.fetchall()
+            for kind, name, _ in objects:
+                cursor.execute(f'DROP {kind.upper()} "{name}"')
+        triggers = sum(kind == 'trigger' for kind, _, _ in objects)
+        self.log(f"Dropped {len(objects) - triggers} index(es) and {triggers} trigger(s)")
+        return [sql for _, _, sql in objects]
+
+    def create_indexes(self, statements):
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
@@ -11,11 +11,14 @@ class UserSerializer(serializers.ModelSerializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    total_spent = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    total_spent = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    spent_this_month = serializers.DecimalField(
+        source='total_spent_this_month', max_digits=12, decimal_places=2, read_only=True
+    )
     
     class Meta:
         model = UserProfile
-        fields = ['id', 'user', 'major', 'monthly_budget', 'total_spent']
+        fields = ['id', 'user', 'major', 'monthly_budget', 'total_spent', 'spent_this_month']
 
 
 class RoutineSerializer(serializers.ModelSerializer):
@@ -23,6 +26,13 @@ class RoutineSerializer(serializers.ModelSerializer):
         model = Routine
         fields = ['id', 'title', 'time', 'days', 'category', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def validate_days(self, value):
+        if not isinstance(value, list) or any(day not in Routine.DAY_CODES for day in value):
+            raise serializers.ValidationError(
+                f"Days must be a list of: {', '.join(Routine.DAY_CODES)}"
+            )
+        return value
 
 
 class ExpenseSerializer(serializers.ModelSerializer):
@@ -33,11 +43,13 @@ class ExpenseSerializer(serializers.ModelSerializer):
 
 
 class EventSerializer(serializers.ModelSerializer):
+    timing = serializers.ChoiceField(choices=Event.TIMING_CHOICES, read_only=True)
+    
     class Meta:
         model = Event
-        fields = ['id', 'title', 'date', 'time', 'location', 'category', 
+        fields = ['id', 'title', 'date', 'time', 'starts_at', 'location', 'category', 
                   'rsvped', 'is_favorite', 'timing', 'attendees', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'starts_at', 'created_at']
 
 
 class GoalSerializer(serializers.ModelSerializer):
@@ -45,4 +57,26 @@ class GoalSerializer(serializers.ModelSerializer):
         model = Goal
         fields = ['id', 'title', 'description', 'deadline', 'progress', 
                   'category', 'status', 'completed', 'created_at']
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+
+class MoneyField(serializers.DecimalField):
+    """Read-only money amount rendered as a string, like the model serializers' decimals"""
+
+    def __init__(self, **kwargs):
+        # Sums over many rows have no fixed width
+        super().__init__(max_digits=None, decimal_places=2, read_only=True, coerce_to_string=True, **kwargs)
+
+
+class ExpenseSummaryPeriodSerializer(serializers.Serializer):
+    period = serializers.CharField(read_only=True)
+    by_category = serializers.DictField(child=MoneyField(), read_only=True)
+    total = MoneyField()
+
+
+class ExpenseSummarySerializer(serializers.Serializer):
+    """Representation of aggregation.expense_summary: totals by category and, optionally, by period"""
+    by_category = serializers.DictField(child=MoneyField(), read_only=True)
+    total = MoneyField()
+    count = serializers.IntegerField(read_only=True)
+    by_period = ExpenseSummaryPeriodSerializer(many=True, read_only=True, required=False)
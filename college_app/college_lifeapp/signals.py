@@ -0,0 +1,91 @@
+"""
+Signal handlers for the College Life App.
+Keeps derived tables in step with writes made through the ORM.
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .aggregation import apply_profile_counter_delta, apply_rollup_delta
+from .conditional import bump_model_versions
+from .models import Event, Expense, Goal, Routine, RoutineDay, UserProfile
+
+ROLLUP_FIELDS = ('user_id', 'category', 'date', 'amount')
+
+
+@receiver(pre_save, sender=Expense)
+def capture_expense_snapshot(sender, instance, raw=False, **kwargs):
+    """Make sure an updated expense knows the values it had in the database"""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or any(field not in loaded for field in ROLLUP_FIELDS):
+        instance._loaded_values = (
+            Expense.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Expense)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    """Move the expense's amount between monthly rollup rows and profile totals"""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_loaded_values', None)
+    if previous:
+        unchanged = all(previous[field] == getattr(instance, field) for field in ROLLUP_FIELDS)
+        if unchanged:
+            return
+        apply_rollup_delta(
+            previous['user_id'], previous['category'], previous['date'], -previous['amount'], -1
+        )
+        apply_profile_counter_delta(previous['user_id'], -previous['amount'])
+    apply_rollup_delta(instance.user_id, instance.category, instance.date, instance.amount, 1)
+    apply_profile_counter_delta(instance.user_id, instance.amount)
+
+
+@receiver(post_delete, sender=Expense)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Remove a deleted expense from its monthly rollup row and profile total"""
+    amount = -Decimal(str(instance.amount))
+    apply_rollup_delta(instance.user_id, instance.category, instance.date, amount, -1)
+    apply_profile_counter_delta(instance.user_id, amount)
+
+
+@receiver(post_save, sender=UserProfile)
+def initialize_profile_counter(sender, instance, created, raw=False, **kwargs):
+    """Seed a new profile's expense total from expenses the user already has"""
+    if raw or not created:
+        return
+    total = Expense.objects.filter(user_id=instance.user_id).aggregate(total=Sum('amount'))['total']
+    if total:
+        UserProfile.objects.filter(pk=instance.pk).update(expense_total=total)
+        instance.expense_total = total
+
+
+@receiver(post_save, sender=Routine)
+def sync_routine_days(sender, instance, raw=False, **kwargs):
+    """Mirror the routine's days list into the indexed RoutineDay table"""
+    if raw:
+        return
+    RoutineDay.sync_for([instance])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=Routine)
+@receiver(post_delete, sender=Routine)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+def bump_versions_on_write(sender, instance, raw=False, **kwargs):
+    """Invalidate conditional GET validators for collections that render the instance"""
+    user_id = instance.pk if sender is User else instance.user_id
+    bump_model_versions(sender, user_id)
@@ -0,0 +1,210 @@
+"""
+Static asset and SPA index serving in front of Django for the College Life App.
+
+StaticFilesLayer wraps the WSGI application. Files under STATIC_URL are
+read once through the staticfiles finders and then served from memory,
+together with any ``.br``/``.gz`` variants written by the
+``compress_static`` command. The SPA index is rendered by Django on the
+first request for a page and served from memory afterwards. Both answer
+revalidation with 304, and hashed build assets are marked immutable.
+
+Requests served here skip the Django middleware stack, including metrics.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+from email.utils import formatdate
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.urls import Resolver404, resolve
+from django.utils.http import parse_etags, parse_http_date_safe
+
+# Only names carrying a content hash are immutable, since a changed file gets
+# a new name: Vite appends '-' and an 8-character hash (at least one capital
+# or digit, so words like '-settings' don't match) to its bundles in
+# frontend/assets/; ManifestStaticFilesStorage inserts a 12-digit hex hash
+IMMUTABLE_PATTERN = re.compile(
+    r'^frontend/assets/.+-(?=[\w-]{0,7}[A-Z0-9])[\w-]{8}\.\w+$|\.[0-9a-f]{12}\.\w+$'
+)
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Preferred first; the suffix is what compress_static writes next to the file
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+SPA_URL_NAME = 'spa'
+# Headers of the first rendered index that are specific to that response
+SPA_DROPPED_HEADERS = {'content-length', 'date', 'set-cookie', 'etag', 'last-modified', 'cache-control'}
+SPA_DROPPED_PREFIX = 'access-control-'  # CORS headers depend on the request's Origin
+
+
+class Asset:
+    """One file held in memory, with its precompressed variants"""
+
+    def __init__(self, body, content_type, mtime, cache_control, variants=None, headers=()):
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.content_type = content_type
+        self.last_modified = int(mtime)
+        self.cache_control = cache_control
+        self.headers = list(headers)
+        # encoding -> (body, etag); None is the identity encoding
+        self.variants = {None: (body, f'"{digest}"')}
+        for encoding, data in (variants or {}).items():
+            self.variants[encoding] = (data, f'"{digest}-{encoding}"')
+
+    @classmethod
+    def from_file(cls, path, name):
+        with open(path, 'rb') as handle:
+            body = handle.read()
+        variants = {}
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                with open(path + suffix, 'rb') as handle:
+                    variants[encoding] = handle.read()
+        content_type, _ = mimetypes.guess_type(name)
+        content_type = content_type or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        cache_control = IMMUTABLE if IMMUTABLE_PATTERN.search(name) else REVALIDATE
+        return cls(body, content_type, os.path.getmtime(path), cache_control, variants)
+
+    def negotiate(self, accept_encoding):
+        """Return (encoding, body, etag) for the best variant the client accepts"""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and encoding in accepted:
+                return (encoding, *self.variants[encoding])
+        return (None, *self.variants[None])
+
+
+def accepted_encodings(header):
+    """Return the content codings an Accept-Encoding header allows"""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q=') and quality[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def is_not_modified(environ, etag, last_modified):
+    """WSGI counterpart of conditional.is_not_modified"""
+    if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        # Weak comparison, as for GET in RFC 9110
+        return '*' in etags or etag in etags or f'W/{etag}' in etags
+    since = parse_http_date_safe(environ.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and last_modified <= since
+
+
+class StaticFilesLayer:
+    """WSGI middleware serving STATIC_URL and the SPA index from memory"""
+
+    def __init__(self, application):
+        self.application = application
+        self.static_prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.assets = {}
+        self.index = None
+        self.lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] in ('GET', 'HEAD'):
+            path = environ.get('PATH_INFO', '/')
+            if path.startswith(self.static_prefix):
+                asset = self.get_asset(path[len(self.static_prefix):])
+                if asset is None:
+                    start_response('404 Not Found', [('Content-Type', 'text/plain; charset=utf-8')])
+                    return [b'Not Found']
+                return self.serve(asset, environ, start_response)
+            if self.is_spa_path(path):
+                if self.index is not None:
+                    return self.serve(self.index, environ, start_response)
+                if environ['REQUEST_METHOD'] == 'GET':
+                    return self.render_index(environ, start_response)
+        return self.application(environ, start_response)
+
+    def get_asset(self, name):
+        """Return the in-memory asset for a path under STATIC_URL, loading it on first use"""
+        asset = self.assets.get(name)
+        if asset is None:
+            if not name or name.endswith('/') or '\0' in name:
+                return None
+            try:
+                path = finders.find(name)
+            except SuspiciousFileOperation:
+                return None
+            if path is None or not os.path.isfile(path):
+                return None
+            asset = self.assets[name] = Asset.from_file(path, name)
+        return asset
+
+    def is_spa_path(self, path):
+        try:
+            return resolve(path).url_name == SPA_URL_NAME
+        except Resolver404:
+            return False
+
+    def render_index(self, environ, start_response):
+        """Let Django render the SPA index and keep a successful response for later requests"""
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            captured['status'], captured['headers'] = status, headers
+            return start_response(status, headers, exc_info)
+
+        result = self.application(environ, capture)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        headers = captured.get('headers', [])
+        if captured.get('status', '').startswith('200') and not any(
+            name.lower() == 'content-encoding' for name, _ in headers
+        ):
+            with self.lock:
+                if self.index is None:
+                    kept = [
+                        (name, value) for name, value in headers
+                        if name.lower() not in SPA_DROPPED_HEADERS and not name.lower().startswith(SPA_DROPPED_PREFIX)
+                    ]
+                    content_type = next(
+                        (value for name, value in kept if name.lower() == 'content-type'), 'text/html; charset=utf-8'
+                    )
+                    kept = [(name, value) for name, value in kept if name.lower() != 'content-type']
+                    self.index = Asset(
+                        body, content_type, time.time(), REVALIDATE,
+                        {'gzip': gzip.compress(body, mtime=0)}, kept,
+                    )
+        return [body]
+
+    def serve(self, asset, environ, start_response):
+        encoding, body, etag = asset.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        headers = [
+            ('ETag', etag),
+            ('Last-Modified', formatdate(asset.last_modified, usegmt=True)),
+            ('Cache-Control', asset.cache_control),
+            *asset.headers,
+        ]
+        if len(asset.variants) > 1:
+            vary = [value for name, value in asset.headers if name.lower() == 'vary']
+            headers = [(name, value) for name, value in headers if name.lower() != 'vary']
+            headers.append(('Vary', ', '.join([*vary, 'Accept-Encoding'])))
+        if is_not_modified(environ, etag, asset.last_modified):
+            start_response('304 Not Modified', headers)
+            return []
+        headers.append(('Content-Type', asset.content_type))
+        headers.append(('Content-Length', str(len(body))))
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        start_response('200 OK', headers)
+        return [] if environ['REQUEST_METHOD'] == 'HEAD' else [body]
+
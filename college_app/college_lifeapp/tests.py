@@ -1,3 +1,1985 @@
-from django.test import TestCase
+import base64
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+from wsgiref.util import setup_testing_defaults
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.signals import request_started
+from django.core.wsgi import get_wsgi_application
+from django.db import DatabaseError, close_old_connections, connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.models import Count, F, Sum
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.test import AsyncClient, Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from .aggregation import expense_summary, rebuild_expense_rollups
+from .benchmarks import compare_results, failed_requests
+from .conditional import ALL_USERS, bump_collection_versions, get_collection_version
+from .dashboard import QUERY_BUDGET, build_dashboard, dashboard_querysets, get_dashboard
+from .db_utils import StartupCheck, cached_connection_check, update_returning
+from .goals import goal_stats, goal_stats_queryset
+from .metrics import get_lock_stats, registry, time_query
+from .models import Event, Expense, ExpenseMonthlyRollup, Goal, Routine, RoutineDay, UserProfile, parse_event_time
+from .pagination import KeysetCursorPagination
+from .response_cache import get_cached_data, stats as response_cache_stats, store_data
+from .schedule import IntervalTree
+from .search import MAX_LIMIT, ensure_search_triggers, search
+from .serializers import EventSerializer
+from .static_files import IMMUTABLE, StaticFilesLayer
+from .views import EventViewSet, ExpenseViewSet, GoalViewSet, RoutineViewSet, UserProfileViewSet, toggled
+
+
+def explain_query_plan(queryset):
+    """Return the EXPLAIN QUERY PLAN detail lines for a queryset"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanTests(TestCase):
+    """Hot endpoint querysets must be served from an index, not a scan plus sort"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='planner')
+
+    def assertIndexedPlan(self, queryset, label):
+        """Fail on sorts in a temp B-tree, and on full scans for filtered querysets"""
+        plan = explain_query_plan(queryset)
+        detail = '\n'.join(plan)
+        for line in plan:
+            if 'TEMP B-TREE' in line and 'ORDER BY' in line:
+                self.fail(f"{label} sorts in a temp B-tree:\n{detail}")
+            if queryset.query.where and line.startswith('SCAN '):
+                self.fail(f"{label} falls back to a full table scan:\n{detail}")
+
+    def hot_querysets(self):
+        user = self.user
+        querysets = {}
+        for name, viewset in [
+            ('routines', RoutineViewSet),
+            ('expenses', ExpenseViewSet),
+            ('events', EventViewSet),
+            ('goals', GoalViewSet),
+        ]:
+            queryset = viewset().get_queryset()
+            querysets[f'{name} list'] = queryset
+            querysets[f'{name} list for user'] = queryset.filter(user=user)
+        routines = RoutineViewSet().get_queryset()
+        querysets['routines by_day'] = routines.filter(day_entries__day='Tue').order_by('day_entries__time')
+        querysets['routines by_day for user'] = routines.filter(
+            day_entries__user=user, day_entries__day='Tue'
+        ).order_by('day_entries__time')
+        paginator = KeysetCursorPagination()
+        ordering = ['-date', '-created_at', '-id']
+        querysets['expenses keyset page'] = Expense.objects.order_by(*ordering).filter(
+            paginator.keyset_filter(ordering, ['2025-01-15', '2025-01-15T10:00:00+00:00', 42])
+        )
+        querysets['goals by_category'] = Goal.objects.filter(category='Internships', status='current')
+        querysets['goals for user by status'] = Goal.objects.filter(user=user, status='pending')
+        querysets['goal stats'] = goal_stats_queryset(Goal.objects.filter(user=user), date(2025, 1, 15))
+        querysets['expenses date range'] = Expense.objects.filter(date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        querysets['expense summary rollups'] = ExpenseMonthlyRollup.objects.filter(month__gte=date(2025, 1, 1)).order_by()
+        querysets['profiles list'] = UserProfileViewSet().get_queryset()
+        querysets['profile detail'] = UserProfileViewSet().get_queryset().filter(pk=1)
+        querysets['event detail'] = Event.objects.filter(pk=1)
+        window = {'starts_at__gte': '2025-01-01T00:00:00Z', 'starts_at__lt': '2025-01-08T00:00:00Z'}
+        querysets['events window'] = EventViewSet().get_queryset().filter(**window).order_by('starts_at', 'id')
+        querysets['events window for user'] = Event.objects.filter(user=user, **window).order_by('starts_at', 'id')
+        for section, queryset in dashboard_querysets(user, date(2025, 1, 15)).items():
+            querysets[f'dashboard {section}'] = queryset
+        return querysets
+
+    def test_hot_querysets_use_indexes(self):
+        for label, queryset in self.hot_querysets().items():
+            with self.subTest(label):
+                self.assertIndexedPlan(queryset, label)
+
+    def test_plan_check_flags_unindexed_access(self):
+        with self.assertRaises(AssertionError):
+            self.assertIndexedPlan(Routine.objects.order_by('title'), 'routines by title')
+        with self.assertRaises(AssertionError):
+            self.assertIndexedPlan(Event.objects.filter(location='Library'), 'events by location')
+
+
+class ExpenseRollupTests(TestCase):
+    """Summaries read from the monthly rollups must match a plain Sum over the expenses"""
+
+    ranges = [
+        (None, None),
+        (date(2025, 1, 1), date(2025, 3, 31)),    # Whole months only
+        (date(2025, 1, 20), date(2025, 3, 10)),   # Ragged edges around a whole month
+        (date(2025, 1, 31), date(2025, 2, 1)),    # Across one month boundary
+        (date(2025, 2, 5), date(2025, 2, 20)),    # Inside one month
+        (date(2025, 2, 1), None),
+        (None, date(2025, 2, 14)),
+        (date(2025, 3, 1), date(2025, 2, 1)),     # Empty
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create(username='spender')
+        self.other = User.objects.create(username='other')
+        UserProfile.objects.create(user=self.user, major='Economics')
+        self.expenses = [
+            self.add(self.user, 'Coffee', '3.50', 'Food', date(2025, 1, 1)),
+            self.add(self.user, 'Lunch', '11.25', 'Food', date(2025, 1, 20)),
+            self.add(self.user, 'Bus pass', '45.00', 'Transport', date(2025, 1, 31)),
+            self.add(self.user, 'Textbook', '89.99', 'Books', date(2025, 2, 1)),
+            self.add(self.user, 'Cinema', '14.00', 'Entertainment', date(2025, 2, 14)),
+            self.add(self.user, 'Groceries', '62.40', 'Food', date(2025, 2, 28)),
+            self.add(self.user, 'Taxi', '23.10', 'Transport', date(2025, 3, 10)),
+            self.add(self.user, 'Notebook', '4.75', 'Other', date(2025, 3, 31)),
+            self.add(self.other, 'Concert', '80.00', 'Entertainment', date(2025, 2, 14)),
+        ]
+
+    def add(self, user, item, amount, category, day):
+        expense = Expense.objects.create(user=user, item=item, amount=amount, category=category)
+        # ``date`` is set on insert, so back-date it with an update
+        expense.date = day
+        expense.save()
+        return expense
+
+    def expected(self, start=None, end=None):
+        rows = Expense.objects.filter(user=self.user)
+        if start is not None:
+            rows = rows.filter(date__gte=start)
+        if end is not None:
+            rows = rows.filter(date__lte=end)
+        return dict(rows.order_by().values_list('category').annotate(total=Sum('amount')))
+
+    def assertSummariesMatch(self):
+        for start, end in self.ranges:
+            with self.subTest(start=start, end=end):
+                summary = expense_summary(Expense.objects.filter(user=self.user), start, end, user=self.user)
+                expected = self.expected(start, end)
+                self.assertEqual(summary['by_category'], expected)
+                self.assertEqual(summary['total'], sum(expected.values(), Decimal('0.00')))
+
+    def assertRollupsMatchRebuild(self):
+        rollups = set(ExpenseMonthlyRollup.objects.filter(count__gt=0).values_list('user_id', 'category', 'month', 'total', 'count'))
+        counter = UserProfile.objects.get(user=self.user).expense_total
+        rebuild_expense_rollups()
+        self.assertEqual(set(ExpenseMonthlyRollup.objects.values_list('user_id', 'category', 'month', 'total', 'count')), rollups)
+        self.assertEqual(UserProfile.objects.get(user=self.user).expense_total, counter)
+
+    def test_ranges_match_a_plain_sum(self):
+        self.assertSummariesMatch()
+        self.assertRollupsMatchRebuild()
+
+    def test_group_by_periods(self):
+        queryset = Expense.objects.filter(user=self.user)
+        for group_by, trunc in [('day', TruncDay), ('week', TruncWeek), ('month', TruncMonth)]:
+            for start, end in self.ranges:
+                with self.subTest(group_by=group_by, start=start, end=end):
+                    summary = expense_summary(queryset, start, end, group_by, user=self.user)
+                    rows = queryset
+                    if start is not None:
+                        rows = rows.filter(date__gte=start)
+                    if end is not None:
+                        rows = rows.filter(date__lte=end)
+                    expected = defaultdict(dict)
+                    for period, category, total in (
+                        rows.annotate(period=trunc('date')).order_by()
+                        .values_list('period', 'category').annotate(total=Sum('amount'))
+                    ):
+                        expected[period.isoformat()][category] = total
+                    self.assertEqual(
+                        {bucket['period']: bucket['by_category'] for bucket in summary['by_period']}, dict(expected)
+                    )
+                    self.assertEqual(summary['by_category'], self.expected(start, end))
+        with self.assertRaises(ValueError):
+            expense_summary(queryset, group_by='year')
+
+    def test_updates_move_amounts_between_rollups(self):
+        coffee, lunch, bus = self.expenses[:3]
+        coffee.amount = Decimal('4.00')
+        coffee.save()
+        lunch.category = 'Other'
+        lunch.save()
+        bus.date = date(2025, 2, 15)  # Into another month
+        bus.save()
+        # A copy loaded from the database moves the same way
+        textbook = Expense.objects.get(pk=self.expenses[3].pk)
+        textbook.date, textbook.amount = date(2025, 3, 1), Decimal('79.99')
+        textbook.save()
+        self.assertSummariesMatch()
+        self.assertRollupsMatchRebuild()
+
+    def test_deletes_remove_amounts(self):
+        self.expenses[0].delete()
+        Expense.objects.filter(pk__in=[self.expenses[5].pk, self.expenses[6].pk]).delete()
+        self.assertSummariesMatch()
+        self.assertRollupsMatchRebuild()
+
+    def test_rebuild_repairs_drifted_rollups(self):
+        # Writes that skip the ORM leave the rollups and counter behind
+        Expense.objects.filter(pk=self.expenses[1].pk).update(amount=Decimal('100.00'))
+        ExpenseMonthlyRollup.objects.filter(user=self.other).delete()
+        self.assertEqual(rebuild_expense_rollups(), ExpenseMonthlyRollup.objects.count())
+        self.assertSummariesMatch()
+        self.assertEqual(
+            UserProfile.objects.get(user=self.user).expense_total,
+            Expense.objects.filter(user=self.user).aggregate(total=Sum('amount'))['total'],
+        )
+        other = expense_summary(Expense.objects.filter(user=self.other), user=self.other)
+        self.assertEqual(other['by_category'], {'Entertainment': Decimal('80.00')})
+
+    def test_endpoint_renders_amounts_as_strings(self):
+        caches['responses'].clear()
+        response = APIClient().get('/api/api/expenses/summary/', {'start': '2025-02-14', 'group_by': 'month'})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        # The endpoint summarizes the view's queryset, every user's expenses
+        expected = dict(
+            Expense.objects.filter(date__gte=date(2025, 2, 14)).order_by().values_list('category')
+            .annotate(total=Sum('amount'))
+        )
+        cents = Decimal('0.01')
+        self.assertEqual(data['by_category'], {category: str(total.quantize(cents)) for category, total in expected.items()})
+        self.assertEqual(data['total'], str(sum(expected.values()).quantize(cents)))
+        self.assertEqual(data['by_period'][0]['period'], '2025-02-01')
+        self.assertIsInstance(data['by_period'][0]['total'], str)
+
+class ProfileSpendingTests(TestCase):
+    """Profile spending is annotated per query for the current month and kept as a running total"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='budgeter')
+        self.profile = UserProfile.objects.create(user=self.user, major='Finance')
+        for item, amount, day in [
+            ('Rent share', '300.00', date(2025, 1, 10)),
+            ('Books', '45.50', date(2025, 1, 31)),
+            ('Groceries', '60.25', date(2025, 2, 1)),
+        ]:
+            expense = Expense.objects.create(user=self.user, item=item, amount=amount, category='Other')
+            expense.date = day
+            expense.save()
+        other = User.objects.create(username='bystander')
+        UserProfile.objects.create(user=other, major='Art')
+        Expense.objects.create(user=other, item='Paint', amount='99.00', category='Other')
+
+    def spending(self, today):
+        with mock.patch('django.utils.timezone.localdate', return_value=today):
+            profile = UserProfileViewSet().get_queryset().get(user=self.user)
+        return profile.total_spent_this_month, profile.total_spent
+
+    def test_annotations_follow_the_month(self):
+        # The queryset is built per request, so a long-running process rolls over with the calendar
+        self.assertEqual(self.spending(date(2025, 1, 31)), (Decimal('345.50'), Decimal('405.75')))
+        self.assertEqual(self.spending(date(2025, 2, 1)), (Decimal('60.25'), Decimal('405.75')))
+        self.assertEqual(self.spending(date(2025, 3, 1)), (Decimal('0.00'), Decimal('405.75')))
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2025, 2, 14)):
+            self.assertEqual(self.profile.total_spent_this_month, Decimal('60.25'))
+
+    def test_list_reads_spending_without_extra_queries(self):
+        with self.assertNumQueries(1):
+            profiles = list(UserProfileViewSet().get_queryset())
+            totals = {profile.user.username: profile.total_spent for profile in profiles}
+        self.assertEqual(totals, {'budgeter': Decimal('405.75'), 'bystander': Decimal('99.00')})
+        response = APIClient().get('/api/api/profiles/current/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_spent'], '405.75')
+
+    def test_running_total_follows_writes(self):
+        def counter():
+            return UserProfile.objects.get(pk=self.profile.pk).expense_total
+
+        self.assertEqual(counter(), Decimal('405.75'))
+        expense = Expense.objects.create(user=self.user, item='Coffee', amount='4.25', category='Food')
+        self.assertEqual(counter(), Decimal('410.00'))
+        expense.amount = Decimal('5.00')
+        expense.save()
+        self.assertEqual(counter(), Decimal('410.75'))
+        expense.delete()
+        self.assertEqual(counter(), Decimal('405.75'))
+        # Without the annotation the property reads the counter instead of summing expenses
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(profile.total_spent, Decimal('405.75'))
+
+    def test_new_profile_starts_from_existing_expenses(self):
+        user = User.objects.create(username='latecomer')
+        Expense.objects.create(user=user, item='Lunch', amount='12.00', category='Food')
+        profile = UserProfile.objects.create(user=user, major='Law')
+        self.assertEqual(UserProfile.objects.get(pk=profile.pk).expense_total, Decimal('12.00'))
+
+    def test_totals_beyond_one_expense_serialize(self):
+        # Totals have the counter column's 12 digits, more than a single amount's 10
+        caches['responses'].clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(2):
+                Expense.objects.create(user=self.user, item='Tuition', amount='99999999.99', category='Other')
+        response = APIClient().get('/api/api/profiles/current/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_spent'], '200000405.73')
+
+    @override_settings(PROFILE_SPEND_COUNTER=False)
+    def test_counter_off(self):
+        Expense.objects.create(user=self.user, item='Coffee', amount='4.25', category='Food')
+        profile = UserProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual(profile.expense_total, Decimal('405.75'))
+        self.assertEqual(profile.total_spent, Decimal('410.00'))
+
+
+class RoutineDayTests(TestCase):
+    """Routine.days is mirrored into indexed RoutineDay rows that the day views read"""
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        self.user = User.objects.create(username='scheduler')
+        self.client = APIClient()
+
+    def day_rows(self, routine=None):
+        rows = RoutineDay.objects.all() if routine is None else routine.day_entries.all()
+        return sorted((row.day, row.time.strftime('%H:%M'), row.user_id) for row in rows)
+
+    def test_days_are_validated(self):
+        for days in (['Mon', 'Funday'], 'Mon', [1]):
+            with self.subTest(days=days):
+                response = self.client.post('/api/api/routines/', {
+                    'title': 'Run', 'time': '07:00', 'days': days, 'category': 'gym'
+                }, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('days', response.data)
+        self.assertFalse(Routine.objects.exists())
+        response = self.client.post('/api/api/routines/', {
+            'title': 'Run', 'time': '07:00', 'days': ['Sat', 'Mon', 'Sat'], 'category': 'gym'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.day_rows(), [('Mon', '07:00', self.user.pk), ('Sat', '07:00', self.user.pk)])
+
+    def test_day_rows_follow_updates_and_deletes(self):
+        routine = Routine.objects.create(user=self.user, title='Lecture', time='09:00', days=['Mon', 'Wed'], category='class')
+        other = Routine.objects.create(user=self.user, title='Gym', time='18:00', days=['Mon'], category='gym')
+        self.assertEqual(self.day_rows(routine), [('Mon', '09:00', self.user.pk), ('Wed', '09:00', self.user.pk)])
+
+        response = self.client.patch(f'/api/api/routines/{routine.pk}/', {'days': ['Tue'], 'time': '10:30'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.day_rows(routine), [('Tue', '10:30', self.user.pk)])
+        routine.refresh_from_db()
+        routine.days = []
+        routine.save()
+        self.assertEqual(self.day_rows(routine), [])
+
+        self.assertEqual(self.client.delete(f'/api/api/routines/{other.pk}/').status_code, 204)
+        self.assertEqual(self.day_rows(), [])
+
+    def test_weekly_groups_routines_by_day_in_time_order(self):
+        Routine.objects.create(user=self.user, title='Gym', time='18:00', days=['Mon', 'Fri'], category='gym')
+        Routine.objects.create(user=self.user, title='Lecture', time='09:00', days=['Mon'], category='class')
+        Routine.objects.create(user=self.user, title='Rest', time='12:00', days=[], category='social')
+        response = self.client.get('/api/api/routines/weekly/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), Routine.DAY_CODES)
+        titles = {day: [item['title'] for item in items] for day, items in response.data.items()}
+        self.assertEqual(titles, {
+            'Mon': ['Lecture', 'Gym'], 'Tue': [], 'Wed': [], 'Thu': [], 'Fri': ['Gym'], 'Sat': [], 'Sun': [],
+        })
+        self.assertEqual(response.data['Fri'][0]['days'], ['Mon', 'Fri'])
+
+
+class RoutineDayMigrationTests(TransactionTestCase):
+    """Migration 0005 backfills RoutineDay rows for routines created before it"""
+    before = [('college_lifeapp', '0004_access_path_indexes')]
+    after = [('college_lifeapp', '0005_routine_day_index')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        user = apps.get_model('auth', 'User').objects.create(username='legacy')
+        Routine = apps.get_model('college_lifeapp', 'Routine')
+        lecture = Routine.objects.create(user_id=user.pk, title='Lecture', time='09:00', days=['Mon', 'Wed', 'Mon'], category='class')
+        Routine.objects.create(user_id=user.pk, title='Odd', time='10:00', days=['Funday'], category='class')
+        Routine.objects.create(user_id=user.pk, title='Empty', time='11:00', days=[], category='class')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        RoutineDay = executor.loader.project_state(self.after).apps.get_model('college_lifeapp', 'RoutineDay')
+        self.assertEqual(
+            sorted(RoutineDay.objects.values_list('routine_id', 'user_id', 'day', 'time')),
+            [(lecture.pk, user.pk, 'Mon', time(9)), (lecture.pk, user.pk, 'Wed', time(9))],
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages follow the (date, id) keyset both ways and reject tampered cursors"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create(username='pager')
+        # Several events share a date so the id tie-breaker matters
+        Event.objects.bulk_create(
+            Event(
+                user=self.user, title=f'Event {n}', date=date(2025, 3, 1) + timedelta(days=n // 3),
+                time='noon', location='Hall', category='Academic'
+            )
+            for n in range(17)
+        )
+        self.client = APIClient()
+
+    def ids(self, response):
+        return [event['id'] for event in response.json()['results']]
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(self.ids(response))
+            url = response.json()[link]
+        return pages
+
+    def cursor(self, position, reverse=False):
+        data = json.dumps({'p': position, 'r': reverse}).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def test_next_and_previous_cover_every_row_once(self):
+        expected = list(Event.objects.order_by('date', 'id').values_list('id', flat=True))
+        pages = self.walk('/api/api/events/?page_size=5', 'next')
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 2])
+        self.assertEqual(sum(pages, []), expected)
+
+        last = self.client.get('/api/api/events/?page_size=5')
+        for _ in range(3):
+            last = self.client.get(last.json()['next'])
+        self.assertIsNone(last.json()['next'])
+        back = self.walk(last.json()['previous'], 'previous')
+        self.assertEqual(back, pages[-2::-1])
+
+    def test_cursor_is_stable_across_inserts(self):
+        first = self.client.get('/api/api/events/?page_size=5')
+        seen = self.ids(first)
+        boundary = Event.objects.get(pk=seen[-1])
+        # Rows inserted before the cursor must not shift the next page
+        Event.objects.create(
+            user=self.user, title='Earlier', date=date(2025, 2, 1), time='noon', location='Hall', category='Academic'
+        )
+        later = Event.objects.create(
+            user=self.user, title='Same day, later id', date=boundary.date, time='9am', location='Hall', category='Academic'
+        )
+        second = self.client.get(first.json()['next'])
+        expected = list(
+            Event.objects.filter(date__gte=boundary.date).exclude(pk__in=seen)
+            .order_by('date', 'id').values_list('id', flat=True)[:5]
+        )
+        self.assertEqual(self.ids(second), expected)
+        self.assertIn(later.pk, self.ids(second))
+
+    def test_page_size_is_capped(self):
+        self.assertEqual(len(self.ids(self.client.get('/api/api/events/?page_size=4'))), 4)
+        with mock.patch.object(KeysetCursorPagination, 'max_page_size', 6):
+            self.assertEqual(len(self.ids(self.client.get('/api/api/events/?page_size=100'))), 6)
+        with mock.patch.object(KeysetCursorPagination, 'page_size', 3):
+            for value in ('0', '-2', 'many'):
+                with self.subTest(page_size=value):
+                    self.assertEqual(len(self.ids(self.client.get(f'/api/api/events/?page_size={value}'))), 3)
+
+    def test_malformed_cursors_are_not_found(self):
+        Expense.objects.create(user=self.user, item='Tea', amount='2.00', category='Food')
+        valid = self.client.get('/api/api/expenses/?page_size=1')
+        self.assertEqual(valid.status_code, 200)
+        cursors = {
+            'not base64': '%%%',
+            'not json': base64.urlsafe_b64encode(b'{nope').decode(),
+            'no position': base64.urlsafe_b64encode(b'{"r": false}').decode(),
+            'wrong length': self.cursor(['2025-01-01', 1]),
+            'bad values': self.cursor(['abc', 'x', 1]),
+            'nulls': self.cursor([None, None, None]),
+            'bad id': self.cursor(['2025-01-01', '2025-01-01T10:00:00+00:00', 'x']),
+            'nested': self.cursor([{'a': 1}, [], 1]),
+        }
+        for label, cursor in cursors.items():
+            with self.subTest(label):
+                response = self.client.get(f'/api/api/expenses/?cursor={cursor}')
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': KeysetCursorPagination.invalid_cursor_message})
+        # A well-formed cursor past the end gives an empty page with a way back
+        response = self.client.get(f"/api/api/expenses/?cursor={self.cursor(['1999-01-01', '1999-01-01T00:00:00+00:00', 1])}")
+        self.assertEqual(response.json()['results'], [])
+        self.assertEqual(self.ids(self.client.get(response.json()['previous'])), self.ids(valid))
+
+class BulkCreateTests(TestCase):
+    """List payloads are validated together, written in one transaction and keep derived tables in step"""
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        self.user = User.objects.create(username='bulk')
+        UserProfile.objects.create(user=self.user, major='Statistics')
+        self.client = APIClient()
+
+    def post(self, collection, items):
+        return self.client.post(f'/api/api/{collection}/', items, format='json')
+
+    def test_invalid_items_are_reported_by_index_and_nothing_is_written(self):
+        response = self.post('expenses', [
+            {'item': 'Tea', 'amount': '2.00', 'category': 'Food'},
+            {'item': 'Bus', 'amount': 'lots', 'category': 'Transport'},
+            {'item': 'Pen', 'amount': '1.00', 'category': 'Stationery'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 2])
+        self.assertIn('amount', errors[0]['errors'])
+        self.assertIn('category', errors[1]['errors'])
+        self.assertFalse(Expense.objects.exists())
+        self.assertFalse(ExpenseMonthlyRollup.objects.exists())
+
+    def test_failure_after_insert_rolls_back_the_batch(self):
+        items = [{'item': f'Item {n}', 'amount': '5.00', 'category': 'Food'} for n in range(3)]
+        with mock.patch.object(ExpenseViewSet, 'perform_bulk_create', side_effect=DatabaseError('disk I/O error')), \
+                self.assertLogs('college_lifeapp.views', 'ERROR'):
+            response = self.post('expenses', items)
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(Expense.objects.exists())
+        self.assertEqual(UserProfile.objects.get(user=self.user).expense_total, Decimal('0.00'))
+
+    def test_expenses_update_rollups_and_counter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.get('/api/api/expenses/').json()['results'], [])
+            response = self.post('expenses', [
+                {'item': 'Tea', 'amount': '2.00', 'category': 'Food'},
+                {'item': 'Lunch', 'amount': '9.50', 'category': 'Food'},
+                {'item': 'Bus', 'amount': '3.25', 'category': 'Transport'},
+            ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['item'] for item in response.json()], ['Tea', 'Lunch', 'Bus'])
+        month = timezone.localdate().replace(day=1)
+        self.assertEqual(
+            set(ExpenseMonthlyRollup.objects.values_list('category', 'month', 'total', 'count')),
+            {('Food', month, Decimal('11.50'), 2), ('Transport', month, Decimal('3.25'), 1)},
+        )
+        self.assertEqual(UserProfile.objects.get(user=self.user).expense_total, Decimal('14.75'))
+        # The bulk write bumped the version stamp, so the cached empty list is gone
+        self.assertEqual(len(self.client.get('/api/api/expenses/').json()['results']), 3)
+
+    def test_routines_and_events_get_derived_rows(self):
+        response = self.post('routines', [
+            {'title': 'Lecture', 'time': '09:00', 'days': ['Mon', 'Wed'], 'category': 'class'},
+            {'title': 'Gym', 'time': '18:30', 'days': ['Fri'], 'category': 'gym'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(RoutineDay.objects.values_list('routine__title', 'day', 'time')),
+            [('Gym', 'Fri', time(18, 30)), ('Lecture', 'Mon', time(9)), ('Lecture', 'Wed', time(9))],
+        )
+        response = self.post('events', [
+            {'title': 'Talk', 'date': '2025-03-01', 'time': '6:30 PM', 'location': 'Hall', 'category': 'Academic'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Event.objects.get().starts_at.astimezone(timezone.get_default_timezone()).time(), time(18, 30))
+
+    def test_too_many_items(self):
+        items = [{'title': f'Goal {n}', 'deadline': '2025-06-01', 'category': 'Networking'} for n in range(4)]
+        with mock.patch.object(GoalViewSet, 'bulk_max_items', 3):
+            response = self.post('goals', items)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('At most 3 items', response.json()['error'])
+        self.assertFalse(Goal.objects.exists())
+        self.assertEqual(self.post('goals', items[:3]).status_code, 201)
+        self.assertEqual(Goal.objects.count(), 3)
+
+class ConditionalGetTests(TestCase):
+    """Reads carry validators that answer 304 until a write to the collection"""
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        self.user = User.objects.create(username='validator')
+        self.goal = Goal.objects.create(user=self.user, title='Apply', deadline=date(2025, 4, 1), category='Internships')
+        self.client = APIClient()
+
+    def write(self, **values):
+        with self.captureOnCommitCallbacks(execute=True):
+            Goal.objects.create(user=self.user, deadline=date(2025, 5, 1), category='Networking', **values)
+
+    def test_etag_revalidates_without_queries(self):
+        for path in ('/api/api/goals/', f'/api/api/goals/{self.goal.pk}/'):
+            with self.subTest(path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                with self.assertNumQueries(0):
+                    not_modified = self.client.get(path, headers={'If-None-Match': response['ETag']})
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified.content, b'')
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+                stale = self.client.get(path, headers={'If-None-Match': '"0-0", "1-1"'})
+                self.assertEqual(stale.status_code, 200)
+
+    def test_etag_depends_on_the_request(self):
+        etags = {
+            self.client.get(path, headers=headers)['ETag']
+            for path, headers in [
+                ('/api/api/goals/', {}),
+                ('/api/api/goals/?page_size=1', {}),
+                ('/api/api/goals/', {'Accept': 'application/json; indent=2'}),
+            ]
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_write_invalidates(self):
+        response = self.client.get('/api/api/goals/')
+        self.write(title='Network')
+        fresh = self.client.get('/api/api/goals/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], response['ETag'])
+        self.assertEqual([goal['title'] for goal in fresh.json()['results']], ['Apply', 'Network'])
+        # Other collections keep their validators
+        routines = self.client.get('/api/api/routines/')
+        self.write(title='Another')
+        self.assertEqual(
+            self.client.get('/api/api/routines/', headers={'If-None-Match': routines['ETag']}).status_code, 304
+        )
+
+    def test_last_modified_never_hides_a_write_in_the_same_second(self):
+        second = 1_750_000_000
+        with mock.patch('college_lifeapp.conditional.time') as fake_time:
+            def at(moment):
+                fake_time.time_ns.return_value = int(moment * 1_000_000_000)
+
+            def since(moment):
+                return {'If-Modified-Since': http_date(moment)}
+
+            at(second + 0.1)
+            self.write(title='First')
+            response = self.client.get('/api/api/goals/')
+            self.assertNotIn('Last-Modified', response)
+            self.assertEqual(self.client.get('/api/api/goals/', headers=since(second)).status_code, 200)
+
+            at(second + 0.4)
+            self.write(title='Second')
+            at(second + 1.5)
+            response = self.client.get('/api/api/goals/', headers=since(second))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Last-Modified'], http_date(second + 1))
+            self.assertEqual(len(response.json()['results']), 3)
+            self.assertEqual(self.client.get('/api/api/goals/', headers=since(second + 1)).status_code, 304)
+
+            # A write in the second the date was given out is still newer than it
+            self.write(title='Third')
+            at(second + 1.7)
+            response = self.client.get('/api/api/goals/', headers=since(second + 1))
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Last-Modified', response)
+            at(second + 2)
+            self.assertEqual(self.client.get('/api/api/goals/', headers=since(second + 1)).status_code, 200)
+            self.assertEqual(self.client.get('/api/api/goals/', headers=since(second + 2)).status_code, 304)
+
+class ResponseCacheTests(TestCase):
+    """Read responses are cached per version stamp, scope and day, within a bounded LRU"""
+
+    small_cache = {
+        **settings.CACHES,
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'response-cache-tests',
+            'TIMEOUT': 60,
+            'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3},
+        },
+    }
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        response_cache_stats.reset()
+        self.user = User.objects.create(username='cached')
+        Goal.objects.create(user=self.user, title='Apply', deadline=date(2025, 4, 1), category='Internships')
+        self.client = APIClient()
+
+    def titles(self, path='/api/api/goals/'):
+        return [goal['title'] for goal in self.client.get(path).json()['results']]
+
+    def test_hit_skips_the_database_until_a_write(self):
+        self.assertEqual(self.titles(), ['Apply'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(), ['Apply'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Goal.objects.create(user=self.user, title='Network', deadline=date(2025, 5, 1), category='Networking')
+        self.assertEqual(self.titles(), ['Apply', 'Network'])
+        stats = self.client.get('/api/api/health/cache/').json()
+        self.assertEqual(
+            {key: stats[key] for key in ('hits', 'misses', 'stores', 'hit_ratio')},
+            {'hits': 1, 'misses': 2, 'stores': 2, 'hit_ratio': 0.3333},
+        )
+        self.assertTrue(stats['enabled'])
+        self.assertEqual((stats['max_entries'], stats['timeout']), (2000, 300))
+
+    def test_entries_are_keyed_by_day(self):
+        profile = UserProfile.objects.create(user=self.user, major='Design')
+        expense = Expense.objects.create(user=self.user, item='Lamp', amount='20.00', category='Other')
+        expense.date = date(2025, 1, 31)
+        expense.save()
+        path = f'/api/api/profiles/{profile.pk}/'
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2025, 1, 31)):
+            january = self.client.get(path)
+        self.assertEqual(january.data['spent_this_month'], '20.00')
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2025, 2, 1)):
+            february = self.client.get(path)
+            self.assertEqual(
+                self.client.get(path, headers={'If-None-Match': january['ETag']}).status_code, 200
+            )
+        self.assertNotEqual(february['ETag'], january['ETag'])
+        self.assertEqual(february.data['spent_this_month'], '0.00')
+
+    def test_scopes_and_stamps_are_per_user(self):
+        get_cached_data('goals', 1, '"etag"')
+        store_data('goals', 1, '"etag"', {'owner': 1})
+        self.assertEqual(get_cached_data('goals', 1, '"etag"'), {'owner': 1})
+        self.assertIsNone(get_cached_data('goals', 2, '"etag"'))
+        self.assertIsNone(get_cached_data('goals', ALL_USERS, '"etag"'))
+        versions = {scope: get_collection_version('goals', scope) for scope in (1, 2, ALL_USERS)}
+        bump_collection_versions(['goals'], user_id=1)
+        self.assertNotEqual(get_collection_version('goals', 1), versions[1])
+        self.assertNotEqual(get_collection_version('goals', ALL_USERS), versions[ALL_USERS])
+        self.assertEqual(get_collection_version('goals', 2), versions[2])
+        self.assertEqual(response_cache_stats.as_dict()['misses'], 3)
+
+    @override_settings(CACHES=small_cache)
+    def test_ttl_and_lru_bounds(self):
+        clock = [1_000_000.0]
+        fake_time = mock.Mock(time=lambda: clock[0])
+        with mock.patch('django.core.cache.backends.locmem.time', fake_time), \
+                mock.patch('django.core.cache.backends.base.time', fake_time):
+            paths = [f'/api/api/goals/?page_size={size}' for size in (1, 2, 3, 4)]
+            for path in paths[:3]:
+                self.client.get(path)
+            self.client.get(paths[0])  # A hit makes it the most recently used
+            self.client.get(paths[3])  # Over the limit: the least recently used entry goes
+            self.assertEqual(response_cache_stats.as_dict()['hits'], 1)
+            with self.assertNumQueries(0):
+                self.client.get(paths[0])
+            with self.assertNumQueries(1):
+                self.client.get(paths[1])
+
+            clock[0] += 61
+            with self.assertNumQueries(1):
+                self.client.get(paths[0])
+        self.assertEqual(response_cache_stats.as_dict()['stores'], 6)
+
+
+class AtomicUpdateTests(TransactionTestCase):
+    """Toggle and progress actions must not lose updates under concurrent requests"""
+
+    threads = 8
+    requests_per_thread = 25
+
+    def setUp(self):
+        user = User.objects.create(username='toggler')
+        self.event = Event.objects.create(
+            user=user, title='Career Fair', date=date(2025, 3, 1), time='10:00 AM',
+            location='Gym', category='Career'
+        )
+        self.goal = Goal.objects.create(
+            user=user, title='Apply', deadline=date(2025, 4, 1), category='Internships'
+        )
+
+    def hammer(self, url, method='post', data=None):
+        """Send ``threads * requests_per_thread`` requests to ``url`` from parallel threads"""
+        def worker(_):
+            client = APIClient()
+            try:
+                codes = []
+                for _ in range(self.requests_per_thread):
+                    response = getattr(client, method)(url, data, format='json')
+                    codes.append(response.status_code)
+                return codes
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            codes = [code for result in pool.map(worker, range(self.threads)) for code in result]
+        self.assertEqual(set(codes), {200})
+        return len(codes)
+
+    def test_concurrent_toggles_are_not_lost(self):
+        for action, field in [('toggle_rsvp', 'rsvped'), ('toggle_favorite', 'is_favorite')]:
+            with self.subTest(action):
+                count = self.hammer(f'/api/api/events/{self.event.pk}/{action}/')
+                self.event.refresh_from_db()
+                self.assertEqual(getattr(self.event, field), count % 2 == 1)
+
+    def test_concurrent_toggle_complete_keeps_progress_consistent(self):
+        count = self.hammer(f'/api/api/goals/{self.goal.pk}/toggle_complete/')
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.completed, count % 2 == 1)
+        self.assertEqual(self.goal.progress, 100 if self.goal.completed else 0)
+
+    def test_toggle_returns_new_state(self):
+        client = APIClient()
+        response = client.post(f'/api/api/events/{self.event.pk}/toggle_rsvp/')
+        self.assertTrue(response.data['rsvped'])
+        response = client.post(f'/api/api/goals/{self.goal.pk}/toggle_complete/')
+        self.assertEqual((response.data['completed'], response.data['progress']), (True, 100))
+        response = client.patch(f'/api/api/goals/{self.goal.pk}/update_progress/', {'progress': 40}, format='json')
+        self.assertEqual((response.data['completed'], response.data['progress']), (False, 40))
+        response = client.patch(f'/api/api/goals/{self.goal.pk}/update_progress/', {'progress': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = client.post('/api/api/events/999/toggle_rsvp/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_returning_reads_the_new_row_from_the_update(self):
+        queryset = Event.objects.filter(pk=self.event.pk)
+        with self.assertNumQueries(1):
+            (event,) = update_returning(queryset, rsvped=toggled('rsvped'), attendees=F('attendees') + 3)
+        self.assertEqual((event.rsvped, event.attendees), (True, 3))
+        # Values go through the same converters as a SELECT
+        self.assertEqual(event.starts_at, Event.objects.get(pk=self.event.pk).starts_at)
+        self.assertEqual(event.date, date(2025, 3, 1))
+        self.assertEqual(update_returning(Event.objects.filter(pk=999), rsvped=True), [])
+
+
+class ExpenseWriteContentionTests(TransactionTestCase):
+    """Concurrent expense creates and deletes wait for the write lock instead of failing"""
+
+    threads = 8
+    requests_per_thread = 15
+
+    def setUp(self):
+        self.user = User.objects.create(username='writer')
+        UserProfile.objects.create(user=self.user, major='Economics')
+        self.expenses = [
+            Expense.objects.create(user=self.user, item=f'Coffee {index}', amount='2.00', category='Food')
+            for index in range(self.threads * self.requests_per_thread)
+        ]
+
+    def test_delete_writes_in_one_immediate_transaction(self):
+        expense = self.expenses[0]
+        with CaptureQueriesContext(connection) as context:
+            response = APIClient().delete(f'/api/api/expenses/{expense.pk}/')
+        self.assertEqual(response.status_code, 204)
+        statements = [query['sql'].split()[0] for query in context.captured_queries]
+        begin = statements.index('BEGIN')
+        self.assertEqual(context.captured_queries[begin]['sql'], 'BEGIN IMMEDIATE')
+        # The row, its rollup and the profile total are all written inside it
+        self.assertNotIn('DELETE', statements[:begin])
+        self.assertNotIn('UPDATE', statements[:begin])
+        self.assertEqual(statements.count('BEGIN'), 1)
+
+    def test_concurrent_creates_and_deletes_all_succeed(self):
+        pending = iter(self.expenses)
+
+        def worker(index):
+            client = APIClient()
+            try:
+                codes = []
+                for step in range(self.requests_per_thread):
+                    if (index + step) % 2:
+                        response = client.post(
+                            '/api/api/expenses/', {'item': 'Tea', 'amount': '3.00', 'category': 'Food'}, format='json'
+                        )
+                    else:
+                        response = client.delete(f'/api/api/expenses/{next(pending).pk}/')
+                    codes.append(response.status_code)
+                return codes
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            codes = [code for result in pool.map(worker, range(self.threads)) for code in result]
+        self.assertEqual(set(codes), {201, 204})
+        total = Expense.objects.filter(user=self.user).aggregate(total=Sum('amount'))['total']
+        self.assertEqual(UserProfile.objects.get(user=self.user).expense_total, total)
+        rollup = ExpenseMonthlyRollup.objects.filter(user=self.user).aggregate(total=Sum('total'))['total']
+        self.assertEqual(rollup, total)
+
+
+class MetricsTests(TestCase):
+    """The metrics endpoint reports per-view latency, sizes and SQL usage"""
+
+    def setUp(self):
+        registry.reset()
+        caches['responses'].clear()
+        self.client = APIClient()
+
+    def scrape(self):
+        response = self.client.get('/api/api/health/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_records_requests_and_queries_per_view(self):
+        user = User.objects.create(username='metered')
+        Expense.objects.create(user=user, item='Coffee', amount='3.50', category='Food')
+        for _ in range(3):
+            self.client.get('/api/api/expenses/')
+        self.client.get('/api/api/expenses/999/')
+
+        samples = self.scrape()
+        labels = '{view="expense-list",method="GET"'
+        self.assertEqual(samples[f'college_app_http_responses_total{labels},status="200"}}'], 3)
+        self.assertEqual(samples[f'college_app_http_request_duration_seconds_count{labels}}}'], 3)
+        self.assertEqual(samples[f'college_app_http_request_duration_seconds_bucket{labels},le="+Inf"}}'], 3)
+        # Repeat reads are answered from the response cache without SQL
+        self.assertGreaterEqual(samples[f'college_app_db_queries_total{labels}}}'], 1)
+        self.assertGreater(samples[f'college_app_http_response_size_bytes_sum{labels}}}'], 0)
+        self.assertEqual(
+            samples['college_app_http_responses_total{view="expense-detail",method="GET",status="404"}'], 1
+        )
+        self.assertEqual(samples['college_app_http_requests_in_flight'], 1)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for _ in range(5):
+            self.client.get('/api/api/goals/')
+        samples = self.scrape()
+        pattern = re.compile(r'college_app_http_request_duration_seconds_bucket\{view="goal-list",.*le="([^"]+)"\}')
+        counts = [value for name, value in samples.items() if pattern.match(name)]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(counts[-1], 5)
+
+    def test_lock_waits_are_booked_on_immediate_begins_only(self):
+        def slow_execute(sql, params, many, context):
+            fake_clock[0] += 0.01
+
+        fake_clock = [0.0]
+        with mock.patch('college_lifeapp.metrics.time.perf_counter', side_effect=lambda: fake_clock[0]):
+            for sql in ('BEGIN', 'BEGIN IMMEDIATE', 'SELECT 1'):
+                time_query(slow_execute, sql, None, False, {})
+        shard = registry.shard()
+        self.assertEqual((shard.lock_waits, round(shard.lock_wait_seconds, 6)), (1, 0.01))
+
+        self.assertEqual(get_lock_stats(), {'lock_waits': 1, 'lock_wait_seconds': 0.01, 'lock_timeouts': 0})
+        self.assertEqual(self.scrape()['college_app_db_lock_waits_total'], 1)
+        # A deferred BEGIN gives no lock wait to measure
+        with mock.patch.dict(connection.settings_dict['OPTIONS'], clear=True):
+            self.assertEqual(get_lock_stats(), {'lock_timeouts': 0})
+            self.assertNotIn('college_app_db_lock_waits_total', self.scrape())
+
+
+WORKER_WRITE = (
+    'import django; django.setup()\n'
+    'from college_lifeapp.conditional import bump_model_versions\n'
+    'from college_lifeapp.models import Expense\n'
+    'bump_model_versions(Expense)\n'
+)
+
+
+class SharedCacheTests(TestCase):
+    """Worker processes started by the supervisor share version stamps and cached responses"""
+
+    def setUp(self):
+        with mock.patch.object(sys, 'path', [str(settings.BASE_DIR.parent), *sys.path]):
+            from workers import Supervisor
+        self.supervisor = Supervisor(0)
+        self.addCleanup(self.supervisor.stop)
+        cache_dir = self.supervisor.share_cache()
+        caches_override = override_settings(CACHES={
+            alias: {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': os.path.join(cache_dir, alias),
+            }
+            for alias in ('default', 'responses')
+        })
+        caches_override.enable()
+        self.addCleanup(caches_override.disable)
+        user = User.objects.create(username='worker')
+        Expense.objects.create(user=user, item='Lunch', amount='8.00', category='Food')
+
+    def test_a_write_in_another_worker_is_seen(self):
+        response = self.client.get('/api/api/expenses/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/api/expenses/', headers={'If-None-Match': etag}).status_code, 304)
+
+        # Another worker handles a write and bumps the expense stamps
+        subprocess.run(
+            [sys.executable, '-c', WORKER_WRITE], cwd=settings.BASE_DIR,
+            env=self.supervisor.worker_environ(), check=True,
+        )
+        response = self.client.get('/api/api/expenses/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_cache_directory_is_removed_on_stop(self):
+        cache_dir = self.supervisor.cache_dir
+        self.assertEqual(self.supervisor.worker_environ()['COLLEGE_APP_CACHE_DIR'], cache_dir)
+        self.supervisor.stop()
+        self.assertFalse(os.path.exists(cache_dir))
+
+
+class WorkerHealthTests(TestCase):
+    """Workers report stuck request threads and the supervisor replaces them"""
+
+    def setUp(self):
+        with mock.patch.object(sys, 'path', [str(settings.BASE_DIR.parent), *sys.path]):
+            import workers
+        self.workers = workers
+
+    def test_progress_reports_the_longest_stalled_request(self):
+        def application(environ, start_response):
+            start_response('200 OK', [])
+            return [b'first', b'second']
+
+        clock = [100.0]
+        with mock.patch.object(self.workers.time, 'monotonic', side_effect=lambda: clock[0]):
+            progress = self.workers.RequestProgress(application)
+            self.assertEqual(progress.stalled_seconds(), 0.0)
+            response = progress({}, lambda status, headers: None)
+            clock[0] += 5
+            self.assertEqual(progress.stalled_seconds(), 5.0)
+            # Sending part of the body is progress
+            chunks = iter(response)
+            next(chunks)
+            clock[0] += 2
+            self.assertEqual(progress.stalled_seconds(), 2.0)
+            response.close()
+            self.assertEqual(progress.stalled_seconds(), 0.0)
+
+    def test_supervisor_kills_a_worker_with_a_stuck_request(self):
+        supervisor = self.workers.Supervisor(0)
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        self.addCleanup(process.kill)
+        worker = self.workers.Worker(process, read_fd, 1)
+        worker.status = {'stalled_seconds': 1.0}
+        supervisor.workers.append(worker)
+        self.assertIsNone(supervisor.hang_reason(worker, self.workers.time.monotonic()))
+
+        worker.status = {'stalled_seconds': self.workers.REQUEST_TIMEOUT + 1}
+        # Stopping, so the worker is not replaced
+        supervisor.stopping.set()
+        with mock.patch('builtins.print') as output:
+            supervisor.reap()
+        self.assertEqual(process.returncode, -signal.SIGKILL)
+        self.assertEqual(supervisor.workers, [])
+        self.assertIn('stuck', output.call_args[0][0])
+
+
+class SqliteProfileTests(TestCase):
+    """Each SQLite connection profile applies its pragmas to every new connection"""
+
+    def pragmas(self, profile):
+        directory = tempfile.mkdtemp()
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': os.path.join(directory, 'profile.sqlite3'),
+            'OPTIONS': settings.SQLITE_PROFILES[profile]['OPTIONS'],
+        }
+        wrapper = SQLiteDatabaseWrapper(settings_dict, alias=f'{profile}-profile')
+        try:
+            with wrapper.cursor() as cursor:
+                values = {}
+                for pragma in ('journal_mode', 'synchronous', 'foreign_keys', 'busy_timeout', 'temp_store'):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    values[pragma] = cursor.fetchone()[0]
+                return values
+        finally:
+            wrapper.close()
+            shutil.rmtree(directory)
+
+    def test_performance_profile(self):
+        self.assertEqual(self.pragmas('performance'), {
+            'journal_mode': 'wal',
+            'synchronous': 1,    # NORMAL
+            'foreign_keys': 1,
+            'busy_timeout': 5000,
+            'temp_store': 2,     # MEMORY
+        })
+        self.assertEqual(settings.SQLITE_PROFILES['performance']['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+    def test_default_profile(self):
+        self.assertEqual(self.pragmas('default'), {
+            'journal_mode': 'delete',
+            'synchronous': 2,    # FULL
+            'foreign_keys': 1,
+            'busy_timeout': 5000,  # Python's sqlite3 timeout
+            'temp_store': 0,
+        })
+
+    @skipUnless(settings.SQLITE_PROFILE == 'default', 'COLLEGE_APP_SQLITE_PROFILE overrides the default')
+    def test_management_commands_keep_the_rollback_journal(self):
+        # journal_mode=WAL would be written into the database file
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'delete')
+
+
+class DatabaseHealthTests(TestCase):
+    """Plain probes reuse a cached check; deep probes report live statistics"""
+
+    def setUp(self):
+        cached_connection_check.reset()
+        registry.reset()
+        self.client = APIClient()
+
+    @override_settings(HEALTH_CHECK_TTL=60)
+    def test_plain_probe_is_served_from_cache(self):
+        with mock.patch('college_lifeapp.db_utils.check_database_connection', return_value=(True, None)) as check:
+            for _ in range(5):
+                response = self.client.get('/api/api/health/database/')
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(response.data['status'], 'healthy')
+
+    @override_settings(HEALTH_CHECK_TTL=0)
+    def test_expired_probe_rechecks(self):
+        with mock.patch('college_lifeapp.db_utils.check_database_connection', return_value=(False, 'down')) as check:
+            response = self.client.get('/api/api/health/database/')
+            self.client.get('/api/api/health/database/')
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual((response.status_code, response.data['error']), (503, 'down'))
+
+    def test_deep_probe_reports_statistics(self):
+        user = User.objects.create(username='deep')
+        Expense.objects.create(user=user, item='Book', amount='12.00', category='Books')
+        self.client.get('/api/api/expenses/')
+        response = self.client.get('/api/api/health/database/?deep=1')
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertGreater(data['query_latency']['samples'], 0)
+        self.assertIn('p99_ms', data['query_latency'])
+        self.assertEqual(set(data['locks']), {'lock_waits', 'lock_wait_seconds', 'lock_timeouts'})
+        self.assertGreater(data['storage']['page_count'], 0)
+        self.assertIn('wal_bytes', data['storage'])
+        self.assertGreaterEqual(data['row_estimates']['college_lifeapp_expense'], 1)
+
+
+class StartupCheckTests(TestCase):
+    """The startup database check runs off the import path and reports completion"""
+
+    def test_background_check_signals_completion(self):
+        check = StartupCheck()
+        with mock.patch('college_lifeapp.db_utils.ensure_database_ready', return_value=True):
+            check.start('background')
+            self.assertTrue(check.wait(timeout=5))
+        self.assertTrue(check.ready)
+        self.assertIsNotNone(check.seconds)
+
+    def test_failing_check_does_not_raise(self):
+        check = StartupCheck()
+        with mock.patch('college_lifeapp.db_utils.ensure_database_ready', side_effect=RuntimeError('no disk')):
+            check.start('blocking')
+        self.assertTrue(check.done.is_set())
+        self.assertFalse(check.ready)
+
+    def test_off_skips_the_check(self):
+        check = StartupCheck()
+        with mock.patch('college_lifeapp.db_utils.ensure_database_ready') as ensure:
+            check.start('off')
+        ensure.assert_not_called()
+        self.assertFalse(check.wait(timeout=0))
+
+
+class DashboardTests(TestCase):
+    """The dashboard is built from a fixed number of queries and cached per user"""
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        self.today = date.today()
+        self.user = User.objects.create(username='dash')
+        UserProfile.objects.create(user=self.user, major='History', monthly_budget=Decimal('200.00'))
+        today_code = Routine.DAY_CODES[self.today.weekday()]
+        other_code = Routine.DAY_CODES[(self.today.weekday() + 1) % 7]
+        Routine.objects.create(user=self.user, title='Lecture', time='09:00', days=[today_code], category='class')
+        Routine.objects.create(user=self.user, title='Gym', time='18:00', days=[other_code], category='gym')
+        for offset in (0, 3, 30):
+            Event.objects.create(
+                user=self.user, title=f'Event +{offset}', date=self.today + timedelta(days=offset),
+                time='noon', location='Quad', category='Cultural'
+            )
+        Goal.objects.create(user=self.user, title='Apply', deadline=self.today, category='Internships')
+        Goal.objects.create(user=self.user, title='Done', deadline=self.today, category='Internships', completed=True)
+        Expense.objects.create(user=self.user, item='Lunch', amount='12.50', category='Food')
+        Expense.objects.create(user=self.user, item='Bus', amount='37.50', category='Transport')
+        self.client = APIClient()
+
+    def test_payload(self):
+        with self.assertNumQueries(QUERY_BUDGET):
+            data = build_dashboard(self.user, self.today)
+        self.assertEqual([routine['title'] for routine in data['routines']], ['Lecture'])
+        self.assertEqual([event['title'] for event in data['events']], ['Event +0', 'Event +3'])
+        self.assertEqual([goal['title'] for goal in data['goals']], ['Apply'])
+        self.assertEqual(data['budget'], {
+            'monthly_budget': '200.00',
+            'spent_this_month': '50.00',
+            'remaining': '150.00',
+            'percent_used': '25.0',
+            'by_category': {'Food': '12.50', 'Transport': '37.50'},
+        })
+
+    def test_endpoint_is_cached_until_a_write(self):
+        # One query resolves the current user; the rest is the dashboard itself
+        with self.assertNumQueries(1 + QUERY_BUDGET):
+            response = self.client.get('/api/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/api/dashboard/').data, response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Expense.objects.create(user=self.user, item='Book', amount='50.00', category='Books')
+        response = self.client.get('/api/api/dashboard/')
+        self.assertEqual(response.data['budget']['spent_this_month'], '100.00')
+
+    def test_today_is_the_local_date(self):
+        tomorrow = self.today + timedelta(days=1)
+        with mock.patch('django.utils.timezone.localdate', return_value=tomorrow):
+            data = get_dashboard(self.user)
+        self.assertEqual(data['date'], tomorrow.isoformat())
+        self.assertEqual([event['title'] for event in data['events']], ['Event +3'])
+
+
+class AsyncViewTests(TransactionTestCase):
+    """Under ASGI the hot reads are served by async views with the same responses"""
+
+    paths = [
+        '/api/api/routines/',
+        '/api/api/expenses/?page_size=2',
+        '/api/api/events/',
+        '/api/api/goals/',
+        '/api/api/routines/by_day/?day=Mon',
+        '/api/api/routines/by_day/?day=Funday',
+        '/api/api/expenses/summary/?group_by=month',
+        '/api/api/expenses/summary/?start=2025-13-01',
+    ]
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        user = User.objects.create(username='async')
+        Routine.objects.create(user=user, title='Lecture', time='09:00', days=['Mon', 'Wed'], category='class')
+        for amount in ('4.50', '12.00', '30.25'):
+            Expense.objects.create(user=user, item='Item', amount=amount, category='Food')
+        Event.objects.create(user=user, title='Fair', date=date(2025, 3, 1), time='noon', location='Gym', category='Career')
+        Goal.objects.create(user=user, title='Apply', deadline=date(2025, 4, 1), category='Internships')
+
+    async def test_async_reads_match_sync_reads(self):
+        sync_client, async_client = Client(), AsyncClient()
+        for path in self.paths:
+            with self.subTest(path):
+                await caches['responses'].aclear()
+                expected = await sync_to_async(sync_client.get)(path)
+                await caches['responses'].aclear()
+                response = await async_client.get(path)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+                # DRF adds Allow; its absence shows the async view answered
+                self.assertIn('Allow', expected)
+                self.assertNotIn('Allow', response)
+
+    async def test_async_reads_negotiate_like_sync_reads(self):
+        sync_client, async_client = Client(), AsyncClient()
+        requests = [
+            ('/api/api/routines/?format=json', {}),
+            ('/api/api/expenses/summary/', {'Accept': 'application/json; indent=4'}),
+            ('/api/api/routines/by_day/?day=Mon', {'Accept': 'text/csv'}),
+            ('/api/api/events/?format=xml', {}),
+            ('/api/api/health/database/?format=json', {'Accept': 'application/json; indent=2'}),
+        ]
+        for path, headers in requests:
+            with self.subTest(path, **headers):
+                await caches['responses'].aclear()
+                expected = await sync_to_async(sync_client.get)(path, headers=headers)
+                await caches['responses'].aclear()
+                response = await async_client.get(path, headers=headers)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.get('Content-Type'), expected.get('Content-Type'))
+                if 'health' in path:
+                    # The probe's timing differs between requests; the indentation does not
+                    self.assertEqual(response.content.count(b'\n'), expected.content.count(b'\n'))
+                else:
+                    self.assertEqual(response.content, expected.content)
+
+    async def test_browsable_api_is_left_to_drf(self):
+        client = AsyncClient()
+        for path in ('/api/api/goals/?format=api', '/api/api/expenses/summary/', '/api/api/routines/by_day/?day=Mon'):
+            with self.subTest(path):
+                response = await client.get(path, headers={'Accept': 'text/html'})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response['Content-Type'].startswith('text/html'))
+                self.assertIn('Allow', response)
+
+    async def test_async_read_revalidates_and_follows_cursor(self):
+        client = AsyncClient()
+        response = await client.get('/api/api/expenses/?page_size=2')
+        not_modified = await client.get('/api/api/expenses/?page_size=2', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        next_page = await client.get(response.json()['next'])
+        self.assertEqual(len(next_page.json()['results']), 1)
+        self.assertIsNone(next_page.json()['next'])
+
+    async def test_writes_fall_through_to_drf(self):
+        client = AsyncClient()
+        response = await client.post(
+            '/api/api/expenses/', {'item': 'Tea', 'amount': '2.00', 'category': 'Food'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(await Expense.objects.acount(), 4)
+        response = await client.get('/api/api/health/database/')
+        self.assertEqual(response.json()['status'], 'healthy')
+
+    async def test_read_only_views_refuse_writes(self):
+        client = AsyncClient()
+        for path in ('/api/api/routines/by_day/?day=Mon', '/api/api/expenses/summary/'):
+            for method in (client.post, client.put, client.delete):
+                response = await method(path, {}, content_type='application/json')
+                self.assertEqual(response.status_code, 405)
+                self.assertIn('GET', response['Allow'])
+
+    async def test_api_errors_keep_their_status(self):
+        path = '/api/api/expenses/?cursor=not-a-cursor'
+        response = await AsyncClient().get(path)
+        self.assertEqual(response.status_code, 404)
+        expected = await sync_to_async(Client().get)(path)
+        self.assertEqual(expected.status_code, 404)
+        self.assertEqual(response.json(), expected.json())
+
+
+class TransferTests(TestCase):
+    """Exports stream the API representation; imports write it back in batches"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create(username='transfer')
+        self.client = APIClient()
+        Expense.objects.create(user=self.user, item='Lunch, large', amount='12.50', category='Food')
+        bus = Expense.objects.create(user=self.user, item='Bus "express"', amount='3.00', category='Transport')
+        bus.date = date(2024, 11, 5)
+        bus.save()
+        Routine.objects.create(user=self.user, title='Lecture', time='09:00', days=['Mon', 'Wed'], category='class')
+
+    def export(self, collection, output):
+        response = self.client.get(f'/api/api/{collection}/export/?output={output}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def listed(self, collection):
+        return sorted(self.client.get(f'/api/api/{collection}/').data['results'], key=lambda item: item['id'])
+
+    def test_ndjson_export_matches_the_api(self):
+        lines = self.export('expenses', 'ndjson').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.listed('expenses'))
+
+    def test_csv_export_matches_the_api(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('routines', 'csv'))))
+        expected = self.listed('routines')
+        self.assertEqual([row['title'] for row in rows], [item['title'] for item in expected])
+        self.assertEqual(rows[0]['days'], 'Mon;Wed')
+        rows = list(csv.DictReader(io.StringIO(self.export('expenses', 'csv'))))
+        self.assertEqual([row['item'] for row in rows], ['Lunch, large', 'Bus "express"'])
+
+    def test_round_trip_import(self):
+        for collection, output in [('expenses', 'ndjson'), ('routines', 'csv')]:
+            exported = self.export(collection, output)
+            content_type = 'application/x-ndjson' if output == 'ndjson' else 'text/csv'
+            response = self.client.post(
+                f'/api/api/{collection}/import/', exported, content_type=content_type
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+            self.assertEqual(response.data['created'], 2 if collection == 'expenses' else 1)
+        self.assertEqual(Expense.objects.count(), 4)
+        originals, copies = Expense.objects.order_by('pk')[:2], Expense.objects.order_by('pk')[2:]
+        self.assertEqual([e.date for e in copies], [e.date for e in originals])
+        november = ExpenseMonthlyRollup.objects.get(user=self.user, month=date(2024, 11, 1))
+        self.assertEqual((november.total, november.count), (Decimal('6.00'), 2))
+        copy = Routine.objects.order_by('pk').last()
+        self.assertEqual(copy.days, ['Mon', 'Wed'])
+        self.assertEqual(set(copy.day_entries.values_list('day', flat=True)), {'Mon', 'Wed'})
+        rollup_total = ExpenseMonthlyRollup.objects.filter(user=self.user).aggregate(total=Sum('total'))['total']
+        self.assertEqual(rollup_total, Decimal('31.00'))
+
+    def test_import_reports_bad_rows_and_keeps_good_ones(self):
+        body = 'item,amount,category\nPen,1.50,Books\nBroken,abc,Books\nCab,9.00,Nowhere\nTea,2.00,Food\n'
+        response = self.client.post('/api/api/expenses/import/?input=csv', body, content_type='text/plain')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 2))
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4])
+        self.assertEqual(Expense.objects.filter(item__in=['Pen', 'Tea']).count(), 2)
+
+    def test_import_keeps_dates_and_rejects_bad_ones(self):
+        body = 'item,amount,category,date\nPen,1.50,Books,2023-09-01\nTea,2.00,Food,\nCab,9.00,Transport,someday\n'
+        response = self.client.post('/api/api/expenses/import/?input=csv', body, content_type='text/csv')
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['line'], 4)
+        self.assertIn('date', response.data['errors'][0]['errors'])
+        self.assertEqual(Expense.objects.get(item='Pen').date, date(2023, 9, 1))
+        self.assertEqual(Expense.objects.get(item='Tea').date, date.today())  # auto_now_add
+
+    def test_empty_import(self):
+        response = self.client.post('/api/api/expenses/import/', '', content_type='text/csv')
+        self.assertEqual((response.status_code, response.data['created']), (200, 0))
+
+    def test_import_command_writes_bounded_batches(self):
+        records = ''.join(
+            json.dumps({'title': f'Goal {i}', 'deadline': '2030-01-01', 'category': 'Networking'}) + '\n'
+            for i in range(7)
+        )
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as handle:
+            handle.write(records)
+        self.addCleanup(os.remove, handle.name)
+        out = io.StringIO()
+        call_command('import_data', 'goals', handle.name, '--user', 'transfer', '--batch-size', '3', stdout=out)
+        self.assertIn('Imported 7 goals in 3 batch(es)', out.getvalue())
+        self.assertEqual(Goal.objects.filter(user=self.user).count(), 7)
+
+
+class FastListTests(TestCase):
+    """The values_list() fast path renders the same bytes as the serializers"""
+
+    def setUp(self):
+        self.client = APIClient()
+        user = User.objects.create(username='fast')
+        Routine.objects.create(user=user, title='Caf\u00e9 \u2028 "quotes"', time='07:05', days=['Mon'], category='class')
+        Routine.objects.create(user=user, title='Gym \\ </script>', time='18:30:15', days=[], category='fitness')
+        for amount in ('0.10', '12.5', '99999999.99', '-3'):
+            Expense.objects.create(user=user, item=f'Item \U0001f600 {amount}', amount=amount, category='Food')
+        Event.objects.create(
+            user=user, title='Fair \u2029', date=date(2025, 3, 1), time='noon', location='Gym',
+            category='Career', attendees=1200,
+        )
+        Goal.objects.create(user=user, title='Apply', description='', deadline=date(2025, 4, 1), category='Internships')
+
+    def get(self, path, fast, **headers):
+        caches['responses'].clear()
+        with override_settings(FAST_LIST_RESPONSES=fast):
+            response = self.client.get(path, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_pages_match_the_serializers(self):
+        paths = [f'/api/api/{collection}/?page_size=2' for collection in ('routines', 'expenses', 'events', 'goals')]
+        paths.append('/api/api/events/window/?from=2025-01-01&to=2025-12-31&page_size=2')
+        for path in paths:
+            while path:
+                with self.subTest(path):
+                    expected = self.get(path, fast=False)
+                    response = self.get(path, fast=True)
+                    self.assertEqual(response.content, expected.content)
+                    self.assertEqual(response['ETag'], expected['ETag'])
+                path = response.json()['next']
+
+    def test_pretty_and_browsable_renderings_match(self):
+        for headers in ({'Accept': 'application/json; indent=2'}, {'Accept': 'text/html'}):
+            with self.subTest(headers):
+                expected = self.get('/api/api/expenses/', fast=False, **headers)
+                response = self.get('/api/api/expenses/', fast=True, **headers)
+                if headers['Accept'] == 'text/html':
+                    # The pages differ only in their CSRF token
+                    self.assertIn('Item \U0001f600 0.10'.encode(), response.content)
+                    self.assertEqual(len(response.content), len(expected.content))
+                else:
+                    self.assertEqual(response.content, expected.content)
+
+    def test_responses_read_as_data(self):
+        response = self.get('/api/api/goals/', fast=True)
+        self.assertEqual(response.data['results'][0]['title'], 'Apply')
+        self.assertEqual(response.data, response.json())
+
+
+class BenchmarkBaselineTests(TestCase):
+    """Benchmark results are diffed against a saved baseline"""
+
+    def test_compare_results_flags_worse_metrics_only(self):
+        baseline = {'load': {'threads': 8, 'list': {
+            'requests_per_sec': 400.0, 'p95_ms': 20.0, 'p99_ms': 30.0, 'queries_per_request': 1.0, 'errors': 0,
+        }}}
+        results = {'load': {'threads': 8, 'list': {
+            'requests_per_sec': 300.0, 'p95_ms': 21.0, 'p99_ms': 50.0, 'queries_per_request': 2.0, 'errors': 3,
+        }}}
+        rows = {key: regressed for key, _, _, _, regressed in compare_results(baseline, results, tolerance=0.2)}
+        self.assertEqual(rows, {
+            'load.list.requests_per_sec': True,
+            'load.list.p95_ms': False,
+            'load.list.p99_ms': True,
+            'load.list.queries_per_request': True,
+            'load.list.errors': True,
+        })
+
+    def test_any_failed_request_fails_the_run(self):
+        baseline = {'load': {'delete': {'errors': 218}}, 'sqlite_profile': {'default': {'errors': 0}}}
+        results = {'load': {'delete': {'errors': 200}}, 'sqlite_profile': {'default': {'errors': 0}}}
+        rows = {key: regressed for key, _, _, _, regressed in compare_results(baseline, results)}
+        self.assertEqual(rows, {'load.delete.errors': True, 'sqlite_profile.default.errors': False})
+        self.assertEqual(failed_requests(results), ['load.delete.errors'])
+
+
+class SeedScaleTests(TestCase):
+    """seed_scale writes consistent, reproducible data and keeps the schema intact"""
+
+    sizes = {'users': 25, 'routines': 40, 'expenses': 2000, 'events': 60, 'goals': 30}
+
+    def seed(self, **options):
+        call_command('seed_scale', seed=7, end=date(2025, 6, 30), stdout=io.StringIO(), **self.sizes, **options)
+
+    def snapshot(self):
+        return {
+            'expenses': list(Expense.objects.order_by('pk').values_list('item', 'amount', 'category', 'date', 'created_at')),
+            'routines': list(Routine.objects.order_by('pk').values_list('title', 'time', 'days', 'category')),
+            'events': list(Event.objects.order_by('pk').values_list('title', 'date', 'time', 'rsvped', 'attendees')),
+            'goals': list(Goal.objects.order_by('pk').values_list('title', 'deadline', 'progress', 'status')),
+        }
+
+    def test_derived_tables_match_a_rebuild(self):
+        self.seed(drop_indexes=True)
+        self.assertEqual(User.objects.filter(username__startswith='seed_').count(), 25)
+        self.assertEqual(UserProfile.objects.count(), 25)
+        self.assertEqual(Expense.objects.count(), 2000)
+        self.assertEqual(
+            RoutineDay.objects.count(), sum(len(days) for days in Routine.objects.values_list('days', flat=True))
+        )
+        rollups = set(ExpenseMonthlyRollup.objects.values_list('user_id', 'category', 'month', 'total', 'count'))
+        totals = dict(UserProfile.objects.values_list('user_id', 'expense_total'))
+        rebuild_expense_rollups()
+        self.assertEqual(
+            set(ExpenseMonthlyRollup.objects.values_list('user_id', 'category', 'month', 'total', 'count')), rollups
+        )
+        self.assertEqual(dict(UserProfile.objects.values_list('user_id', 'expense_total')), totals)
+        # A few users own most of the rows
+        counts = sorted(Expense.objects.values('user').annotate(n=Count('id')).values_list('n', flat=True))
+        self.assertGreater(sum(counts[-5:]), 2000 * 0.4)
+        response = APIClient().get('/api/api/expenses/?page_size=5')
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_same_seed_same_rows(self):
+        self.seed()
+        first = self.snapshot()
+        User.objects.filter(username__startswith='seed_').delete()
+        self.seed()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_dropped_indexes_are_rebuilt(self):
+        def indexes():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name")
+                return cursor.fetchall()
+
+        before = indexes()
+        self.seed(drop_indexes=True)
+        self.assertEqual(indexes(), before)
+        # The search index is rebuilt from the rows written without its triggers
+        expense = Expense.objects.order_by('-pk').first()
+        found = search(expense.item, user_id=expense.user_id, collections=['expenses'], limit=MAX_LIMIT)
+        self.assertTrue(found)
+        self.assertEqual({result['item']['item'] for result in found}, {expense.item})
+
+
+class EventWindowTests(TestCase):
+    """Events carry a parsed start time, derive their timing per query and are listed by time window"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='planner')
+        self.today = date.today()
+        self.events = {}
+        for offset, time_text in ((-1, '6:00 PM'), (0, '7pm - 9pm'), (0, '9:15 am'), (1, 'TBA'), (9, 'noon')):
+            event = Event.objects.create(
+                user=self.user, title=f'{offset} {time_text}', date=self.today + timedelta(days=offset),
+                time=time_text, location='Quad', category='Sports'
+            )
+            self.events[event.title] = event
+        self.client = APIClient()
+
+    def window(self, **params):
+        caches['responses'].clear()
+        return self.client.get('/api/api/events/window/', params)
+
+    def test_parse_event_time(self):
+        for text, expected in [
+            ('3:30 PM', time(15, 30)), ('12:00 PM', time(12)), ('12 am', time(0)), ('19:05', time(19, 5)),
+            ('7pm - 9pm', time(19)), ('9.45 a.m.', time(9, 45)), ('Noon', time(12)), ('TBA', None),
+            ('13 PM', None), ('25:00', None), ('', None),
+        ]:
+            with self.subTest(text):
+                self.assertEqual(parse_event_time(text), expected)
+
+    def test_starts_at_follows_date_and_time(self):
+        event = self.events['-1 6:00 PM']
+        self.assertEqual(event.starts_at.time(), time(18))
+        self.assertEqual(self.events['1 TBA'].starts_at.time(), time(0))
+        event.time = '8:30 AM'
+        event.date = self.today
+        event.save()
+        event.refresh_from_db()
+        self.assertEqual((event.starts_at.date(), event.starts_at.time()), (self.today, time(8, 30)))
+        # bulk_create, used by bulk API creates and imports, fills it in too
+        response = self.client.post('/api/api/events/', [{
+            'title': 'Bulk', 'date': '2025-05-01', 'time': '5 PM', 'location': 'Hall', 'category': 'Career',
+        }], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data[0]['starts_at'], '2025-05-01T17:00:00Z')
+
+    def test_timing_is_derived(self):
+        timings = dict(Event.objects.values_list('title', 'timing'))
+        self.assertEqual(timings, {
+            '-1 6:00 PM': 'past', '0 7pm - 9pm': 'today', '0 9:15 am': 'today', '1 TBA': 'upcoming',
+            '9 noon': 'upcoming',
+        })
+        # Unannotated instances compute it, and a fixed date can be given
+        self.assertEqual(Event.objects.get(title='1 TBA').timing, 'upcoming')
+        self.assertEqual(self.events['1 TBA'].timing, 'upcoming')
+        tomorrow = Event.objects.with_timing(self.today + timedelta(days=1)).get(title='1 TBA')
+        self.assertEqual(tomorrow.timing, 'today')
+
+    def test_window(self):
+        response = self.window(**{'from': self.today.isoformat(), 'to': (self.today + timedelta(days=1)).isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event['title'] for event in response.json()['results']], ['0 9:15 am', '0 7pm - 9pm', '1 TBA']
+        )
+        start = datetime.combine(self.today, time(12)).isoformat() + 'Z'
+        response = self.window(**{'from': start})
+        self.assertEqual([event['title'] for event in response.json()['results']], ['0 7pm - 9pm', '1 TBA'])
+        for params in ({}, {'from': 'soon'}, {'from': '2025-05-02', 'to': '2025-05-01'}):
+            with self.subTest(params):
+                self.assertEqual(self.window(**params).status_code, 400)
+
+
+class ScheduleTests(TestCase):
+    """The week is expanded into slots, overlaps come from an interval tree and the result is cached"""
+
+    monday = date(2025, 3, 3)
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['responses'].clear()
+        self.user = User.objects.create(username='scheduler')
+        self.lecture = Routine.objects.create(
+            user=self.user, title='Lecture', time='09:00', days=['Mon', 'Wed'], category='class'
+        )
+        self.talk = Event.objects.create(
+            user=self.user, title='Talk', date=self.monday, time='9:30 AM - 10:30 AM', location='Hall',
+            category='Academic'
+        )
+        Event.objects.create(
+            user=self.user, title='Open day', date=self.monday + timedelta(days=2), time='TBA', location='Quad',
+            category='Career'
+        )
+        self.client = APIClient()
+
+    def week(self, start=None):
+        return self.client.get('/api/api/schedule/week/', {'start': (start or self.monday).isoformat()})
+
+    def test_interval_tree_matches_pairwise_comparison(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            intervals = []
+            for value in range(rng.randrange(40)):
+                start = rng.randrange(100)
+                intervals.append((start, start + rng.randrange(1, 20), value))
+            tree = IntervalTree(intervals)
+            for _ in range(10):
+                start = rng.randrange(-5, 110)
+                end = start + rng.randrange(1, 30)
+                expected = [value for begin, finish, value in sorted(intervals) if begin < end and finish > start]
+                self.assertEqual(tree.overlapping(start, end), expected)
+
+    def test_week_slots_and_conflicts(self):
+        # Any day of the week picks the same week
+        response = self.week(self.monday + timedelta(days=4))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['start'], data['end']), ('2025-03-03', '2025-03-10'))
+        slots = {slot['key']: slot for slot in data['slots']}
+        lecture, talk = f'routine:{self.lecture.pk}:2025-03-03', f'event:{self.talk.pk}:2025-03-03'
+        self.assertEqual(slots[lecture]['conflicts'], [talk])
+        self.assertEqual(slots[talk]['conflicts'], [lecture])
+        self.assertEqual(slots[talk]['end'], '2025-03-03T10:30:00+00:00')
+        wednesday = [slot for slot in data['slots'] if slot['date'] == '2025-03-05']
+        self.assertEqual([(slot['title'], slot['all_day'], slot['conflicts']) for slot in wednesday], [
+            ('Open day', True, []), ('Lecture', False, []),
+        ])
+        self.assertEqual(data['conflict_count'], 1)
+        self.assertEqual(self.week(date(2025, 3, 10)).json()['conflict_count'], 0)
+
+    def test_week_is_cached_until_a_write(self):
+        self.week()
+        # Only the current user lookup remains
+        with self.assertNumQueries(1):
+            cached = self.week()
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                user=self.user, title='Lunch talk', date=self.monday, time='12:00 PM', location='Cafe',
+                category='Career'
+            )
+        self.assertEqual(len(self.week().json()['slots']), len(cached.json()['slots']) + 1)
+
+    def test_create_reports_conflicts(self):
+        event = {
+            'title': 'Fair', 'date': '2025-03-05', 'time': '9:45 AM', 'location': 'Gym', 'category': 'Career',
+        }
+        response = self.client.post('/api/api/events/?conflicts=1', event, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [(conflict['date'], conflict['slot']['title']) for conflict in response.data['conflicts']],
+            [('2025-03-05', 'Lecture')]
+        )
+        self.assertNotIn('conflicts', self.client.post('/api/api/events/', event, format='json').data)
+        routine = {'title': 'Gym', 'time': '10:00', 'days': ['Mon', 'Tue'], 'category': 'gym'}
+        response = self.client.post('/api/api/routines/?conflicts=1&start=2025-03-04', routine, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [(conflict['date'], conflict['slot']['title']) for conflict in response.data['conflicts']],
+            [('2025-03-03', 'Talk')]
+        )
+
+
+class GoalStatsTests(TestCase):
+    """Goal statistics come from one conditional-aggregation query"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.today = date.today()
+        self.user = User.objects.create(username='planner')
+        other = User.objects.create(username='other')
+        for title, days, status, progress, completed in [
+            ('Overdue', -1, 'current', 40, False),
+            ('Soon', 3, 'current', 60, False),
+            ('Done', -5, 'pending', 100, True),
+        ]:
+            Goal.objects.create(
+                user=self.user, title=title, deadline=self.today + timedelta(days=days), category='Internships',
+                status=status, progress=progress, completed=completed
+            )
+        Goal.objects.create(
+            user=self.user, title='Later', deadline=self.today + timedelta(days=30), category='Interviews',
+            status='pending'
+        )
+        Goal.objects.create(
+            user=other, title='Theirs', deadline=self.today - timedelta(days=1), category='Internships'
+        )
+
+    def test_stats(self):
+        with self.assertNumQueries(1):
+            stats = goal_stats(Goal.objects.filter(user=self.user), self.today)
+        internships = stats['by_category']['Internships']
+        self.assertEqual({key: value for key, value in internships.items() if key != 'by_status'}, {
+            'count': 3, 'completed': 1, 'completed_fraction': 0.3333, 'average_progress': 66.7,
+            'overdue': 1, 'due_this_week': 1,
+        })
+        self.assertEqual(internships['by_status'], {
+            'current': {
+                'count': 2, 'completed': 0, 'completed_fraction': 0.0, 'average_progress': 50.0,
+                'overdue': 1, 'due_this_week': 1,
+            },
+            'pending': {
+                'count': 1, 'completed': 1, 'completed_fraction': 1.0, 'average_progress': 100.0,
+                'overdue': 0, 'due_this_week': 0,
+            },
+        })
+        self.assertEqual(stats['by_category']['Networking']['count'], 0)
+        self.assertIsNone(stats['by_category']['Networking']['average_progress'])
+        self.assertEqual(
+            [stats['overall'][key] for key in ('count', 'completed', 'average_progress', 'overdue', 'due_this_week')],
+            [4, 1, 50.0, 1, 1]
+        )
+        self.assertEqual(stats['overall']['by_status']['pending']['count'], 2)
+
+    def test_today_is_the_local_date(self):
+        with mock.patch('django.utils.timezone.localdate', return_value=self.today - timedelta(days=2)):
+            stats = goal_stats(Goal.objects.filter(user=self.user))
+        self.assertEqual([stats['overall'][key] for key in ('overdue', 'due_this_week')], [0, 2])
+
+    def test_endpoint_is_scoped_to_the_current_user(self):
+        response = APIClient().get('/api/api/goals/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['overall']['count'], 4)
+        self.assertEqual(response.data['by_category']['Internships']['overdue'], 1)
+
+
+class SearchTests(TestCase):
+    """Full-text search is ranked, prefix-matched, scoped per user and kept in step by triggers"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='searcher')
+        self.other = User.objects.create(username='other')
+        self.event = Event.objects.create(
+            user=self.user, title='Chess tournament', date=date.today(), time='noon',
+            location='Student Union', category='Cultural'
+        )
+        Event.objects.create(
+            user=self.user, title='Career fair', date=date.today(), time='noon', location='Chess club room',
+            category='Career'
+        )
+        self.goal = Goal.objects.create(
+            user=self.user, title='Learn openings', description='Study chess theory',
+            deadline=date.today(), category='Networking'
+        )
+        Expense.objects.create(user=self.other, item='Chess set', amount='20.00', category='Other')
+        Routine.objects.create(user=self.user, title='Café study', time='08:00', days=['Mon'], category='study')
+        self.client = APIClient()
+
+    def found(self, text, **kwargs):
+        return [(result['type'], result['item'].get('title') or result['item'].get('item'))
+                for result in search(text, **kwargs)]
+
+    def test_ranking_prefixes_and_users(self):
+        # A title match outranks a location or description match
+        found = self.found('ches', user_id=self.user.pk)
+        self.assertEqual(found[0], ('events', 'Chess tournament'))
+        self.assertEqual(sorted(found[1:]), [('events', 'Career fair'), ('goals', 'Learn openings')])
+        self.assertEqual(self.found('chess set'), [('expenses', 'Chess set')])
+        self.assertEqual(self.found('cafe'), [('routines', 'Café study')])
+        self.assertEqual(self.found('ches', collections=['goals']), [('goals', 'Learn openings')])
+        self.assertEqual(self.found('"); DROP TABLE x; --'), [])
+        self.assertEqual(self.found('*'), [])
+
+    def test_triggers_follow_writes(self):
+        Event.objects.filter(pk=self.event.pk).update(title='Go tournament')
+        self.assertEqual(self.found('tourn'), [('events', 'Go tournament')])
+        self.goal.delete()
+        Goal.objects.bulk_create([
+            Goal(user=self.user, title='Chess rating 1500', deadline=date.today(), category='Networking')
+        ])
+        self.assertEqual(self.found('rating'), [('goals', 'Chess rating 1500')])
+        self.assertEqual(self.found('theory'), [])
+
+    def test_missing_triggers_are_restored(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER college_lifeapp_event_fts_au')
+        Event.objects.filter(pk=self.event.pk).update(title='Go tournament')
+        self.assertEqual(ensure_search_triggers(), ['events'])
+        self.assertEqual(ensure_search_triggers(), [])
+        self.assertEqual(self.found('go'), [('events', 'Go tournament')])
+        Event.objects.filter(pk=self.event.pk).update(title='Bridge tournament')
+        self.assertEqual(self.found('bridge'), [('events', 'Bridge tournament')])
+
+    def test_endpoint(self):
+        response = self.client.get('/api/api/search/', {'q': 'chess', 'types': 'events,expenses'})
+        self.assertEqual(response.status_code, 200)
+        # Scoped to the current user, so the other user's expense is left out
+        self.assertEqual([result['id'] for result in response.data['results']], [
+            self.event.pk, Event.objects.get(title='Career fair').pk
+        ])
+        self.assertEqual(response.data['results'][0]['item'], EventSerializer(self.event).data)
+        for params in ({}, {'q': 'chess', 'types': 'people'}, {'q': 'chess', 'limit': '0'}):
+            self.assertEqual(self.client.get('/api/api/search/', params).status_code, 400)
+
+    def test_admin_search_uses_the_index(self):
+        model_admin = admin.site._registry[Event]
+        request = RequestFactory().get('/admin/college_lifeapp/event/', {'q': 'union'})
+        queryset, duplicates = model_admin.get_search_results(request, Event.objects.all(), 'union')
+        self.assertFalse(duplicates)
+        self.assertEqual(list(queryset), [self.event])
+        self.assertIn('college_lifeapp_event_fts', str(queryset.query))
+        self.assertNotIn('LIKE', str(queryset.query))
+        # Fields outside the index still match
+        queryset, _ = admin.site._registry[Expense].get_search_results(request, Expense.objects.all(), 'othe')
+        self.assertEqual(queryset.count(), 1)
+
+
+class StaticFilesLayerTests(TestCase):
+    """Static files and the SPA index are answered in front of Django"""
+    asset = '/static/frontend/assets/index-BPSjuoxK.js'
+
+    def setUp(self):
+        django_app = get_wsgi_application()
+        self.django_calls = []
+
+        def counting(environ, start_response):
+            self.django_calls.append(environ['PATH_INFO'])
+            # Like the test client, keep Django from closing the test transaction's connection
+            request_started.disconnect(close_old_connections)
+            try:
+                return django_app(environ, start_response)
+            finally:
+                request_started.connect(close_old_connections)
+
+        self.layer = StaticFilesLayer(counting)
+
+    def get(self, path, **headers):
+        environ = {'PATH_INFO': path, 'HTTP_HOST': 'testserver', **headers}
+        setup_testing_defaults(environ)
+        captured = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            captured['status'] = int(status.split()[0])
+            captured['headers'] = dict(response_headers)
+
+        body = b''.join(self.layer(environ, start_response))
+        return captured['status'], captured['headers'], body
+
+    def static_dir(self, files):
+        """Serve ``files`` (name -> bytes) from a temporary project static directory"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name, body in files.items():
+            path = os.path.join(directory, 'static', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as handle:
+                handle.write(body)
+        return override_settings(BASE_DIR=directory, STATICFILES_DIRS=[os.path.join(directory, 'static')])
+
+    def test_hashed_asset_is_immutable_and_revalidates(self):
+        status_code, headers, body = self.get(self.asset)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers['Cache-Control'], IMMUTABLE)
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        self.assertTrue(headers['Content-Type'].startswith('text/javascript'))
+        status_code, _, body = self.get(self.asset, HTTP_IF_NONE_MATCH=headers['ETag'])
+        self.assertEqual((status_code, body), (304, b''))
+        self.assertEqual(self.django_calls, [])
+
+    def test_unhashed_asset_revalidates(self):
+        name = 'frontend/assets/logo.svg'
+        with self.static_dir({name: b'<svg/>'}):
+            status_code, headers, _ = self.get(f'/static/{name}')
+        self.assertEqual((status_code, headers['Cache-Control']), (200, 'no-cache'))
+
+    def test_precompressed_variant_is_negotiated(self):
+        # Variants are build output written by compress_static, not committed files
+        name = 'frontend/build/app.0123456789ab.js'
+        with self.static_dir({name: b'console.log("college life");\n' * 100}):
+            call_command('compress_static', stdout=io.StringIO())
+            path = f'/static/{name}'
+            _, plain, body = self.get(path)
+            _, compressed, gzipped = self.get(path, HTTP_ACCEPT_ENCODING='gzip, deflate')
+            _, refused, _ = self.get(path, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertEqual(gzip.decompress(gzipped), body)
+        self.assertNotIn('Content-Encoding', refused)
+
+    def test_spa_index_is_rendered_once(self):
+        status_code, headers, first = self.get('/planner/week')
+        self.assertEqual(status_code, 200)
+        status_code, cached_headers, second = self.get('/settings')
+        self.assertEqual((status_code, second), (200, first))
+        self.assertEqual(self.django_calls, ['/planner/week'])
+        self.assertEqual(cached_headers['X-Frame-Options'], headers['X-Frame-Options'])
+        status_code, _, _ = self.get('/', HTTP_IF_NONE_MATCH=cached_headers['ETag'])
+        self.assertEqual(status_code, 304)
+
+    def test_missing_files_and_api_paths(self):
+        self.assertEqual(self.get('/static/frontend/assets/missing.js')[0], 404)
+        status_code, _, _ = self.get('/api/api/health/database/')
+        self.assertEqual(status_code, 200)
+        self.assertEqual(self.django_calls, ['/api/api/health/database/'])
@@ -0,0 +1,289 @@
+"""
+Bulk export and import for the College Life App.
+
+Exports stream rows straight from a chunked database cursor, encoded as
+CSV or NDJSON in the same representation the API returns, so memory stays
+flat whatever the row count. Imports parse their input incrementally and
+write it in bounded ``bulk_create`` batches, one transaction per batch.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework import serializers
+
+from .aggregation import record_expenses
+from .conditional import bump_model_versions
+from .fast_json import fast_list_enabled, get_list_encoder
+from .models import Event, Expense, Goal, Routine, RoutineDay
+from .serializers import EventSerializer, ExpenseSerializer, GoalSerializer, RoutineSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+# Encoded rows are sent in buffers of about this many bytes
+EXPORT_BUFFER_BYTES = 64 * 1024
+IMPORT_BATCH_SIZE = 500
+# Row errors kept in an import report; the count is always complete
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+LIST_SEPARATOR = ';'
+# Fields the API sets itself on create but an import keeps from its input,
+# so an export imports back unchanged; rows without them get the API's value
+KEPT_FIELDS = {'expenses': ('date',)}
+
+
+def sync_routine_days(routines):
+    RoutineDay.sync_for(routines)
+
+
+# collection -> (model, serializer class, hook for derived data that bulk_create skips)
+COLLECTIONS = {
+    'expenses': (Expense, ExpenseSerializer, record_expenses),
+    'events': (Event, EventSerializer, None),
+    'goals': (Goal, GoalSerializer, None),
+    'routines': (Routine, RoutineSerializer, sync_routine_days),
+}
+
+
+class CSVEncoder:
+    """Encode API representations as CSV lines; lists are joined with LIST_SEPARATOR"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def header(self):
+        return self._line(self.fields)
+
+    def encode(self, data):
+        return self._line([self._cell(data[field]) for field in self.fields])
+
+    def _cell(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, list):
+            return LIST_SEPARATOR.join(str(item) for item in value)
+        return value
+
+    def _line(self, values):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(values)
+        return self.buffer.getvalue()
+
+
+class NDJSONEncoder:
+    """Encode API representations as one JSON object per line"""
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def header(self):
+        return ''
+
+    def encode(self, data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+ENCODERS = {'csv': CSVEncoder, 'ndjson': NDJSONEncoder}
+
+
+class ExportBuffer:
+    """Collect encoded rows and hand them out in chunks of about EXPORT_BUFFER_BYTES"""
+
+    def __init__(self, collection, output):
+        serializer = COLLECTIONS[collection][1]()
+        self.encoder = ENCODERS[output](list(serializer.fields))
+        # Rows come from values_list() when the fast list encoder supports the serializer
+        list_encoder = get_list_encoder(type(serializer)) if fast_list_enabled() else None
+        if list_encoder is not None:
+            self.columns = list_encoder.columns
+            self.represent = list_encoder.row_converter()
+        else:
+            self.columns = None
+            self.represent = serializer.to_representation
+        self.parts = [self.encoder.header()]
+        self.size = 0
+
+    def rows(self, queryset):
+        """The export query: primary key order, as tuples on the fast path"""
+        queryset = queryset.order_by('pk')
+        return queryset if self.columns is None else queryset.values_list(*self.columns)
+
+    def add(self, row):
+        """Encode one row; return a chunk to send once the buffer is full, else None"""
+        line = self.encoder.encode(self.represent(row))
+        self.parts.append(line)
+        self.size += len(line)
+        if self.size >= EXPORT_BUFFER_BYTES:
+            return self.flush()
+        return None
+
+    def flush(self):
+        chunk = ''.join(self.parts).encode('utf-8')
+        self.parts, self.size = [], 0
+        return chunk
+
+
+def iter_export(queryset, collection, output='csv'):
+    """
+    Yield the encoded export of ``queryset`` in chunks of about EXPORT_BUFFER_BYTES.
+
+    Rows are read in primary key order, EXPORT_CHUNK_SIZE at a time, from
+    one cursor, so the export is a consistent snapshot and never holds more
+    than one chunk of rows.
+    """
+    buffer = ExportBuffer(collection, output)
+    for row in buffer.rows(queryset).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk = buffer.add(row)
+        if chunk:
+            yield chunk
+    yield buffer.flush()
+
+
+async def aiter_export(queryset, collection, output='csv'):
+    """Async counterpart of iter_export, so ASGI responses stream instead of buffering"""
+    buffer = ExportBuffer(collection, output)
+    async for row in buffer.rows(queryset).aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk = buffer.add(row)
+        if chunk:
+            yield chunk
+    yield buffer.flush()
+
+
+def iter_records(lines, input_format, collection):
+    """
+    Parse text lines into API-style records, one at a time.
+
+    Yields:
+        tuple: (line number, record dict or None, parse error or None)
+    """
+    if input_format == 'ndjson':
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, None, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(record, dict):
+                yield number, None, 'Each line must be a JSON object'
+                continue
+            yield number, record, None
+        return
+
+    list_fields = {
+        name for name, field in COLLECTIONS[collection][1]().fields.items()
+        if isinstance(field, (serializers.JSONField, serializers.ListField))
+    }
+    reader = csv.DictReader(lines)
+    for record in reader:
+        if None in record:
+            yield reader.line_num, None, 'Row has more cells than the header'
+            continue
+        # Empty cells fall back to the field default, as if the key were omitted
+        record = {key: value for key, value in record.items() if value not in ('', None)}
+        for name in list_fields & record.keys():
+            record[name] = [item for item in record[name].split(LIST_SEPARATOR) if item]
+        yield reader.line_num, record, None
+
+
+def read_kept_fields(model, names, record):
+    """Return the KEPT_FIELDS values present in ``record``, converted by their model fields"""
+    values = {}
+    for name in names:
+        if record.get(name) not in (None, ''):
+            field = model._meta.get_field(name)
+            try:
+                values[name] = field.to_python(record[name])
+            except ValidationError as e:
+                raise ValidationError({name: e.messages})
+    return values
+
+
+def restore_kept_fields(objects, values, batch_size):
+    """Write each object's kept values over the ones set on insert"""
+    changed = []
+    fields = set()
+    for obj, kept in zip(objects, values):
+        if kept:
+            for name, value in kept.items():
+                setattr(obj, name, value)
+            fields.update(kept)
+            changed.append(obj)
+    if changed:
+        type(changed[0]).objects.bulk_update(changed, sorted(fields), batch_size=batch_size)
+
+
+def import_records(lines, input_format, collection, user, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate and insert records parsed from ``lines`` for ``user``.
+
+    Each batch is validated together and written with one bulk_create inside
+    its own transaction, so a large import never holds the write lock for
+    long and a failure only rolls back the batch being written. Invalid rows
+    are skipped and reported by line number. KEPT_FIELDS are written after
+    the insert, since ``auto_now_add`` would replace them.
+
+    Returns:
+        dict: created, failed and batch counts, plus the first row errors
+    """
+    model, serializer_class, after_create = COLLECTIONS[collection]
+    kept_fields = KEPT_FIELDS.get(collection, ())
+    report = {'created': 0, 'failed': 0, 'batches': 0, 'errors': []}
+
+    def fail(line, errors):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line, 'errors': errors})
+
+    records = iter_records(lines, input_format, collection)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        parsed = []
+        kept = {}
+        for line, record, error in batch:
+            if error:
+                fail(line, error)
+                continue
+            try:
+                kept[line] = read_kept_fields(model, kept_fields, record)
+            except ValidationError as e:
+                fail(line, e.message_dict)
+                continue
+            parsed.append((line, record))
+        serializer = serializer_class(data=[record for _, record in parsed], many=True)
+        if not serializer.is_valid():
+            # A list serializer keeps no data when any item fails, so report
+            # the failures and validate the remaining rows again
+            for (line, _), errors in zip(parsed, serializer.errors):
+                if errors:
+                    fail(line, errors)
+            parsed = [item for item, errors in zip(parsed, serializer.errors) if not errors]
+            serializer = serializer_class(data=[record for _, record in parsed], many=True)
+            serializer.is_valid(raise_exception=True)
+        valid = [model(user=user, **data) for data in serializer.validated_data]
+        if not valid:
+            continue
+        with transaction.atomic():
+            created = model.objects.bulk_create(valid, batch_size=batch_size)
+            if kept_fields:
+                restore_kept_fields(created, [kept[line] for line, _ in parsed], batch_size)
+            if after_create is not None:
+                after_create(created)
+            bump_model_versions(model, user.pk)
+        report['created'] += len(created)
+        report['batches'] += 1
+    return report
@@ -2,7 +2,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     UserProfileViewSet, RoutineViewSet, ExpenseViewSet, 
-    EventViewSet, GoalViewSet, DatabaseHealthView
+    EventViewSet, GoalViewSet, DashboardView, ScheduleWeekView, SearchView, DatabaseHealthView, MetricsView,
+    CacheStatsView
 )
 
 router = DefaultRouter()
@@ -14,5 +15,10 @@ router.register(r'goals', GoalViewSet, basename='goal')
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('api/schedule/week/', ScheduleWeekView.as_view(), name='schedule-week'),
+    path('api/search/', SearchView.as_view(), name='search'),
     path('api/health/database/', DatabaseHealthView.as_view(), name='database-health'),
+    path('api/health/metrics/', MetricsView.as_view(), name='metrics'),
+    path('api/health/cache/', CacheStatsView.as_view(), name='cache-health'),
 ]
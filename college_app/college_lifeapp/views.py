@@ -3,21 +3,423 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
+from django.conf import settings
 from django.db import DatabaseError, transaction
+from django.db.models import Case, F, Value, When
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.core.exceptions import ValidationError
-from .models import UserProfile, Routine, User, Event, Expense, Goal
-from .serializers import UserProfileSerializer, RoutineSerializer, ExpenseSerializer, EventSerializer, GoalSerializer
+from .models import UserProfile, Routine, RoutineDay, User, Event, Expense, Goal
+from .serializers import (
+    UserProfileSerializer, RoutineSerializer, ExpenseSerializer, ExpenseSummarySerializer, EventSerializer,
+    GoalSerializer,
+)
 from django.views.generic import TemplateView
-from .db_utils import check_database_connection, get_database_info, safe_db_operation
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from .aggregation import GROUP_BY_TRUNC, expense_summary, record_expenses
+from .conditional import ConditionalGetMixin, bump_model_versions, conditional_get
+from .dashboard import get_dashboard
+from .db_utils import (
+    cached_connection_check, check_database_connection, get_database_info, get_sqlite_stats,
+    get_table_row_estimates, safe_db_operation, update_returning,
+)
+from .metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, get_lock_stats, get_query_latency_percentiles, render_metrics,
+)
+from .response_cache import get_cache_info
+from .fast_json import fast_list_enabled, get_list_encoder
+from .goals import goal_stats
+from .schedule import find_conflicts, get_week
+from .search import DEFAULT_LIMIT, MAX_LIMIT, SEARCH_INDEXES, search
+from .transfer import FORMATS, aiter_export, import_records, iter_export
+import codecs
 import logging
 
 logger = logging.getLogger(__name__)
 
-class UserProfileViewSet(viewsets.ModelViewSet):
+
+def get_current_user(request):
+    """Return the user that owns data created by this request"""
+    # In production, use request.user
+    return safe_db_operation(lambda: User.objects.first(), None)
+
+
+def parse_day_param(query_params):
+    """
+    Read the ``day`` query parameter.
+    
+    Returns:
+        tuple: (day code or None, error message or None)
+    """
+    day = query_params.get('day')
+    if not day:
+        return None, 'Day parameter required'
+    if day not in Routine.DAY_CODES:
+        return None, f"Day must be one of: {', '.join(Routine.DAY_CODES)}"
+    return day, None
+
+
+def routines_for_day(queryset, day):
+    """Filter routines to one day, served from the indexed day table"""
+    return queryset.filter(day_entries__day=day).order_by('day_entries__time')
+
+
+def parse_summary_params(query_params):
+    """
+    Read the ``start``, ``end`` and ``group_by`` query parameters of the expense summary.
+    
+    Returns:
+        tuple: (keyword arguments for expense_summary or None, error message or None)
+    """
+    start = query_params.get('start')
+    end = query_params.get('end')
+    group_by = query_params.get('group_by', 'category')
+    try:
+        start = parse_date(start) if start else None
+        end = parse_date(end) if end else None
+    except ValueError:
+        start = end = None
+    if (query_params.get('start') and start is None) or (query_params.get('end') and end is None):
+        return None, 'Dates must be in YYYY-MM-DD format'
+    if group_by != 'category' and group_by not in GROUP_BY_TRUNC:
+        return None, f"group_by must be one of: category, {', '.join(GROUP_BY_TRUNC)}"
+    return {'start': start, 'end': end, 'group_by': group_by}, None
+
+
+DEFAULT_WINDOW_DAYS = 7
+
+
+def parse_window_bound(value, end=False):
+    """
+    Read one bound of an event window as an aware datetime.
+    
+    A date stands for the start of that day, or for the start of the next
+    day when it ends the window, so date windows include their last day.
+    """
+    try:
+        day = parse_date(value)
+        if day is not None:
+            moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+        else:
+            moment = parse_datetime(value)
+    except ValueError:
+        return None
+    if moment is None:
+        return None
+    if settings.USE_TZ and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.get_default_timezone())
+    return moment
+
+
+def parse_window_params(query_params):
+    """
+    Read the ``from`` and ``to`` query parameters of the event window.
+    
+    ``to`` defaults to DEFAULT_WINDOW_DAYS after ``from``.
+    
+    Returns:
+        tuple: ((start, end) or None, error message or None)
+    """
+    if not query_params.get('from'):
+        return None, 'from parameter required'
+    start = parse_window_bound(query_params['from'])
+    if query_params.get('to'):
+        end = parse_window_bound(query_params['to'], end=True)
+    else:
+        end = start and start + timedelta(days=DEFAULT_WINDOW_DAYS)
+    if start is None or end is None:
+        return None, 'from and to must be dates (YYYY-MM-DD) or ISO 8601 datetimes'
+    if end <= start:
+        return None, 'to must be after from'
+    return (start, end), None
+
+
+def parse_week_param(query_params):
+    """
+    Read the ``start`` query parameter of the weekly schedule; any day picks its week.
+    
+    Returns:
+        tuple: (date or None, error message or None)
+    """
+    start = query_params.get('start')
+    if not start:
+        return timezone.localdate(), None
+    try:
+        day = parse_date(start)
+    except ValueError:
+        day = None
+    if day is None:
+        return None, 'start must be in YYYY-MM-DD format'
+    return day, None
+
+
+def parse_search_params(query_params):
+    """
+    Read the ``q``, ``types`` and ``limit`` query parameters of the search endpoint.
+    
+    Returns:
+        tuple: (keyword arguments for search or None, error message or None)
+    """
+    text = query_params.get('q', '').strip()
+    if not text:
+        return None, 'q parameter required'
+    collections = None
+    if query_params.get('types'):
+        collections = [name.strip() for name in query_params['types'].split(',') if name.strip()]
+        unknown = [name for name in collections if name not in SEARCH_INDEXES]
+        if unknown or not collections:
+            return None, f"types must be a comma-separated list of: {', '.join(SEARCH_INDEXES)}"
+    try:
+        limit = int(query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        return None, f'limit must be between 1 and {MAX_LIMIT}'
+    return {'text': text, 'collections': collections, 'limit': limit}, None
+
+
+def database_health_data(is_connected, error, age):
+    """
+    Build the plain database health payload.
+    
+    Returns:
+        tuple: (response data, HTTP status code)
+    """
+    response_data = {
+        'status': 'healthy' if is_connected else 'unhealthy',
+        'connected': is_connected,
+        'checked_seconds_ago': age,
+        'database_info': get_database_info(),
+    }
+    if error:
+        response_data['error'] = error
+    status_code = status.HTTP_200_OK if is_connected else status.HTTP_503_SERVICE_UNAVAILABLE
+    return response_data, status_code
+
+
+class BulkCreateMixin:
+    """
+    Accept a JSON list on create and insert it with a single bulk_create.
+    
+    Items are validated together with ``many=True``; if any item is invalid
+    nothing is written and the errors are reported per item index. Valid
+    batches are written inside one transaction with the owner resolved once.
+    """
+    bulk_batch_size = 500
+    bulk_max_items = 5000
+    
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        return super().create(request, *args, **kwargs)
+    
+    def bulk_create(self, request):
+        name = type(self).__name__
+        if len(request.data) > self.bulk_max_items:
+            return Response(
+                {'error': f'At most {self.bulk_max_items} items can be created per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, list):
+                errors = [{'index': index, 'errors': item} for index, item in enumerate(errors) if item]
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        model = self.get_queryset().model
+        objects = [model(user=user, **item) for item in serializer.validated_data]
+        try:
+            with transaction.atomic():
+                created = model.objects.bulk_create(objects, batch_size=self.bulk_batch_size)
+                self.perform_bulk_create(created)
+                bump_model_versions(model, user.pk)
+        except DatabaseError as e:
+            logger.error(f"Database error in {name}.bulk_create: {str(e)}")
+            return Response(
+                {'error': 'Database error occurred while creating items'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response(self.get_serializer(created, many=True).data, status=status.HTTP_201_CREATED)
+    
+    def perform_bulk_create(self, instances):
+        """Hook for derived data that post_save handlers would normally maintain"""
+
+
+class TransferMixin:
+    """
+    Stream the collection out as CSV or NDJSON and import it back in batches.
+    
+    ``GET export/?output=csv|ndjson`` streams every row in the API
+    representation. ``POST import/`` reads a CSV or NDJSON body (chosen by
+    ``?input=`` or the Content-Type) line by line and reports per-line errors.
+    """
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the collection as CSV or NDJSON"""
+        output = request.query_params.get('output', 'csv')
+        if output not in FORMATS:
+            return Response(
+                {'error': f"output must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        collection = self.version_collection
+        queryset = self.filter_queryset(self.get_queryset())
+        # Under ASGI a sync iterator would be read into memory before sending
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(queryset, collection, output)
+        else:
+            content = iter_export(queryset, collection, output)
+        response = StreamingHttpResponse(content, content_type=FORMATS[output])
+        response['Content-Disposition'] = f'attachment; filename="{collection}.{output}"'
+        return response
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_data(self, request):
+        """Import a CSV or NDJSON body in bounded bulk_create batches"""
+        name = type(self).__name__
+        input_format = request.query_params.get('input')
+        if input_format is None:
+            input_format = 'ndjson' if 'ndjson' in request.content_type else 'csv'
+        if input_format not in FORMATS:
+            return Response(
+                {'error': f"input must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_400_BAD_REQUEST)
+        # Read the body line by line instead of through request.data; an empty body has no stream
+        lines = codecs.iterdecode(request.stream or (), 'utf-8')
+        try:
+            report = import_records(lines, input_format, self.version_collection, user)
+        except UnicodeDecodeError:
+            return Response({'error': 'Body must be UTF-8 encoded'}, status=status.HTTP_400_BAD_REQUEST)
+        except DatabaseError as e:
+            logger.error(f"Database error in {name}.import_data: {str(e)}")
+            return Response(
+                {'error': 'Database error occurred while importing items'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if report['created']:
+            status_code = status.HTTP_201_CREATED
+        elif report['failed']:
+            status_code = status.HTTP_400_BAD_REQUEST
+        else:
+            status_code = status.HTTP_200_OK
+        return Response(report, status=status_code)
+
+
+class ScheduleConflictsMixin:
+    """
+    Report schedule conflicts when creating an item with ``?conflicts=1``.
+    
+    The response gains ``conflicts``: the owner's existing slots the new
+    item overlaps. They are looked up in the cached week before the write,
+    one interval tree query per new slot. Routines repeat, so they are
+    checked against this week or the week of ``?start=``.
+    """
+    schedule_kind = None
+    
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list) or request.query_params.get('conflicts') not in ('1', 'true', 'yes'):
+            return super().create(request, *args, **kwargs)
+        start, error = parse_week_param(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = get_current_user(request)
+        conflicts = []
+        if user is not None:
+            try:
+                conflicts = find_conflicts(user, self.schedule_kind, serializer.validated_data, start)
+            except DatabaseError as e:
+                logger.error(f"Database error in {type(self).__name__}.create conflicts: {str(e)}")
+                return Response(
+                    {'error': 'Error checking schedule conflicts'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response({**serializer.data, 'conflicts': conflicts}, status=status.HTTP_201_CREATED, headers=headers)
+
+
+class FastListMixin:
+    """
+    Serve list pages from ``values_list()`` rows when FAST_LIST_RESPONSES is on.
+    
+    fast_json.ListEncoder turns the rows into the same bytes the serializer
+    and renderer would; serializers with fields it cannot reproduce keep the
+    regular path.
+    """
+    
+    def get_list_encoder(self):
+        if not fast_list_enabled() or not hasattr(self.paginator, 'paginate_rows'):
+            return None
+        return get_list_encoder(self.get_serializer_class())
+    
+    def list(self, request, *args, **kwargs):
+        if self.get_list_encoder() is None:
+            return super().list(request, *args, **kwargs)
+        return self.paginated_response(self.filter_queryset(self.get_queryset()))
+    
+    def paginated_response(self, queryset):
+        """Return one page of ``queryset``, through the fast encoder when it applies"""
+        encoder = self.get_list_encoder()
+        if encoder is None:
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        rows = self.paginator.paginate_rows(queryset, self.request, encoder.columns, view=self)
+        return Response(encoder.page(self.paginator, rows))
+
+
+def toggled(field):
+    """Expression that flips a boolean column inside the UPDATE statement"""
+    return Case(When(**{field: True}, then=Value(False)), default=Value(True))
+
+
+class AtomicUpdateMixin:
+    """Apply field changes to the requested row with one conditional UPDATE"""
+    
+    def update_in_place(self, **values):
+        """
+        Run a single UPDATE on the object named in the URL and return its new state.
+        
+        ``values`` may be F()/Case expressions, so the new state is computed by
+        the database from the current row instead of read-modify-write in
+        Python. The row comes back from the same statement (UPDATE ...
+        RETURNING), so the instance reflects exactly this update.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            updated = update_returning(queryset.filter(**lookup), **values)
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if not updated:
+            raise Http404
+        instance = updated[0]
+        bump_model_versions(queryset.model, instance.user_id)
+        return instance
+
+
+class UserProfileViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    version_collection = 'profiles'
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [AllowAny]  # Change to IsAuthenticated in production
     
+    def get_queryset(self):
+        """Profiles with their spending annotated; built per request so the month is today's"""
+        return UserProfile.objects.with_spending()
+    
     def list(self, request, *args, **kwargs):
         """List all user profiles with database error handling"""
         try:
@@ -52,12 +454,13 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @conditional_get
     def current(self, request):
         """Get current user's profile"""
         try:
             # In production, use request.user
             profile = safe_db_operation(
-                lambda: self.queryset.first(),
+                lambda: self.get_queryset().first(),
                 None
             )
             if profile:
@@ -72,7 +475,9 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             )
 
 
-class RoutineViewSet(viewsets.ModelViewSet):
+class RoutineViewSet(ScheduleConflictsMixin, BulkCreateMixin, TransferMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    version_collection = 'routines'
+    schedule_kind = 'routine'
     queryset = Routine.objects.all()
     serializer_class = RoutineSerializer
     permission_classes = [AllowAny]
@@ -102,28 +507,58 @@ class RoutineViewSet(viewsets.ModelViewSet):
             logger.error(f"Database error in RoutineViewSet.perform_create: {str(e)}")
             raise
     
+    def perform_bulk_create(self, instances):
+        RoutineDay.sync_for(instances)
+    
     @action(detail=False, methods=['get'])
+    @conditional_get
     def by_day(self, request):
-        """Get routines grouped by day"""
+        """Get routines for one day, served from the indexed day table"""
         try:
-            day = request.query_params.get('day')
-            if day:
-                routines = safe_db_operation(
-                    lambda: self.get_queryset().filter(days__contains=day),
-                    Routine.objects.none()
-                )
-                serializer = self.get_serializer(routines, many=True)
-                return Response(serializer.data)
-            return Response({'error': 'Day parameter required'}, status=400)
+            day, error = parse_day_param(request.query_params)
+            if error:
+                return Response({'error': error}, status=400)
+            routines = safe_db_operation(
+                lambda: routines_for_day(self.get_queryset(), day),
+                Routine.objects.none()
+            )
+            serializer = self.get_serializer(routines, many=True)
+            return Response(serializer.data)
         except Exception as e:
             logger.error(f"Error in by_day: {str(e)}")
             return Response(
                 {'error': 'Error fetching routines by day'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=False, methods=['get'])
+    @conditional_get
+    def weekly(self, request):
+        """Get routines grouped by day for the whole week in a single indexed query"""
+        try:
+            routines = safe_db_operation(
+                lambda: list(
+                    self.get_queryset()
+                    .annotate(day=F('day_entries__day'))
+                    .filter(day__isnull=False)
+                    .order_by('day_entries__day', 'day_entries__time')
+                ),
+                []
+            )
+            week = {day: [] for day in Routine.DAY_CODES}
+            for routine, data in zip(routines, self.get_serializer(routines, many=True).data):
+                week[routine.day].append(data)
+            return Response(week)
+        except Exception as e:
+            logger.error(f"Error in weekly routines: {str(e)}")
+            return Response(
+                {'error': 'Error fetching weekly routines'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(BulkCreateMixin, TransferMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    version_collection = 'expenses'
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
     permission_classes = [AllowAny]
@@ -150,28 +585,25 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             logger.error(f"Database error in ExpenseViewSet.perform_create: {str(e)}")
             raise
     
+    def perform_bulk_create(self, instances):
+        record_expenses(instances)
+    
     @action(detail=False, methods=['get'])
+    @conditional_get
     def summary(self, request):
-        """Get expense summary by category"""
+        """
+        Get expense summary by category, aggregated in the database.
+        
+        Query params: ``start`` and ``end`` (YYYY-MM-DD, inclusive) and
+        ``group_by`` (category, day, week or month).
+        """
         try:
-            expenses = safe_db_operation(
-                lambda: list(self.get_queryset()),
-                []
-            )
-            summary = {}
-            total = 0
+            params, error = parse_summary_params(request.query_params)
+            if error:
+                return Response({'error': error}, status=400)
             
-            for expense in expenses:
-                category = expense.category
-                if category not in summary:
-                    summary[category] = 0
-                summary[category] += float(expense.amount)
-                total += float(expense.amount)
-            
-            return Response({
-                'by_category': summary,
-                'total': total
-            })
+            summary = expense_summary(self.get_queryset(), **params)
+            return Response(ExpenseSummarySerializer(summary).data)
         except Exception as e:
             logger.error(f"Error in expense summary: {str(e)}")
             return Response(
@@ -180,7 +612,9 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             )
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ScheduleConflictsMixin, BulkCreateMixin, TransferMixin, AtomicUpdateMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    version_collection = 'events'
+    schedule_kind = 'event'
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [AllowAny]
@@ -206,13 +640,30 @@ class EventViewSet(viewsets.ModelViewSet):
             logger.error(f"Database error in EventViewSet.perform_create: {str(e)}")
             raise
     
+    @action(detail=False, methods=['get'])
+    @conditional_get
+    def window(self, request):
+        """Get events starting between ``from`` and ``to``, in start order, from the starts_at index"""
+        bounds, error = parse_window_params(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                starts_at__gte=bounds[0], starts_at__lt=bounds[1]
+            ).order_by('starts_at')
+            return self.paginated_response(queryset)
+        except DatabaseError as e:
+            logger.error(f"Database error in EventViewSet.window: {str(e)}")
+            return Response(
+                {'error': 'Error fetching events'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
     @action(detail=True, methods=['post'])
     def toggle_rsvp(self, request, pk=None):
         """Toggle RSVP status for an event"""
         try:
-            event = self.get_object()
-            event.rsvped = not event.rsvped
-            event.save()
+            event = self.update_in_place(rsvped=toggled('rsvped'))
             serializer = self.get_serializer(event)
             return Response(serializer.data)
         except (DatabaseError, ValidationError) as e:
@@ -226,9 +677,7 @@ class EventViewSet(viewsets.ModelViewSet):
     def toggle_favorite(self, request, pk=None):
         """Toggle favorite status for an event"""
         try:
-            event = self.get_object()
-            event.is_favorite = not event.is_favorite
-            event.save()
+            event = self.update_in_place(is_favorite=toggled('is_favorite'))
             serializer = self.get_serializer(event)
             return Response(serializer.data)
         except (DatabaseError, ValidationError) as e:
@@ -239,7 +688,8 @@ class EventViewSet(viewsets.ModelViewSet):
             )
 
 
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(BulkCreateMixin, TransferMixin, AtomicUpdateMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    version_collection = 'goals'
     queryset = Goal.objects.all()
     serializer_class = GoalSerializer
     permission_classes = [AllowAny]
@@ -269,16 +719,16 @@ class GoalViewSet(viewsets.ModelViewSet):
     def update_progress(self, request, pk=None):
         """Update goal progress"""
         try:
-            goal = self.get_object()
             progress = request.data.get('progress')
             
             if progress is not None:
-                goal.progress = int(progress)
-                if goal.progress >= 100:
-                    goal.completed = True
-                else:
-                    goal.completed = False
-                goal.save()
+                try:
+                    progress = int(progress)
+                except (TypeError, ValueError):
+                    return Response({'error': 'Progress must be an integer'}, status=400)
+                goal = self.update_in_place(progress=progress, completed=progress >= 100)
+            else:
+                goal = self.get_object()
                 
             serializer = self.get_serializer(goal)
             return Response(serializer.data)
@@ -293,10 +743,11 @@ class GoalViewSet(viewsets.ModelViewSet):
     def toggle_complete(self, request, pk=None):
         """Toggle completion status"""
         try:
-            goal = self.get_object()
-            goal.completed = not goal.completed
-            goal.progress = 100 if goal.completed else 0
-            goal.save()
+            # Both expressions read the row's current value of completed
+            goal = self.update_in_place(
+                completed=toggled('completed'),
+                progress=Case(When(completed=True, then=Value(0)), default=Value(100)),
+            )
             serializer = self.get_serializer(goal)
             return Response(serializer.data)
         except (DatabaseError, ValidationError) as e:
@@ -307,6 +758,23 @@ class GoalViewSet(viewsets.ModelViewSet):
             )
     
     @action(detail=False, methods=['get'])
+    @conditional_get
+    def stats(self, request):
+        """Get the current user's goal counts, completion and deadlines per category and status"""
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(goal_stats(self.get_queryset().filter(user=user)))
+        except DatabaseError as e:
+            logger.error(f"Database error in goal stats: {str(e)}")
+            return Response(
+                {'error': 'Error computing goal statistics'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    @conditional_get
     def by_category(self, request):
         """Get goals filtered by category"""
         try:
@@ -330,28 +798,137 @@ class GoalViewSet(viewsets.ModelViewSet):
             )
 
 
+class DashboardView(APIView):
+    """API endpoint returning the whole dashboard in one response"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        """Get today's routines, upcoming events, active goals and budget status"""
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(get_dashboard(user))
+        except DatabaseError as e:
+            logger.error(f"Database error in dashboard: {str(e)}")
+            return Response(
+                {'error': 'Error building dashboard'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ScheduleWeekView(APIView):
+    """
+    API endpoint returning the current user's week as concrete time slots.
+    
+    Routines and events are expanded for the week containing ``?start=``
+    (this week by default). Each slot lists the keys of the slots it
+    overlaps. The expanded week is cached per user until a routine or
+    event changes.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        """Get the week's slots and their conflicts"""
+        start, error = parse_week_param(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(get_week(user, start).as_data())
+        except DatabaseError as e:
+            logger.error(f"Database error in schedule week: {str(e)}")
+            return Response(
+                {'error': 'Error building schedule'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class SearchView(APIView):
+    """
+    API endpoint searching the current user's events, goals, expenses and routines.
+    
+    ``?q=`` words are matched as prefixes through the full-text index and
+    results are ranked by relevance. ``?types=events,goals`` narrows the
+    collections and ``?limit=`` caps the results.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        """Get the best matches for the query across collections"""
+        params, error = parse_search_params(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        user = get_current_user(request)
+        if user is None:
+            return Response({'error': 'No user found in database'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            results = search(user_id=user.pk, **params)
+        except DatabaseError as e:
+            logger.error(f"Database error in search: {str(e)}")
+            return Response(
+                {'error': 'Error searching'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        return Response({'query': params['text'], 'count': len(results), 'results': results})
+
+
 class DatabaseHealthView(APIView):
-    """API endpoint to check database health and connection status"""
+    """
+    API endpoint to check database health and connection status.
+    
+    The plain probe is answered from a connection check cached for
+    HEALTH_CHECK_TTL seconds. ``?deep=1`` checks the connection live and adds
+    query latency percentiles, lock waits and SQLite storage statistics.
+    """
     permission_classes = [AllowAny]
     
     def get(self, request):
         """Get database health status"""
-        is_connected, error = check_database_connection()
-        db_info = get_database_info()
-        
-        response_data = {
-            'status': 'healthy' if is_connected else 'unhealthy',
-            'connected': is_connected,
-            'database_info': db_info,
-        }
+        deep = request.query_params.get('deep') in ('1', 'true', 'yes')
+        if not deep:
+            ttl = getattr(settings, 'HEALTH_CHECK_TTL', 5)
+            response_data, status_code = database_health_data(*cached_connection_check.get(ttl))
+            return Response(response_data, status=status_code)
         
-        if error:
-            response_data['error'] = error
-        
-        status_code = status.HTTP_200_OK if is_connected else status.HTTP_503_SERVICE_UNAVAILABLE
+        is_connected, error = check_database_connection()
+        if is_connected:
+            try:
+                stats = {
+                    'query_latency': get_query_latency_percentiles(),
+                    'locks': get_lock_stats(),
+                    'storage': get_sqlite_stats(),
+                    'row_estimates': get_table_row_estimates(),
+                }
+            except DatabaseError as e:
+                logger.error(f"Database error in deep health check: {str(e)}")
+                is_connected, error = False, f"Database statistics error: {str(e)}"
+        response_data, status_code = database_health_data(is_connected, error, 0.0)
+        if is_connected:
+            response_data.update(stats)
         return Response(response_data, status=status_code)
 
 
+class MetricsView(APIView):
+    """API endpoint exposing request and SQL metrics in Prometheus text format"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        """Get metrics for this process"""
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
+class CacheStatsView(APIView):
+    """API endpoint reporting response cache configuration and hit/miss counters"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        """Get response cache statistics for this process"""
+        return Response(get_cache_info())
+
+
 class SPAView(TemplateView):
     """Serve the frontend Single Page Application index."""
     template_name = "frontend/index.html"
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""Multi-process waitress serving for app.py.
+
+The supervisor binds the listening socket once and starts N worker
+processes that inherit it. Each worker runs waitress with M threads on the
+shared socket, so the kernel hands connections to whichever process is free
+and the GIL of one process no longer caps the deployment.
+
+Workers share one file-based Django cache directory (COLLEGE_APP_CACHE_DIR,
+a temporary one unless it is already set), so a write handled by one worker
+invalidates the version stamps and cached responses of all of them.
+
+Workers are started with fork+exec (a fresh interpreter per worker rather
+than a fork of the supervisor), which is safe on macOS once the GUI is up
+and means a reload picks up new code.
+
+Signals (supervisor):
+  SIGHUP          rolling reload: start a replacement, wait until it is
+                  ready, then gracefully stop the old worker, one at a time
+  SIGUSR1         print per-worker load
+  SIGTERM/SIGINT  graceful shutdown of every worker
+
+Signals (worker):
+  SIGTERM         stop accepting, finish in-flight requests, exit
+
+Heartbeats come from a thread of their own, so besides the load they carry
+how long the oldest in-flight request has gone without finishing or sending
+data. The supervisor kills a worker that stops reporting, or whose request
+threads are stuck for longer than REQUEST_TIMEOUT, and starts a new one.
+"""
+
+import argparse
+import json
+import os
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HEARTBEAT_INTERVAL = 2.0
+# A worker that has not reported for this long is considered hung
+HEARTBEAT_TIMEOUT = 30.0
+# So is one with a request that has neither finished nor sent data for this long
+REQUEST_TIMEOUT = 60.0
+READY_TIMEOUT = 60.0
+DRAIN_TIMEOUT = 30.0
+MAX_RESTART_DELAY = 30.0
+CACHE_DIR_VARIABLE = "COLLEGE_APP_CACHE_DIR"
+
+
+def create_listen_socket(host, port, backlog=1024):
+    """Bind the shared listening socket.
+
+    SO_REUSEPORT (where available) lets a replacement supervisor bind the
+    same port before the old one has exited.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        except OSError:
+            pass
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Worker:
+    """Bookkeeping for one worker process."""
+
+    def __init__(self, process, status_fd, generation):
+        self.process = process
+        self.status_fd = status_fd
+        self.generation = generation
+        self.started_at = time.monotonic()
+        self.last_seen = self.started_at
+        self.ready = False
+        self.retiring = False
+        self.status = {}
+        self.buffer = b""
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def read_status(self):
+        """Consume heartbeat lines from the status pipe; return False on EOF."""
+        try:
+            chunk = os.read(self.status_fd, 65536)
+        except OSError:
+            return False
+        if not chunk:
+            return False
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            self.last_seen = time.monotonic()
+            self.ready = self.ready or message.get("ready", False)
+            self.status = message
+        return True
+
+    def close(self):
+        try:
+            os.close(self.status_fd)
+        except OSError:
+            pass
+
+
+class Supervisor:
+    """Start, watch, restart and reload waitress worker processes."""
+
+    def __init__(self, port, workers=2, threads=4, host="127.0.0.1", report_interval=0, cache_dir=None):
+        self.host = host
+        self.port = port
+        self.size = workers
+        self.threads = threads
+        self.report_interval = report_interval
+        # Per-process caches would leave the other workers serving stale data
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_VARIABLE)
+        self.owns_cache_dir = False
+        self.socket = None
+        self.workers = []
+        self.generation = 0
+        self.restarts = 0
+        self.restart_delay = 0.0
+        self.lock = threading.RLock()
+        self.stopping = threading.Event()
+        self.reload_requested = threading.Event()
+        self.report_requested = threading.Event()
+        # Set by the supervision thread when the first worker reports ready
+        self.any_ready = threading.Event()
+        self.thread = None
+
+    # -- lifecycle -----------------------------------------------------
+
+    def start(self, ready_timeout=READY_TIMEOUT):
+        """Bind, start the workers and wait until at least one serves requests."""
+        self.socket = create_listen_socket(self.host, self.port)
+        self.port = self.socket.getsockname()[1]
+        self.share_cache()
+        self.generation += 1
+        with self.lock:
+            for _ in range(self.size):
+                self.workers.append(self.spawn())
+        self.thread = threading.Thread(target=self.run, name="worker-supervisor", daemon=True)
+        self.thread.start()
+        return self.wait_ready(ready_timeout)
+
+    def share_cache(self):
+        """Create the temporary cache directory the workers share, unless one was given."""
+        if self.cache_dir is None:
+            self.cache_dir = tempfile.mkdtemp(prefix="college-app-cache-")
+            self.owns_cache_dir = True
+        return self.cache_dir
+
+    def wait_ready(self, timeout):
+        return self.any_ready.wait(timeout)
+
+    def install_signal_handlers(self):
+        """Route supervisor signals to the supervision thread (main thread only)."""
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.reload_requested.set())
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.report_requested.set())
+
+        def stop(signum, frame):
+            self.stop()
+            raise SystemExit(0)
+
+        signal.signal(signal.SIGTERM, stop)
+
+    def spawn(self):
+        """Start one worker process on the shared socket."""
+        read_fd, write_fd = os.pipe()
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--fd", str(self.socket.fileno()),
+            "--status-fd", str(write_fd),
+            "--threads", str(self.threads),
+        ]
+        process = subprocess.Popen(command, pass_fds=(self.socket.fileno(), write_fd), env=self.worker_environ())
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        return Worker(process, read_fd, self.generation)
+
+    def worker_environ(self):
+        """The environment workers start with: this one plus the shared cache directory."""
+        return {**os.environ, CACHE_DIR_VARIABLE: self.cache_dir}
+
+    def stop(self, timeout=DRAIN_TIMEOUT):
+        """Gracefully stop every worker, killing any still running after ``timeout``."""
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            self.terminate(worker)
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            try:
+                worker.process.wait(max(deadline - time.monotonic(), 0.1))
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+                worker.process.wait()
+            worker.close()
+        if self.socket is not None:
+            self.socket.close()
+        if self.owns_cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def terminate(self, worker):
+        worker.retiring = True
+        if worker.process.poll() is None:
+            worker.process.terminate()
+
+    # -- supervision ---------------------------------------------------
+
+    def run(self):
+        last_report = time.monotonic()
+        while not self.stopping.is_set():
+            self.poll_status(timeout=0.5)
+            self.reap()
+            if self.reload_requested.is_set():
+                self.reload_requested.clear()
+                self.reload()
+            now = time.monotonic()
+            if self.report_requested.is_set() or (
+                self.report_interval and now - last_report >= self.report_interval
+            ):
+                self.report_requested.clear()
+                last_report = now
+                self.print_load()
+
+    def poll_status(self, timeout):
+        with self.lock:
+            by_fd = {worker.status_fd: worker for worker in self.workers}
+        if not by_fd:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select(list(by_fd), [], [], timeout)
+        except (OSError, ValueError):
+            return
+        for fd in readable:
+            by_fd[fd].read_status()
+            if by_fd[fd].ready:
+                self.any_ready.set()
+
+    def reap(self):
+        """Replace workers that exited or stopped reporting."""
+        now = time.monotonic()
+        exited = []
+        with self.lock:
+            for worker in list(self.workers):
+                code = worker.process.poll()
+                hang = self.hang_reason(worker, now) if code is None and not worker.retiring else None
+                if hang:
+                    print(f"Worker {worker.pid} {hang}; killing it")
+                    worker.process.kill()
+                    code = worker.process.wait()
+                if code is None:
+                    continue
+                self.workers.remove(worker)
+                worker.close()
+                if not (worker.retiring or self.stopping.is_set()):
+                    exited.append((worker, code))
+
+        for worker, code in exited:
+            # Back off when workers crash right after starting
+            if now - worker.started_at < 5:
+                self.restart_delay = min(max(self.restart_delay * 2, 0.5), MAX_RESTART_DELAY)
+            else:
+                self.restart_delay = 0.0
+            print(f"Worker {worker.pid} exited with code {code}; restarting"
+                  + (f" in {self.restart_delay:.1f}s" if self.restart_delay else ""))
+            if self.stopping.wait(self.restart_delay):
+                return
+            with self.lock:
+                self.restarts += 1
+                self.workers.append(self.spawn())
+
+    def hang_reason(self, worker, now):
+        """Return why ``worker`` counts as hung, or None while it makes progress."""
+        if now - worker.last_seen > HEARTBEAT_TIMEOUT:
+            return "stopped reporting"
+        stalled = worker.status.get("stalled_seconds", 0)
+        if stalled > REQUEST_TIMEOUT:
+            return f"has had a request stuck for {stalled:.0f}s"
+        return None
+
+    def reload(self):
+        """Replace the workers one at a time; each old worker stops only once its replacement is ready."""
+        self.generation += 1
+        with self.lock:
+            old_workers = [worker for worker in self.workers if not worker.retiring]
+        print(f"Reloading {len(old_workers)} worker(s)")
+        for old in old_workers:
+            with self.lock:
+                replacement = self.spawn()
+                self.workers.append(replacement)
+            deadline = time.monotonic() + READY_TIMEOUT
+            while not replacement.ready and replacement.process.poll() is None:
+                if self.stopping.is_set() or time.monotonic() > deadline:
+                    break
+                self.poll_status(timeout=0.2)
+            if not replacement.ready:
+                print(f"Replacement worker {replacement.pid} did not become ready; keeping the old workers")
+                with self.lock:
+                    self.terminate(replacement)
+                return
+            with self.lock:
+                self.terminate(old)
+        print("Reload complete")
+
+    # -- reporting -----------------------------------------------------
+
+    def load(self):
+        """Return the latest heartbeat of every worker."""
+        now = time.monotonic()
+        with self.lock:
+            return [
+                {
+                    "pid": worker.pid,
+                    "generation": worker.generation,
+                    "ready": worker.ready,
+                    "retiring": worker.retiring,
+                    "uptime_seconds": round(now - worker.started_at, 1),
+                    "requests": worker.status.get("requests", 0),
+                    "in_flight": worker.status.get("in_flight", 0),
+                    "stalled_seconds": worker.status.get("stalled_seconds", 0),
+                    "requests_per_sec": worker.status.get("requests_per_sec", 0.0),
+                    "max_rss_mb": worker.status.get("max_rss_mb"),
+                }
+                for worker in self.workers
+            ]
+
+    def print_load(self):
+        load = self.load()
+        total = sum(worker["requests_per_sec"] for worker in load)
+        print(f"{len(load)} worker(s), {total:.1f} req/s total, {self.restarts} restart(s)")
+        for worker in load:
+            state = "retiring" if worker["retiring"] else ("ready" if worker["ready"] else "starting")
+            print(
+                f"  pid={worker['pid']} gen={worker['generation']} {state} "
+                f"requests={worker['requests']} rps={worker['requests_per_sec']:.1f} "
+                f"in_flight={worker['in_flight']} stalled={worker['stalled_seconds']}s "
+                f"max_rss={worker['max_rss_mb']}MB "
+                f"uptime={worker['uptime_seconds']}s"
+            )
+
+
+# -- worker process ------------------------------------------------------
+
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class RequestProgress:
+    """WSGI wrapper tracking when each in-flight request last made progress.
+
+    A request makes progress when it starts, sends a chunk of its body or
+    finishes. Waitress calls close() on every response, so finished
+    requests always leave ``active``.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.lock = threading.Lock()
+        self.active = {}
+
+    def __call__(self, environ, start_response):
+        key = object()
+        self.touch(key)
+        try:
+            result = self.application(environ, start_response)
+        except BaseException:
+            self.finish(key)
+            raise
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if file_wrapper is not None and isinstance(result, file_wrapper):
+            # Waitress sends files from its main loop, not the request thread
+            self.finish(key)
+            return result
+        return TrackedResponse(result, self, key)
+
+    def touch(self, key):
+        with self.lock:
+            self.active[key] = time.monotonic()
+
+    def finish(self, key):
+        with self.lock:
+            self.active.pop(key, None)
+
+    def stalled_seconds(self):
+        """Seconds since the least recently active in-flight request made progress; 0 when idle."""
+        with self.lock:
+            oldest = min(self.active.values(), default=None)
+        return 0.0 if oldest is None else time.monotonic() - oldest
+
+
+class TrackedResponse:
+    """Response iterable that reports each chunk and the close to RequestProgress."""
+
+    def __init__(self, result, progress, key):
+        self.result = result
+        self.progress = progress
+        self.key = key
+
+    def __iter__(self):
+        for chunk in self.result:
+            self.progress.touch(self.key)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self.result, "close"):
+                self.result.close()
+        finally:
+            self.progress.finish(self.key)
+
+
+def heartbeat(status_fd, stopping, progress=None):
+    """Report this worker's load and request progress to the supervisor until ``stopping`` is set."""
+    from college_lifeapp.metrics import registry
+
+    last_requests, last_time = 0, time.monotonic()
+    message = {"ready": True}
+    while True:
+        routes, in_flight = registry.collect()
+        requests = sum(sum(stats.responses.values()) for stats in routes.values())
+        now = time.monotonic()
+        message.update({
+            "pid": os.getpid(),
+            "requests": requests,
+            "in_flight": in_flight,
+            "requests_per_sec": round((requests - last_requests) / max(now - last_time, 1e-6), 1),
+            "stalled_seconds": round(progress.stalled_seconds(), 1) if progress else 0,
+            "max_rss_mb": max_rss_mb(),
+        })
+        last_requests, last_time = requests, now
+        try:
+            os.write(status_fd, (json.dumps(message) + "\n").encode())
+        except OSError:
+            return  # Supervisor is gone
+        if stopping.wait(HEARTBEAT_INTERVAL):
+            return
+
+
+def serve_worker(fd, status_fd, threads):
+    """Serve the Django WSGI app with waitress on the inherited listening socket."""
+    from app import add_project_to_path
+
+    add_project_to_path()
+    from college_app.wsgi import application
+    from waitress import create_server, wasyncore
+    from waitress.channel import HTTPChannel
+
+    listener = socket.socket(fileno=fd)
+    progress = RequestProgress(application)
+    server = create_server(progress, sockets=[listener], threads=threads)
+
+    stopping = threading.Event()
+    # Ctrl-C reaches the whole process group; the supervisor decides what to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    threading.Thread(target=heartbeat, args=(status_fd, stopping, progress), daemon=True).start()
+
+    def busy_channels():
+        # Channels accepted or used within the last second may still be
+        # receiving a request, so they count as busy too
+        recent = time.time() - 1.0
+        return [
+            channel for channel in list(server._map.values())
+            if isinstance(channel, HTTPChannel) and (
+                channel.requests or channel.total_outbufs_len
+                or getattr(channel, "request", None) is not None or channel.last_activity > recent
+            )
+        ]
+
+    use_poll = server.adj.asyncore_use_poll
+    while not stopping.is_set():
+        wasyncore.loop(timeout=1.0, map=server._map, use_poll=use_poll, count=1)
+
+    # Stop accepting: the socket stays open in the supervisor and the other
+    # workers, so queued connections are served by them
+    for dispatcher in list(server._map.values()):
+        if not isinstance(dispatcher, HTTPChannel) and getattr(dispatcher, "accepting", False):
+            dispatcher.del_channel()
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    while busy_channels() and time.monotonic() < deadline:
+        wasyncore.loop(timeout=0.2, map=server._map, use_poll=use_poll, count=1)
+    server.task_dispatcher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="waitress worker process (started by the supervisor)")
+    parser.add_argument("--fd", type=int, required=True, help="Inherited listening socket")
+    parser.add_argument("--status-fd", type=int, required=True, help="Pipe for heartbeats")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    serve_worker(args.fd, args.status_fd, args.threads)
+
+
+if __name__ == "__main__":
+    main()